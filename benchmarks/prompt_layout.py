@@ -0,0 +1,138 @@
+"""Prompt-eval tokens per turn for each prompt layout.
+
+Replays a scripted conversation, where every other turn calls a tool and
+updates the tool data block, through _build_messages_from_context with
+each layout ("default" and "stable_prefix").
+
+By default the backend is a stub that models Ollama's KV cache: a request
+only evaluates the prompt after the longest prefix it shares with the
+previous request. With --ollama, each request is sent to a real server
+and Ollama's own prompt_eval_count is reported instead.
+
+Usage:
+    uv run python benchmarks/prompt_layout.py
+    uv run python benchmarks/prompt_layout.py --turns 40 --max-turns 6
+    uv run python benchmarks/prompt_layout.py --ollama http://localhost:11434 --model qwen3:8b
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import statistics
+
+from livekit.agents import llm
+
+from caal.llm import PROMPT_LAYOUTS, MessageBuilder, ToolDataCache
+from caal.llm.providers import OllamaProvider
+from caal.llm.tokens import estimate_tokens
+
+# The module, not the llm_node function re-exported by caal.llm
+llm_node = importlib.import_module("caal.llm.llm_node")
+
+SYSTEM_PROMPT = (
+    "You are CAAL, a helpful voice assistant. Answer in one or two short "
+    "sentences, without markdown. Use the tools when the user asks about "
+    "the weather, their calendar or their home devices. " * 8
+)
+
+CITIES = ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Hobart", "Darwin"]
+
+
+def _render(messages: list[dict]) -> str:
+    """Flatten messages the way a chat template does."""
+    return "".join(f"<|{m['role']}|>\n{m.get('content') or ''}\n" for m in messages)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class StubBackend:
+    """Prompt-eval tokens of a server that reuses the previous request's prefix."""
+
+    def __init__(self) -> None:
+        self._previous = ""
+
+    async def prompt_eval(self, messages: list[dict]) -> int:
+        prompt = _render(messages)
+        reused = _common_prefix(prompt, self._previous)
+        self._previous = prompt
+        return estimate_tokens(prompt[reused:])
+
+
+class OllamaBackend:
+    """Prompt-eval tokens reported by a real Ollama server."""
+
+    def __init__(self, url: str, model: str, num_ctx: int) -> None:
+        self._provider = OllamaProvider(model=model, base_url=url, num_ctx=num_ctx)
+
+    async def prompt_eval(self, messages: list[dict]) -> int:
+        await self._provider.chat(messages=messages)
+        return self._provider.last_prompt_eval_count or 0
+
+
+async def run_layout(layout: str, backend, turns: int, max_turns: int) -> list[int]:
+    """Replay the conversation and return prompt-eval tokens per turn."""
+    chat_ctx = llm.ChatContext.empty()
+    chat_ctx.add_message(role="system", content=SYSTEM_PROMPT)
+    tool_data = ToolDataCache()
+    builder = MessageBuilder()
+    counts = []
+
+    for turn in range(turns):
+        city = CITIES[turn % len(CITIES)]
+        if turn % 2:
+            chat_ctx.add_message(role="user", content=f"What's the weather in {city}?")
+            tool_data.add(
+                "weather",
+                {"city": city, "temp": 18 + turn % 9, "condition": "sunny", "wind_kmh": turn},
+                arguments={"location": city},
+            )
+        else:
+            chat_ctx.add_message(role="user", content=f"Tell me something about {city}.")
+
+        messages = llm_node._build_messages_from_context(
+            chat_ctx,
+            tool_data_cache=tool_data,
+            max_turns=max_turns,
+            message_builder=builder,
+            prompt_layout=layout,
+        )
+        counts.append(await backend.prompt_eval(messages))
+        chat_ctx.add_message(
+            role="assistant", content=f"{city} is lovely this time of year, turn {turn}."
+        )
+    return counts
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=30, help="conversation turns")
+    parser.add_argument("--max-turns", type=int, default=10, help="max_turns history window")
+    parser.add_argument("--ollama", metavar="URL", help="Ollama server (default: stub)")
+    parser.add_argument("--model", default="qwen3:8b", help="Ollama model")
+    parser.add_argument("--num-ctx", type=int, default=8192, help="Ollama context window")
+    args = parser.parse_args()
+
+    print(f"{'layout':<14} {'total':>8} {'mean':>8} {'median':>8} {'max':>8}")
+    for layout in PROMPT_LAYOUTS:
+        if args.ollama:
+            backend = OllamaBackend(args.ollama, args.model, args.num_ctx)
+        else:
+            backend = StubBackend()
+        # The first request fills the cache in every layout
+        counts = (await run_layout(layout, backend, args.turns, args.max_turns))[1:]
+        print(
+            f"{layout:<14} {sum(counts):>8} {statistics.mean(counts):>8.0f} "
+            f"{statistics.median(counts):>8.0f} {max(counts):>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
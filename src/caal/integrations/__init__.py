@@ -3,7 +3,12 @@ MCP integrations for voice assistant.
 """
 
 from .mcp_loader import MCPServerConfig, initialize_mcp_servers, load_mcp_config
-from .n8n import discover_n8n_workflows, execute_n8n_workflow
+from .n8n import (
+    discover_n8n_workflows,
+    execute_n8n_workflow,
+    get_workflow_annotations,
+    get_workflow_cache_ttl,
+)
 from .web_search import WebSearchTools
 
 __all__ = [
@@ -12,5 +17,7 @@ __all__ = [
     "MCPServerConfig",
     "discover_n8n_workflows",
     "execute_n8n_workflow",
+    "get_workflow_annotations",
+    "get_workflow_cache_ttl",
     "WebSearchTools",
 ]
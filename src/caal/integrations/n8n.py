@@ -13,6 +13,9 @@ from typing import Any
 
 import aiohttp
 
+from ..registry_cache import parse_sticky_note_annotations
+from .n8n_schema import OPEN_SCHEMA, derive_workflow_schema
+
 logger = logging.getLogger(__name__)
 
 # Cache for workflow details to avoid redundant MCP calls
@@ -20,6 +23,14 @@ _workflow_details_cache: dict[str, dict] = {}
 _cache_timestamp: float = 0
 _cache_ttl_seconds: float = 3600  # 1 hour TTL
 
+# Derived parameter schemas: workflow ID -> (updatedAt, schema or None).
+# Keyed by the workflow's last edit, so entries never go stale and survive
+# clear_caches()
+_workflow_schema_cache: dict[str, tuple[str, dict | None]] = {}
+
+# Sticky note annotations per tool name (e.g. {"cache_ttl": "60"})
+_workflow_annotations: dict[str, dict[str, str]] = {}
+
 
 async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], dict[str, str]]:
     """Discover n8n workflows and create tool definitions.
@@ -38,6 +49,7 @@ async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], di
     """
     tools = []
     workflow_name_map = {}
+    annotations = {}
 
     # Check cache expiry
     current_time = time.time()
@@ -65,12 +77,17 @@ async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], di
             wf_name = workflow["name"]  # Original workflow name
             wf_id = workflow["id"]  # Need ID for get_workflow_details
             tool_name = sanitize_tool_name(wf_name)
+            updated_at = workflow.get("updatedAt")
 
             # Try to get detailed description from webhook notes
             description = ""
+            schema = None
             try:
-                # Check cache first
-                if wf_id not in _workflow_details_cache:
+                # Check cache first (refetch if the workflow was edited since)
+                cached = _workflow_details_cache.get(wf_id)
+                if cached is None or (
+                    updated_at and _workflow_updated_at(cached) not in (None, updated_at)
+                ):
                     details_result = await n8n_mcp._client.call_tool(
                         "get_workflow_details",
                         {"workflowId": wf_id}
@@ -79,6 +96,10 @@ async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], di
 
                 workflow_details = _workflow_details_cache[wf_id]
                 description = extract_webhook_description(workflow_details)
+                nodes = workflow_details.get("workflow", {}).get("nodes", [])
+                if tool_annotations := parse_sticky_note_annotations(nodes):
+                    annotations[tool_name] = tool_annotations
+                schema = _workflow_schema(wf_id, workflow_details, updated_at)
 
             except Exception as e:
                 logger.warning(f"Failed to get details for {wf_name}: {e}")
@@ -87,11 +108,9 @@ async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], di
             if not description:
                 description = workflow.get("description") or f"Execute {tool_name} workflow"
 
-            # Flexible schema - LLM uses description to determine parameters
-            parameters = {
-                "type": "object",
-                "additionalProperties": True  # Accept any properties
-            }
+            # Documented/referenced parameters, else a flexible schema and
+            # the LLM uses the description to determine parameters
+            parameters = schema or dict(OPEN_SCHEMA)
 
             # Create Ollama tool definition
             tool = {
@@ -104,13 +123,67 @@ async def discover_n8n_workflows(n8n_mcp, base_url: str) -> tuple[list[dict], di
             }
             tools.append(tool)
             workflow_name_map[tool_name] = wf_name  # Map sanitized -> original name
-            logger.info(f"  ✓ {tool_name}")
+            logger.info(
+                f"  ✓ {tool_name}"
+                + (f" ({', '.join(schema['properties'])})" if schema else "")
+            )
+
+        _workflow_annotations.clear()
+        _workflow_annotations.update(annotations)
 
     except Exception as e:
         logger.warning(f"Failed to discover n8n workflows: {e}", exc_info=True)
     return tools, workflow_name_map
 
 
+def _workflow_updated_at(workflow_details: dict) -> str | None:
+    return workflow_details.get("workflow", {}).get("updatedAt")
+
+
+def _workflow_schema(wf_id: str, workflow_details: dict, updated_at: str | None) -> dict | None:
+    """Parameter schema of a workflow, derived once per workflow version."""
+    version = updated_at or _workflow_updated_at(workflow_details)
+    cached = _workflow_schema_cache.get(wf_id)
+    if version and cached is not None and cached[0] == version:
+        return cached[1]
+
+    schema = derive_workflow_schema(workflow_details)
+    if version:
+        _workflow_schema_cache[wf_id] = (version, schema)
+    return schema
+
+
+def get_workflow_annotations(tool_name: str) -> dict[str, str]:
+    """Get sticky note annotations for a discovered workflow tool.
+
+    Args:
+        tool_name: Sanitized tool name
+
+    Returns:
+        Annotation dict (empty if the workflow has none)
+    """
+    return _workflow_annotations.get(tool_name, {})
+
+
+def get_workflow_cache_ttl(tool_name: str) -> float | None:
+    """Get the result cache TTL from a workflow's "**cache_ttl:**" annotation.
+
+    Args:
+        tool_name: Sanitized tool name
+
+    Returns:
+        TTL in seconds, or None if not annotated (or not a number)
+    """
+    value = get_workflow_annotations(tool_name).get("cache_ttl")
+    if not value:
+        return None
+    try:
+        return float(value.rstrip("s"))
+    except ValueError:
+        logger.warning(f"Invalid cache_ttl annotation for {tool_name}: {value!r}")
+        return None
+
+
 async def execute_n8n_workflow(base_url: str, workflow_name: str, arguments: dict) -> Any:
     """Execute an n8n workflow via POST request.
 
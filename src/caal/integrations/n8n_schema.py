@@ -0,0 +1,218 @@
+"""Parameter schemas for n8n workflow tools.
+
+Webhook workflows have no declared inputs, so tools used to be advertised
+with an open schema and the model had to guess argument names from the
+description. derive_workflow_schema() builds a JSON schema from two sources:
+
+1. The "Parameters:" list in the webhook node notes (docs/N8N-WORKFLOWS.md):
+
+       Parameters:
+       - action (required): 'forecast' or 'current'
+       - location (required): city, suburb, or postcode
+       - days (optional, integer, default 7): forecast days ahead (1-7)
+
+   Each "- name (modifiers): description" line becomes a property. The
+   modifiers are "required"/"optional", a type (string, integer, number,
+   boolean, array, object) and "default <value>". Without an explicit type,
+   it is inferred from the default or a "(min-max)" range. A description
+   that starts with quoted alternatives ('a' or 'b') becomes an enum.
+
+2. Expressions reading the webhook body ({{ $json.body.query }},
+   $('Webhook').item.json.body["days"]) in any node: each field becomes an
+   optional, untyped property if the notes don't document it.
+
+Extra arguments stay allowed, because notes often document only part of
+what a workflow accepts.
+
+Usage:
+    parameters = derive_workflow_schema(workflow_details) or OPEN_SCHEMA
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from typing import Any
+
+__all__ = ["OPEN_SCHEMA", "derive_workflow_schema", "find_body_fields", "parse_parameter_docs"]
+
+# Flexible schema for workflows without documented or referenced parameters
+OPEN_SCHEMA: dict[str, Any] = {"type": "object", "additionalProperties": True}
+
+_WEBHOOK_TYPE = "n8n-nodes-base.webhook"
+_STICKY_NOTE_TYPE = "n8n-nodes-base.stickyNote"
+
+# "Parameters:" heading (also "Params:", "Arguments:", "Inputs:")
+_HEADING_RE = re.compile(r"^\s*(?:parameters|params|arguments|inputs)\s*:?\s*$", re.IGNORECASE)
+
+# "- name (modifiers): description", name optionally in backticks
+_PARAM_RE = re.compile(
+    r"^\s*[-*•]\s*`?([A-Za-z_][\w-]*)`?\s*(?:\(([^)]*)\))?\s*(?::|-|–|—)?\s*(.*)$"
+)
+
+_TYPE_WORDS = {
+    "string": "string",
+    "str": "string",
+    "text": "string",
+    "integer": "integer",
+    "int": "integer",
+    "number": "number",
+    "float": "number",
+    "boolean": "boolean",
+    "bool": "boolean",
+    "array": "array",
+    "list": "array",
+    "object": "object",
+    "dict": "object",
+}
+
+_DEFAULT_RE = re.compile(r"^default\s*[:=]?\s*(.+)$", re.IGNORECASE)
+
+# Description opening with at least two quoted alternatives
+_ENUM_RE = re.compile(
+    r"""^\s*(?:one\s+of:?\s*)?((?:(['"])[^'"]+\2\s*(?:,\s*(?:or\s+)?|\bor\b|\|)\s*)+(['"])[^'"]+\3)""",
+    re.IGNORECASE,
+)
+_QUOTED_RE = re.compile(r"""(['"])([^'"]+)\1""")
+
+_RANGE_RE = re.compile(r"\(\s*(-?\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(-?\d+(?:\.\d+)?)\s*\)")
+
+# $json.body.field, .json.body["field"], $json["body"]["field"]...
+_BODY_FIELD_RE = re.compile(
+    r"""json\s*(?:\.\s*body|\[\s*['"]body['"]\s*\])\s*"""
+    r"""(?:\.\s*([A-Za-z_$][\w$]*)|\[\s*['"]([^'"]+)['"]\s*\])"""
+)
+
+
+def derive_workflow_schema(workflow_details: dict) -> dict[str, Any] | None:
+    """JSON schema for a workflow's webhook body.
+
+    Args:
+        workflow_details: Full workflow structure from get_workflow_details
+
+    Returns:
+        Parameters schema, or None if the workflow neither documents nor
+        references any body field
+    """
+    nodes = workflow_details.get("workflow", {}).get("nodes", [])
+    properties: dict[str, dict[str, Any]] = {}
+    required: list[str] = []
+    for node in nodes:
+        if node.get("type") == _WEBHOOK_TYPE:
+            properties, required = parse_parameter_docs(node.get("notes", ""))
+            break
+
+    for name in find_body_fields(nodes):
+        properties.setdefault(name, {})
+
+    if not properties:
+        return None
+    schema: dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    schema["additionalProperties"] = True
+    return schema
+
+
+def parse_parameter_docs(notes: str) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """Parse the "Parameters:" list of webhook notes.
+
+    Args:
+        notes: Webhook node notes
+
+    Returns:
+        (properties, required names); empty if there is no parameter list
+    """
+    properties: dict[str, dict[str, Any]] = {}
+    required: list[str] = []
+    in_list = False
+    for line in notes.splitlines():
+        if _HEADING_RE.match(line):
+            in_list = True
+            continue
+        if not in_list:
+            continue
+        match = _PARAM_RE.match(line)
+        if match is None:
+            if properties:
+                break  # First line after the list ends it
+            continue
+        name, modifiers, description = match.groups()
+        prop, is_required = _parse_parameter(modifiers or "", description.strip())
+        properties[name] = prop
+        if is_required:
+            required.append(name)
+    return properties, required
+
+
+def find_body_fields(nodes: list[dict]) -> list[str]:
+    """Webhook body fields referenced by node expressions, in order."""
+    fields: dict[str, None] = {}
+    for node in nodes:
+        if node.get("type") == _STICKY_NOTE_TYPE:
+            continue
+        for text in _strings(node.get("parameters", {})):
+            if "body" not in text:
+                continue
+            for match in _BODY_FIELD_RE.finditer(text):
+                fields.setdefault(match.group(1) or match.group(2), None)
+    return list(fields)
+
+
+def _parse_parameter(modifiers: str, description: str) -> tuple[dict[str, Any], bool]:
+    prop: dict[str, Any] = {}
+    is_required = False
+    for word in (w.strip() for w in modifiers.split(",")):
+        lower = word.lower()
+        if lower == "required":
+            is_required = True
+        elif lower in _TYPE_WORDS:
+            prop["type"] = _TYPE_WORDS[lower]
+        elif match := _DEFAULT_RE.match(word):
+            prop["default"] = _literal(match.group(1))
+
+    enum_match = _ENUM_RE.match(description)
+    if enum_match:
+        prop["enum"] = [value for _, value in _QUOTED_RE.findall(enum_match.group(1))]
+        prop.setdefault("type", "string")
+
+    if "type" not in prop and "default" in prop:
+        default = prop["default"]
+        if isinstance(default, bool):
+            prop["type"] = "boolean"
+        elif isinstance(default, int):
+            prop["type"] = "integer"
+        elif isinstance(default, float):
+            prop["type"] = "number"
+
+    range_match = _RANGE_RE.search(description)
+    if range_match and prop.get("type") in (None, "integer", "number"):
+        low, high = (_literal(value) for value in range_match.groups())
+        if "type" not in prop:
+            prop["type"] = "integer" if isinstance(low, int) and isinstance(high, int) else "number"
+        prop["minimum"], prop["maximum"] = low, high
+
+    if description:
+        prop["description"] = description
+    return prop, is_required
+
+
+def _literal(text: str) -> Any:
+    """Documented value as JSON (7, 0.5, true, "x"), else the raw text."""
+    text = text.strip().strip("'\"")
+    try:
+        return json.loads(text.lower() if text.lower() in ("true", "false") else text)
+    except ValueError:
+        return text
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
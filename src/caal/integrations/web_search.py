@@ -117,9 +117,12 @@ class WebSearchTools:
                 return results[0].get("body", "No description available.")
             return "I had trouble processing the search results."
 
+        # Imported here: caal.llm imports the integrations package
+        from ..llm.providers.scheduler import Priority
+
         try:
             messages = [{"role": "user", "content": prompt}]
-            response = await provider.chat(messages=messages)
+            response = await provider.chat(messages=messages, priority=Priority.BACKGROUND)
             summary = (response.content or "").strip()
             return summary or "I found some results but couldn't summarize them."
 
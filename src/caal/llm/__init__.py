@@ -5,7 +5,8 @@ Supports multiple LLM backends (Ollama, Groq) with unified tool calling.
 """
 
 from .caal_llm import CAALLLM
-from .llm_node import ToolDataCache, llm_node
+from .llm_node import PROMPT_LAYOUTS, GenerationStats, ToolDataCache, llm_node
+from .message_builder import MessageBuilder
 
 # Backward compatibility aliases
 from .ollama_llm import OllamaLLM
@@ -17,12 +18,26 @@ from .providers import (
     create_provider,
     create_provider_from_settings,
 )
+from .response_templates import ResponseTemplates
+from .tool_index import ToolSelector
+from .tool_result_cache import ToolResultCache
+from .tool_result_reducer import ReductionPolicy, ToolResultReducer
+from .turn_budget import TurnBudget
 
 __all__ = [
     # New API
     "CAALLLM",
     "llm_node",
+    "GenerationStats",
     "ToolDataCache",
+    "PROMPT_LAYOUTS",
+    "MessageBuilder",
+    "ToolResultCache",
+    "ToolSelector",
+    "ToolResultReducer",
+    "ReductionPolicy",
+    "TurnBudget",
+    "ResponseTemplates",
     "LLMProvider",
     "OllamaProvider",
     "GroqProvider",
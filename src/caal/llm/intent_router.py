@@ -0,0 +1,353 @@
+"""Deterministic fast path for common Home Assistant commands.
+
+"Turn off the kitchen lights" normally costs an LLM round with every tool
+schema, the hass_control call, and a second LLM round to say "Done".
+IntentRouter matches such commands before the LLM runs:
+
+    1. The utterance is normalized (case, punctuation, politeness) and
+       matched against a compiled pattern table for the session language
+       (en/fr/it) to get an action and a target
+    2. The target must resolve to exactly one known Home Assistant device
+       (names and aliases parsed from GetLiveContext) whose domain supports
+       the action
+    3. The caller runs hass_control directly and speaks its response
+       template (see response_templates)
+
+Anything else (unknown device, several candidates, numbers spelled out,
+compound requests) returns None and goes through llm_node as usual.
+
+Usage:
+    router = IntentRouter("en")
+    router.update_devices(parse_live_context(get_live_context_text))
+    match = router.match("turn off the kitchen lights")
+    # IntentMatch(action="turn_off", target="Kitchen Light", value=None)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEVICES_MAX_AGE", "Device", "IntentMatch", "IntentRouter", "parse_live_context"]
+
+# Device names are re-read from Home Assistant after this many seconds
+DEVICES_MAX_AGE = 300.0
+
+# Actions that only make sense on a media player
+_MEDIA_ACTIONS = frozenset(
+    {"volume_up", "volume_down", "set_volume", "mute", "unmute", "pause", "play", "next",
+     "previous"}
+)
+
+# Domains that can be switched on and off
+_SWITCHABLE_DOMAINS = frozenset(
+    {"light", "switch", "fan", "media_player", "input_boolean", "climate", "cover",
+     "humidifier", "vacuum", "script", "scene", "automation"}
+)
+
+# Prepositions between a verb and the target ("volume of the", "du", "della")
+_EN_OF = r"(?:on|of|in|for) "
+_FR_OF = r"(?:de |du |de la |de l'|des |dans |sur )"
+_IT_OF = r"(?:di |del |della |dello |dell'|dei |delle |su |sul |sulla |nel |nella )"
+
+_VALUE = r"(?P<value>\d{1,3})"
+
+# (action, pattern) per language, tried in order; patterns must match the
+# whole normalized utterance
+_PATTERNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "en": (
+        ("set_volume",
+         rf"set (?:the )?volume {_EN_OF}(?P<target>.+?) to {_VALUE}(?: ?%| percent)?"),
+        ("set_volume", rf"set (?P<target>.+?) volume to {_VALUE}(?: ?%| percent)?"),
+        ("volume_up",
+         rf"(?:turn|crank) (?:up (?:the )?volume|(?:the )?volume up) {_EN_OF}(?P<target>.+)"),
+        ("volume_up", rf"(?:the )?volume up {_EN_OF}(?P<target>.+)"),
+        ("volume_down",
+         rf"turn (?:down (?:the )?volume|(?:the )?volume down) {_EN_OF}(?P<target>.+)"),
+        ("volume_down", rf"(?:the )?volume down {_EN_OF}(?P<target>.+)"),
+        ("unmute", r"unmute (?P<target>.+)"),
+        ("mute", r"mute (?P<target>.+)"),
+        ("play", r"(?:resume|unpause) (?P<target>.+)"),
+        ("pause", r"pause (?P<target>.+)"),
+        ("next", r"(?:next|skip (?:the )?|skip to the next )(?:track|song) on (?P<target>.+)"),
+        ("previous", r"(?:previous|last|go back a) (?:track|song) on (?P<target>.+)"),
+        ("turn_on", r"(?:turn|switch) on (?P<target>.+)"),
+        ("turn_on", r"(?:turn|switch) (?P<target>.+?) on"),
+        ("turn_off", r"(?:turn|switch) off (?P<target>.+)"),
+        ("turn_off", r"(?:turn|switch) (?P<target>.+?) off"),
+    ),
+    "fr": (
+        ("set_volume",
+         rf"(?:mets|mettre|règle|regle|régler) le volume {_FR_OF}(?P<target>.+?) "
+         rf"à {_VALUE}(?: ?%| pour ?cent)?"),
+        ("volume_up",
+         rf"(?:monte|monter|augmente|augmenter) le (?:volume|son) {_FR_OF}(?P<target>.+)"),
+        ("volume_down",
+         rf"(?:baisse|baisser|diminue|diminuer) le (?:volume|son) {_FR_OF}(?P<target>.+)"),
+        ("unmute", rf"(?:remets|remettre|rétablis|rétablir) le son {_FR_OF}(?P<target>.+)"),
+        ("mute", rf"(?:coupe|couper) le son {_FR_OF}(?P<target>.+)"),
+        ("pause", r"(?:mets |mettre )?(?P<target>.+?) en pause"),
+        ("play",
+         r"(?:reprends|reprendre|relance|relancer) "
+         r"(?:la lecture (?:de |du |de la |sur )?)?(?P<target>.+)"),
+        ("next", r"(?:chanson|piste|morceau) suivante? sur (?P<target>.+)"),
+        ("previous", r"(?:chanson|piste|morceau) précédente? sur (?P<target>.+)"),
+        ("turn_on", r"(?:allume|allumer|active|activer) (?P<target>.+)"),
+        ("turn_off",
+         r"(?:éteins|eteins|éteindre|eteindre|désactive|désactiver) (?P<target>.+)"),
+    ),
+    "it": (
+        ("set_volume",
+         rf"(?:imposta|impostare|metti|mettere) (?:il )?volume {_IT_OF}(?P<target>.+?) "
+         rf"al? {_VALUE}(?: ?%| per ?cento)?"),
+        ("volume_up", rf"(?:alza|alzare) (?:il )?volume {_IT_OF}(?P<target>.+)"),
+        ("volume_down", rf"(?:abbassa|abbassare) (?:il )?volume {_IT_OF}(?P<target>.+)"),
+        ("unmute",
+         rf"(?:riattiva|riattivare|rimetti|rimettere) l'audio {_IT_OF}?(?P<target>.+)"),
+        ("mute", rf"(?:togli|togliere|disattiva|disattivare) l'audio {_IT_OF}?(?P<target>.+)"),
+        ("mute", r"(?:silenzia|silenziare) (?P<target>.+)"),
+        ("pause", r"(?:metti|mettere) in pausa (?P<target>.+)"),
+        ("play",
+         r"(?:riprendi|riprendere) "
+         r"(?:la riproduzione (?:di |del |della |su )?)?(?P<target>.+)"),
+        ("next", r"(?:brano|canzone|traccia) successiv[ao] su (?P<target>.+)"),
+        ("previous", r"(?:brano|canzone|traccia) precedente su (?P<target>.+)"),
+        ("turn_on", r"(?:accendi|accendere|attiva|attivare) (?P<target>.+)"),
+        ("turn_off", r"(?:spegni|spegnere|disattiva|disattivare) (?P<target>.+)"),
+    ),
+}
+
+# Politeness and request phrasing around the command
+_PREFIXES = {
+    "en": r"(?:(?:please|can you|could you|would you|will you|hey) )+",
+    "fr": (
+        r"(?:(?:s'il te plaît|s'il vous plaît|peux-tu|pourrais-tu|tu peux"
+        r"|est-ce que tu peux) )+"
+    ),
+    "it": r"(?:(?:per favore|puoi|potresti|per piacere) )+",
+}
+_SUFFIXES = {
+    "en": r" (?:please|for me|thanks|thank you)$",
+    "fr": r" (?:s'il te plaît|s'il vous plaît|stp|merci)$",
+    "it": r" (?:per favore|per piacere|grazie)$",
+}
+
+# Leading articles and possessives of a target ("the", "la", "gli", "my")
+_ARTICLES = {
+    "en": r"^(?:the|my|our) ",
+    "fr": r"^(?:le |la |les |l'|mon |ma |mes |notre |nos )",
+    "it": r"^(?:il |lo |la |i |gli |le |l'|mio |mia |miei |mie )",
+}
+
+_PUNCTUATION_RE = re.compile(r"[.,!?;:«»\"“”]+")
+_APOSTROPHE_RE = re.compile(r"[’‘`]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class Device:
+    """A Home Assistant entity exposed to the assistant.
+
+    Attributes:
+        name: Primary name (passed to hass_control as target)
+        aliases: Other names the entity answers to
+        domain: Entity domain ("light", "media_player", ...) if known
+    """
+
+    name: str
+    aliases: tuple[str, ...] = ()
+    domain: str | None = None
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """A command resolved to a single hass_control call."""
+
+    action: str
+    target: str
+    value: int | None = None
+
+    def arguments(self) -> dict:
+        """hass_control arguments."""
+        args: dict = {"action": self.action, "target": self.target}
+        if self.value is not None:
+            args["value"] = self.value
+        return args
+
+
+def parse_live_context(text: str) -> list[Device]:
+    """Parse the devices out of Home Assistant's GetLiveContext output.
+
+    The output is a YAML-like list with one "- names: Name, Alias" entry per
+    entity, followed by "domain:", "state:" and "areas:" fields.
+    """
+    devices = []
+    names: list[str] | None = None
+    domain: str | None = None
+
+    def flush() -> None:
+        if names:
+            devices.append(Device(names[0], tuple(names[1:]), domain))
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("- "):
+            stripped = stripped[2:]
+            if stripped.startswith("names:"):
+                flush()
+                names, domain = None, None
+        key, sep, value = stripped.partition(":")
+        if not sep:
+            continue
+        key, value = key.strip().lower(), value.strip().strip("'\"")
+        if key == "names":
+            names = [n.strip().strip("'\"") for n in value.split(",") if n.strip()]
+        elif key == "domain" and names:
+            domain = value or None
+    flush()
+    return devices
+
+
+class IntentRouter:
+    """Matches simple device commands without the LLM.
+
+    Args:
+        language: ISO 639-1 code selecting the pattern table (falls back
+            to English)
+        window: Samples kept for the latency comparison
+    """
+
+    def __init__(self, language: str = "en", window: int = 100) -> None:
+        lang = language if language in _PATTERNS else "en"
+        self.language = lang
+        self._patterns = [(action, re.compile(p)) for action, p in _PATTERNS[lang]]
+        self._prefix = re.compile(f"^{_PREFIXES[lang]}")
+        self._suffix = re.compile(_SUFFIXES[lang])
+        self._article = re.compile(_ARTICLES[lang])
+        self._devices: dict[str, list[Device]] = {}
+        self.devices_updated_at: float | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self._fast_ms: deque[float] = deque(maxlen=window)
+        self._llm_ms: deque[float] = deque(maxlen=window)
+
+    def update_devices(self, devices: Iterable[Device]) -> None:
+        """Replace the known devices (e.g. after a GetLiveContext refresh)."""
+        index: dict[str, list[Device]] = {}
+        for device in devices:
+            for name in (device.name, *device.aliases):
+                for key in {self._key(name), self._key(name, fold=True)}:
+                    if key and device not in index.setdefault(key, []):
+                        index[key].append(device)
+        self._devices = index
+        self.devices_updated_at = time.monotonic()
+        logger.debug(f"Intent router: {len(index)} device names indexed")
+
+    def devices_stale(self, max_age: float = DEVICES_MAX_AGE) -> bool:
+        """Whether the device names are missing or older than max_age."""
+        return (
+            self.devices_updated_at is None
+            or time.monotonic() - self.devices_updated_at > max_age
+        )
+
+    async def refresh_devices(self, fetch_live_context: Callable[[], Awaitable[str]]) -> None:
+        """Re-read device names from Home Assistant.
+
+        Args:
+            fetch_live_context: Coroutine function returning GetLiveContext
+                text (e.g. hass_get_state with no target)
+        """
+        # Mark as fresh up front so concurrent turns don't refresh too
+        self.devices_updated_at = time.monotonic()
+        try:
+            devices = parse_live_context(await fetch_live_context())
+        except Exception as e:
+            logger.warning(f"Intent router: failed to load Home Assistant devices: {e}")
+            return
+        self.update_devices(devices)
+
+    def match(self, text: str) -> IntentMatch | None:
+        """Resolve an utterance to one hass_control call, or None if it is
+        not a simple command on a single known device."""
+        if not self._devices:
+            return None
+        utterance = self._normalize(text)
+        for action, pattern in self._patterns:
+            m = pattern.fullmatch(utterance)
+            if m is None:
+                continue
+            device = self._resolve(m.group("target"), action)
+            if device is None:
+                # Matched the verb, but the target is not one known device
+                return None
+            value = None
+            if "value" in pattern.groupindex:
+                value = int(m.group("value"))
+                if value > 100:
+                    return None
+            return IntentMatch(action, device.name, value)
+        return None
+
+    def record_hit(self, elapsed_ms: float) -> None:
+        """Record a command handled on the fast path and log the savings."""
+        self.hits += 1
+        self._fast_ms.append(elapsed_ms)
+        total = self.hits + self.misses
+        saved = ""
+        if self._llm_ms:
+            llm_ms = sum(self._llm_ms) / len(self._llm_ms)
+            saved = f", ~{llm_ms - elapsed_ms:.0f}ms faster than the LLM path"
+        logger.info(
+            f"Intent fast path in {elapsed_ms:.0f}ms{saved} "
+            f"(hit rate {self.hits}/{total} = {self.hits / total:.0%})"
+        )
+
+    def record_miss(self) -> None:
+        """Record a turn that went to the LLM."""
+        self.misses += 1
+
+    def record_llm_turn(self, first_text_ms: float) -> None:
+        """Record how long an LLM turn took to its first text."""
+        self._llm_ms.append(first_text_ms)
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "fast_ms": round(sum(self._fast_ms) / len(self._fast_ms), 1) if self._fast_ms else 0.0,
+            "llm_ms": round(sum(self._llm_ms) / len(self._llm_ms), 1) if self._llm_ms else 0.0,
+        }
+
+    def _normalize(self, text: str) -> str:
+        text = _APOSTROPHE_RE.sub("'", text.lower())
+        text = _SPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", text)).strip()
+        text = self._prefix.sub("", text)
+        return self._suffix.sub("", text)
+
+    def _key(self, name: str, fold: bool = False) -> str:
+        key = self._article.sub("", self._normalize(name))
+        if fold:
+            # Crude plural folding: "kitchen lights" matches "Kitchen Light"
+            key = " ".join(w[:-1] if len(w) > 3 and w.endswith("s") else w for w in key.split())
+        return key
+
+    def _resolve(self, target: str, action: str) -> Device | None:
+        candidates = self._devices.get(self._key(target))
+        if candidates is None:
+            candidates = self._devices.get(self._key(target, fold=True), [])
+        if action in _MEDIA_ACTIONS:
+            candidates = [d for d in candidates if d.domain in (None, "media_player")]
+        else:
+            candidates = [d for d in candidates if d.domain in (None, *_SWITCHABLE_DOMAINS)]
+        if len(candidates) != 1:
+            return None
+        return candidates[0]
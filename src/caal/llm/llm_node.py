@@ -7,7 +7,7 @@ Key Features:
 - Provider-agnostic LLM calls via LLMProvider interface
 - Tool discovery from @function_tool methods and MCP servers
 - Tool execution routing (agent methods, n8n workflows, MCP tools)
-- Streaming responses for best UX
+- Tool-aware streaming: text reaches TTS before the model finishes
 
 Usage:
     class MyAgent(Agent):
@@ -20,23 +20,59 @@ Usage:
 
 from __future__ import annotations
 
-import inspect
+import asyncio
+import fnmatch
 import json
 import logging
 import time
-from collections.abc import AsyncIterable
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterable, Awaitable, Callable, Collection
+from contextlib import AbstractContextManager, aclosing, nullcontext
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from ..integrations.n8n import execute_n8n_workflow
-from ..utils.formatting import strip_markdown_for_tts
-from .providers import LLMProvider
+from ..utils.formatting import StreamingTTSSanitizer
+from .message_builder import MessageBuilder
+from .providers import LLMProvider, Priority
+from .tokens import (
+    TokenEstimator,
+    estimate_message_tokens,
+    estimate_tools_tokens,
+)
+from .tokens import estimate_tokens as default_estimate_tokens
+from .tool_call_repair import failed_generation, repair_tool_calls
+from .tool_index import ToolSelector
+from .tool_registry import WRAPPED_MCP_SERVERS, agent_tool_schemas, get_mcp_tools
+from .tool_result_cache import ToolResultCache
+from .tool_result_reducer import ToolResultReducer, shrink_json
+from .tool_schema import ToolArgumentError, validate_arguments
 
 if TYPE_CHECKING:
+    from ..tool_jobs import ToolJobManager
+    from ..tracing import TurnTrace
     from .providers import ToolCall
+    from .response_templates import ResponseTemplates
+    from .turn_budget import TurnBudget
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["llm_node", "ToolDataCache"]
+__all__ = ["llm_node", "GenerationStats", "ToolDataCache", "PROMPT_LAYOUTS"]
+
+# Pre-bound tool call: arguments -> result
+ToolExecutor = Callable[[dict], Awaitable[Any]]
+
+# Message layouts for _build_messages_from_context:
+#   default       - tool data block right after the system prompt
+#   stable_prefix - tool data block just before the latest user message, and
+#                   history trimmed in blocks, so the prompt prefix stays
+#                   identical across turns and local servers (Ollama, llama.cpp)
+#                   can reuse their KV cache instead of re-prefilling history
+PROMPT_LAYOUTS = ("default", "stable_prefix")
+
+# stable_prefix: history is trimmed this many messages at a time, so the
+# oldest kept message only changes every few turns
+_TRIM_BLOCK = 8
 
 
 class ToolDataCache:
@@ -45,32 +81,91 @@ class ToolDataCache:
     Tool responses often contain structured data (IDs, arrays) that the LLM
     needs for follow-up calls. This cache preserves that data separately
     from chat history and injects it into context on each LLM call.
+
+    Entries are serialized once when added, into a ring buffer of the last
+    max_entries calls. Each entry is limited to its share of max_chars
+    (long lists and strings are shortened, see shrink_json), so the
+    injected block stays within budget. The assembled context string is
+    reused until the next add.
     """
 
-    def __init__(self, max_entries: int = 3):
+    def __init__(self, max_entries: int = 3, max_chars: int = 4000):
         self.max_entries = max_entries
-        self._cache: list[dict] = []
+        self.max_chars = max_chars
+        self._entries: deque[str] = deque(maxlen=max(1, max_entries))
+        self._tool_names: deque[str] = deque(maxlen=self._entries.maxlen)
+        self._context: str | None = None
 
     def add(self, tool_name: str, data: Any, arguments: dict | None = None) -> None:
         """Add tool call and response data to cache."""
-        entry = {"tool": tool_name, "args": arguments, "data": data, "timestamp": time.time()}
-        self._cache.append(entry)
-        if len(self._cache) > self.max_entries:
-            self._cache.pop(0)  # Remove oldest
+        args = json.dumps(arguments, ensure_ascii=False, default=str) if arguments else ""
+        prefix = f"{tool_name}({args}) → "
+        budget = max(0, self.max_chars // self._entries.maxlen - len(prefix))
+        self._entries.append(prefix + shrink_json(data, budget))
+        self._tool_names.append(tool_name)
+        self._context = None
 
     def get_context_message(self) -> str | None:
         """Format cached data as context string for LLM injection."""
-        if not self._cache:
+        if not self._entries:
             return None
-        parts = ["Recent tool calls and responses for reference:"]
-        for entry in self._cache:
-            args = json.dumps(entry['args']) if entry.get('args') else ''
-            parts.append(f"\n{entry['tool']}({args}) → {json.dumps(entry['data'])}")
-        return "\n".join(parts)
+        if self._context is None:
+            parts = ["Recent tool calls and responses for reference:"]
+            parts.extend(f"\n{entry}" for entry in self._entries)
+            self._context = "\n".join(parts)
+        return self._context
+
+    def recent_tools(self) -> set[str]:
+        """Names of the tools whose data is cached."""
+        return set(self._tool_names)
 
     def clear(self) -> None:
         """Clear the cache."""
-        self._cache.clear()
+        self._entries.clear()
+        self._tool_names.clear()
+        self._context = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GenerationStats:
+    """Reply lengths and the generation saved by stopping interrupted replies.
+
+    When the user barges in, llm_node is closed and stops the provider
+    stream, so the rest of the reply is never generated. The tokens saved
+    are estimated as the average length of completed replies minus what was
+    generated before the interruption.
+
+    Args:
+        window: Completed replies kept for the average
+    """
+
+    def __init__(self, window: int = 50) -> None:
+        self._reply_tokens: deque[int] = deque(maxlen=window)
+        self.interruptions = 0
+        self.tokens_saved = 0
+
+    @property
+    def average_reply_tokens(self) -> float:
+        if not self._reply_tokens:
+            return 0.0
+        return sum(self._reply_tokens) / len(self._reply_tokens)
+
+    def record_reply(self, tokens: int) -> None:
+        """Record the length of a reply that was generated in full."""
+        self._reply_tokens.append(tokens)
+
+    def record_interruption(self, tokens_generated: int) -> int:
+        """Record a reply stopped after tokens_generated tokens.
+
+        Returns:
+            Estimated tokens saved by stopping it
+        """
+        saved = max(0, round(self.average_reply_tokens - tokens_generated))
+        self.interruptions += 1
+        self.tokens_saved += saved
+        return saved
 
 
 async def llm_node(
@@ -79,6 +174,22 @@ async def llm_node(
     provider: LLMProvider,
     tool_data_cache: ToolDataCache | None = None,
     max_turns: int = 20,
+    max_concurrent_tools: int = 4,
+    tool_timeout: float | None = 30.0,
+    message_builder: MessageBuilder | None = None,
+    context_tokens: int | None = None,
+    response_token_reserve: int = 512,
+    tool_result_cache: ToolResultCache | None = None,
+    tool_result_reducer: ToolResultReducer | None = None,
+    tool_selector: ToolSelector | None = None,
+    trace: TurnTrace | None = None,
+    prompt_layout: str = "default",
+    cancel_safe_tools: Collection[str] = (),
+    turn_budget: TurnBudget | None = None,
+    tool_jobs: ToolJobManager | None = None,
+    response_templates: ResponseTemplates | None = None,
+    validate_tool_arguments: bool = True,
+    speak_filler: Callable[[str], None] | None = None,
 ) -> AsyncIterable[str]:
     """Provider-agnostic LLM node with tool calling support.
 
@@ -90,6 +201,37 @@ async def llm_node(
         provider: LLMProvider instance (OllamaProvider, GroqProvider, etc.)
         tool_data_cache: Cache for structured tool response data
         max_turns: Max conversation turns to keep in sliding window
+        max_concurrent_tools: Max tool calls executed in parallel per round
+        tool_timeout: Per-tool timeout in seconds (None = no timeout)
+        message_builder: Per-agent incremental chat_ctx converter
+        context_tokens: Context window to budget history against (defaults
+            to the provider's context window, e.g. Ollama num_ctx)
+        response_token_reserve: Tokens kept free for the model's reply
+        tool_result_cache: TTL cache for results of idempotent tools
+        tool_result_reducer: Shrinks large tool results before they enter
+            the prompt (None = results are added in full)
+        tool_selector: Advertises only the tools relevant to the request
+            (None = every tool, every call)
+        trace: Latency trace of the current turn (None = not traced)
+        prompt_layout: Message layout, "default" or "stable_prefix"
+            (KV-cache friendly, see PROMPT_LAYOUTS)
+        cancel_safe_tools: Tool names (or fnmatch patterns) that may be
+            aborted mid-call when the turn is interrupted. Other tools run to
+            completion so their side effects are not left half-done. Tools
+            with a result cache TTL are idempotent reads and always cancel-safe.
+        turn_budget: Deadlines of this turn: filler phrases are spoken while
+            tools run past the soft deadline, and tool calls are cut off at
+            the hard deadline (None = per-tool timeouts only)
+        tool_jobs: Runs async tools (long n8n workflows) as background jobs
+            announced on completion (None = every tool runs inline)
+        response_templates: Replies for simple tool calls; a round whose
+            calls all succeeded and have a template is answered without a
+            follow-up LLM call (None = always ask the LLM)
+        validate_tool_arguments: Check and coerce tool call arguments against
+            the tool schemas before execution; invalid calls get an error
+            result without reaching n8n, MCP or Home Assistant
+        speak_filler: Speaks a filler phrase outside the reply, so it never
+            enters the chat history (None = no filler phrases)
 
     Yields:
         String chunks for TTS output
@@ -103,74 +245,138 @@ async def llm_node(
                     yield chunk
     """
     try:
-        # Build messages from chat context with sliding window
-        messages = _build_messages_from_context(
-            chat_ctx,
-            tool_data_cache=tool_data_cache,
-            max_turns=max_turns,
-        )
-
-        # Discover tools from agent and MCP servers
-        tools = await _discover_tools(agent)
+        with _span(trace, "tool_discovery") as span:
+            # Discover tools from agent and MCP servers
+            tools = all_tools = await _discover_tools(agent)
+
+            # Advertise only the tools relevant to this request
+            if tools and tool_selector is not None:
+                tools = tool_selector.select(
+                    tools,
+                    query=_recent_user_text(chat_ctx),
+                    pinned=tool_data_cache.recent_tools() if tool_data_cache is not None else (),
+                )
+            span["tools"] = len(tools) if tools else 0
+
+        # Build messages from chat context with token-budgeted sliding window
+        with _span(trace, "message_build"):
+            messages = _build_messages_from_context(
+                chat_ctx,
+                tool_data_cache=tool_data_cache,
+                max_turns=max_turns,
+                message_builder=message_builder,
+                context_tokens=context_tokens or provider.context_window,
+                tools=tools,
+                estimate_tokens=provider.estimate_tokens,
+                response_token_reserve=response_token_reserve,
+                prompt_layout=prompt_layout,
+            )
 
-        # If tools available, loop non-streaming calls to support chaining
+        # If tools available, loop tool-aware streaming calls to support chaining
         # Model can call tool A → get result → call tool B → get result → text
         max_tool_rounds = 5
         tool_round = 0
+        # Every dispatchable tool, not just the ones advertised this turn:
+        # the model may still call a tool the selector left out
+        tool_schemas = (
+            {t["function"]["name"]: t["function"].get("parameters") for t in all_tools}
+            if validate_tool_arguments and all_tools
+            else None
+        )
         all_tool_names: list[str] = []
         all_tool_params: list[dict] = []
 
         if tools:
             while tool_round < max_tool_rounds:
+                # Stream the round: text goes to TTS immediately, tool calls
+                # are collected and executed once the stream completes
+                round_result = _RoundResult()
+                # Rounds answering tool results yield to fresh user turns
+                priority = Priority.TOOL_FOLLOWUP if tool_round else Priority.INTERACTIVE
                 try:
-                    response = await provider.chat(messages=messages, tools=tools)
+                    async with aclosing(
+                        _stream_round(provider, messages, tools, round_result, trace, priority)
+                    ) as stream:
+                        async for text in stream:
+                            yield text
                 except Exception as tool_err:
+                    # Text already reached TTS — retrying would repeat it
+                    if round_result.spoken:
+                        logger.warning(f"Stream failed mid-response: {tool_err}")
+                        return
+
                     # Tool call generation failed (e.g., model garbled tool name)
                     err_msg = str(tool_err)
+                    # Tool call written as text — recover it without another round trip
+                    repaired = repair_tool_calls(failed_generation(tool_err), tools)
+                    if repaired:
+                        logger.warning(
+                            f"Malformed tool call, repaired locally: {err_msg}"
+                        )
+                        round_result = _RoundResult()
+                        round_result.tool_calls = repaired
                     # Wrong tool name — model called a non-existent tool
-                    if "not found" in err_msg:
+                    elif "not found" in err_msg:
                         logger.warning(
                             f"LLM called non-existent tool: {err_msg}. "
                             "Falling back to streaming."
                         )
                         break
-
-                    # Garbled tool call — leaked control tokens etc.
-                    is_garbled = (
-                        "tool_use_failed" in err_msg
-                        or "Failed to call a function" in err_msg
-                        or "[/THINK]" in err_msg
-                        or "[TOOL_CALLS]" in err_msg
-                        or "<function=" in err_msg
-                    )
-                    if is_garbled and tool_round == 0:
-                        logger.warning(
-                            f"Malformed tool call, retrying: {err_msg}"
+                    else:
+                        # Garbled tool call — leaked control tokens etc.
+                        is_garbled = (
+                            "tool_use_failed" in err_msg
+                            or "Failed to call a function" in err_msg
+                            or "[/THINK]" in err_msg
+                            or "[TOOL_CALLS]" in err_msg
+                            or "<function=" in err_msg
                         )
-                        try:
-                            response = await provider.chat(
-                                messages=messages, tools=tools
+                        if is_garbled and tool_round == 0:
+                            logger.warning(
+                                f"Malformed tool call, retrying: {err_msg}"
                             )
-                        except Exception:
+                            round_result = _RoundResult()
+                            try:
+                                async with aclosing(
+                                    _stream_round(
+                                        provider, messages, tools, round_result, trace, priority
+                                    )
+                                ) as stream:
+                                    async for text in stream:
+                                        yield text
+                            except Exception:
+                                if round_result.spoken:
+                                    return
+                                logger.warning(
+                                    "Retry failed, falling back to streaming"
+                                )
+                                break
+                        elif is_garbled:
                             logger.warning(
-                                "Retry failed, falling back to streaming"
+                                f"Malformed tool call in round {tool_round + 1}, "
+                                "streaming final response"
                             )
                             break
-                    elif is_garbled:
-                        logger.warning(
-                            f"Malformed tool call in round {tool_round + 1}, "
-                            "streaming final response"
-                        )
-                        break
-                    else:
-                        raise  # Re-raise non-tool errors
+                        else:
+                            raise  # Re-raise non-tool errors
+
+                if round_result.leaked and not round_result.tool_calls:
+                    repaired = repair_tool_calls(round_result.content, tools)
+                    if repaired:
+                        # The markup is the call itself, not assistant text
+                        round_result.tool_calls = repaired
+                        round_result.content_parts = []
+                if round_result.leaked and not round_result.tool_calls:
+                    logger.warning(
+                        "Tool call markup leaked into content, streaming final response"
+                    )
+                    break
 
-                if not response.tool_calls:
+                if not round_result.tool_calls:
                     # Model is done with tools
-                    if response.content:
+                    if round_result.spoken:
                         # Don't clear tool status — keep indicator showing
                         # which tools were used for this response
-                        yield strip_markdown_for_tts(response.content)
                         return
                     break  # No content either, fall through to streaming
 
@@ -178,28 +384,70 @@ async def llm_node(
                 tool_round += 1
                 logger.info(
                     f"Tool round {tool_round}/{max_tool_rounds}: "
-                    f"{len(response.tool_calls)} call(s)"
+                    f"{len(round_result.tool_calls)} call(s)"
                 )
 
                 # Accumulate tool usage across rounds for frontend indicator
-                all_tool_names.extend(tc.name for tc in response.tool_calls)
-                all_tool_params.extend(tc.arguments for tc in response.tool_calls)
+                all_tool_names.extend(tc.name for tc in round_result.tool_calls)
+                all_tool_params.extend(tc.arguments for tc in round_result.tool_calls)
 
                 if hasattr(agent, "_on_tool_status") and agent._on_tool_status:
-                    import asyncio
-
                     asyncio.create_task(
                         agent._on_tool_status(True, all_tool_names, all_tool_params)
                     )
 
-                messages = await _execute_tool_calls(
-                    agent,
-                    messages,
-                    response.tool_calls,
-                    response.content,
-                    provider=provider,
-                    tool_data_cache=tool_data_cache,
+                tool_task = asyncio.ensure_future(
+                    _execute_tool_calls(
+                        agent,
+                        messages,
+                        round_result.tool_calls,
+                        round_result.content,
+                        provider=provider,
+                        tool_data_cache=tool_data_cache,
+                        max_concurrent_tools=max_concurrent_tools,
+                        tool_timeout=tool_timeout,
+                        tool_result_cache=tool_result_cache,
+                        tool_result_reducer=tool_result_reducer,
+                        trace=trace,
+                        cancel_safe_tools=cancel_safe_tools,
+                        turn_budget=turn_budget,
+                        tool_jobs=tool_jobs,
+                        response_templates=response_templates,
+                        tool_schemas=tool_schemas,
+                    )
                 )
+                try:
+                    # Slow tools: tell the user we're still on it
+                    if turn_budget is not None and speak_filler is not None:
+                        turn_budget.start_waiting()
+                        while (wait := turn_budget.until_filler()) is not None:
+                            done, _ = await asyncio.wait({tool_task}, timeout=wait)
+                            if done:
+                                break
+                            if filler := turn_budget.next_filler():
+                                speak_filler(filler)
+                    messages, templated_reply = await tool_task
+                finally:
+                    # No-op once done; on interruption the tools get cancelled
+                    tool_task.cancel()
+
+                if templated_reply is not None:
+                    # Every call succeeded and has a template: no follow-up round
+                    logger.info(
+                        f"Templated reply for {len(round_result.tool_calls)} call(s), "
+                        "skipping follow-up LLM round"
+                    )
+                    if trace is not None:
+                        trace.mark("first_text")
+                    yield templated_reply
+                    return
+
+                if turn_budget is not None and turn_budget.expired:
+                    logger.warning(
+                        f"Turn deadline ({turn_budget.deadline:g}s) reached after "
+                        f"{tool_round} tool round(s), streaming response"
+                    )
+                    break
                 # Loop back — model sees tool results and decides: chain or respond
 
             if tool_round >= max_tool_rounds:
@@ -210,8 +458,6 @@ async def llm_node(
         # Stream final response (after tool chain or no tools)
         # Only clear tool indicator if no tools were called this turn
         if tool_round == 0 and hasattr(agent, "_on_tool_status") and agent._on_tool_status:
-            import asyncio
-
             asyncio.create_task(agent._on_tool_status(False, [], []))
 
         if tool_round > 0:
@@ -219,10 +465,16 @@ async def llm_node(
             # tool_calls in message history
             logger.info("Streaming response after tool execution...")
             try:
-                async for chunk in provider.chat_stream(
-                    messages=messages, tools=tools
-                ):
-                    yield strip_markdown_for_tts(chunk)
+                async with aclosing(
+                    _sanitize_stream(
+                        provider.chat_stream(
+                            messages=messages, tools=tools, priority=Priority.TOOL_FOLLOWUP
+                        ),
+                        trace,
+                    )
+                ) as stream:
+                    async for text in stream:
+                        yield text
             except Exception as stream_err:
                 # Safety fallback: strip tool messages and retry without tools
                 logger.warning(
@@ -230,18 +482,156 @@ async def llm_node(
                     "Retrying with stripped tool messages..."
                 )
                 clean_messages = _strip_tool_messages(messages)
-                async for chunk in provider.chat_stream(messages=clean_messages):
-                    yield strip_markdown_for_tts(chunk)
+                async with aclosing(
+                    _sanitize_stream(
+                        provider.chat_stream(
+                            messages=clean_messages, priority=Priority.TOOL_FOLLOWUP
+                        ),
+                        trace,
+                    )
+                ) as stream:
+                    async for text in stream:
+                        yield text
         else:
             # No tools or no tool calls — plain streaming
-            async for chunk in provider.chat_stream(messages=messages):
-                yield strip_markdown_for_tts(chunk)
+            async with aclosing(
+                _sanitize_stream(provider.chat_stream(messages=messages), trace)
+            ) as stream:
+                async for text in stream:
+                    yield text
 
     except Exception as e:
         logger.error(f"Error in llm_node: {e}", exc_info=True)
         yield f"I encountered an error: {e}"
 
 
+# Markup some models leak into content instead of emitting a real tool call
+_TOOL_CALL_LEAK_MARKERS = ("[TOOL_CALLS]", "<tool_call>", "<function=", "<|python_tag|>")
+_LEAK_GUARD_CHARS = max(len(marker) for marker in _TOOL_CALL_LEAK_MARKERS)
+
+
+class _RoundResult:
+    """Outcome of one streamed tool round, filled in by _stream_round()."""
+
+    def __init__(self) -> None:
+        self.content_parts: list[str] = []
+        self.tool_calls: list[ToolCall] = []
+        self.spoken = False  # Any text already forwarded to TTS
+        self.leaked = False  # Content started with tool call markup
+        self.first_chunk_at: float | None = None  # perf_counter() of first chunk
+
+    @property
+    def content(self) -> str | None:
+        return "".join(self.content_parts) or None
+
+
+async def _stream_round(
+    provider: LLMProvider,
+    messages: list[dict],
+    tools: list[dict],
+    result: _RoundResult,
+    trace: TurnTrace | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> AsyncIterable[str]:
+    """Stream one tool-enabled LLM round, yielding speakable text.
+
+    Text is forwarded as soon as it arrives. Once a tool call shows up, the
+    rest of the round's text is kept for the tool call message but not spoken.
+    The opening characters are held back until they can no longer be leaked
+    tool call markup, so that markup never reaches TTS.
+    """
+    sanitizer = StreamingTTSSanitizer()
+    pending = ""
+    start = time.perf_counter()
+    chunks = provider.chat_stream_with_tools(messages=messages, tools=tools, priority=priority)
+    try:
+        async for chunk in chunks:
+            if result.first_chunk_at is None:
+                result.first_chunk_at = time.perf_counter()
+            if chunk.tool_calls:
+                result.tool_calls.extend(chunk.tool_calls)
+            if not chunk.content:
+                continue
+            result.content_parts.append(chunk.content)
+            if result.tool_calls or result.leaked:
+                continue
+
+            if result.spoken:
+                text = chunk.content
+            else:
+                pending += chunk.content
+                head = pending.lstrip()
+                if head.startswith(_TOOL_CALL_LEAK_MARKERS):
+                    result.leaked = True
+                    continue
+                if len(head) < _LEAK_GUARD_CHARS and any(
+                    marker.startswith(head) for marker in _TOOL_CALL_LEAK_MARKERS
+                ):
+                    continue  # Still ambiguous, wait for more
+                text, pending = pending, ""
+
+            result.spoken = True
+            if text := sanitizer.push(text):
+                if trace is not None:
+                    trace.mark("first_text")
+                yield text
+
+        tail = ""
+        if pending and not result.tool_calls and not result.leaked:
+            result.spoken = True
+            tail = sanitizer.push(pending)
+        if tail := tail + sanitizer.flush():
+            if trace is not None:
+                trace.mark("first_text")
+            yield tail
+    finally:
+        # Stops generation on the server if the round was cut short
+        await chunks.aclose()
+        if trace is not None:
+            _add_llm_span(
+                trace, start, result.first_chunk_at, tool_calls=len(result.tool_calls)
+            )
+
+
+async def _sanitize_stream(
+    chunks: AsyncGenerator[str, None], trace: TurnTrace | None = None
+) -> AsyncIterable[str]:
+    """Strip markdown from streamed text for TTS, across chunk boundaries."""
+    sanitizer = StreamingTTSSanitizer()
+    start = time.perf_counter()
+    first_chunk_at: float | None = None
+    try:
+        async for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+            if text := sanitizer.push(chunk):
+                if trace is not None:
+                    trace.mark("first_text")
+                yield text
+        if tail := sanitizer.flush():
+            if trace is not None:
+                trace.mark("first_text")
+            yield tail
+    finally:
+        await chunks.aclose()
+        if trace is not None:
+            _add_llm_span(trace, start, first_chunk_at)
+
+
+def _add_llm_span(
+    trace: TurnTrace, start: float, first_chunk_at: float | None, **attrs: Any
+) -> None:
+    """Record one provider round as an llm_total span with its TTFT."""
+    if first_chunk_at is not None:
+        attrs["ttft_ms"] = round((first_chunk_at - start) * 1000, 1)
+    trace.add_span("llm_total", start, **attrs)
+
+
+def _span(trace: TurnTrace | None, name: str) -> AbstractContextManager[dict[str, Any]]:
+    """trace.span(name), or a no-op when the turn is not traced."""
+    return trace.span(name) if trace is not None else nullcontext({})
+
+
 def _strip_tool_messages(messages: list[dict]) -> list[dict]:
     """Convert tool call/result messages to plain text.
 
@@ -280,65 +670,48 @@ def _build_messages_from_context(
     chat_ctx,
     tool_data_cache: ToolDataCache | None = None,
     max_turns: int = 20,
+    message_builder: MessageBuilder | None = None,
+    context_tokens: int | None = None,
+    tools: list[dict] | None = None,
+    estimate_tokens: TokenEstimator = default_estimate_tokens,
+    response_token_reserve: int = 512,
+    prompt_layout: str = "default",
 ) -> list[dict]:
     """Build messages with sliding window and tool data context.
 
-    Message order:
+    Message order (default layout):
     1. System prompt (always first, never trimmed)
     2. Tool data context (injected from cache)
     3. Chat history (sliding window applied)
 
+    The stable_prefix layout injects the tool data context just before the
+    latest user message instead, and trims history _TRIM_BLOCK messages at
+    a time. The system prompt and older history then form a prefix that
+    stays the same from turn to turn, even as the tool data changes.
+
+    When context_tokens is set, history is filled newest-first up to a token
+    budget: the context window minus the system prompt, the tool data block,
+    the tool schemas and a reserve for the reply. max_turns still caps the
+    number of messages.
+
     Args:
         chat_ctx: LiveKit chat context
         tool_data_cache: Cache of recent tool response data
         max_turns: Max conversation turns to keep (1 turn = user + assistant)
+        message_builder: Per-agent incremental converter (converts from
+            scratch if not provided)
+        context_tokens: Context window size in tokens (None = turn count only)
+        tools: Tool schemas sent with the request (counted against the budget)
+        estimate_tokens: Token estimator for the provider/model
+        response_token_reserve: Tokens kept free for the model's reply
+        prompt_layout: "default" or "stable_prefix"
     """
-    system_prompt = None
-    chat_messages = []
-
-    for item in chat_ctx.items:
-        item_type = type(item).__name__
-
-        if item_type == "ChatMessage":
-            msg = {"role": item.role, "content": item.text_content}
-            if item.role == "system":
-                system_prompt = msg
-            else:
-                chat_messages.append(msg)
-        elif item_type == "FunctionCall":
-            try:
-                # Arguments must be JSON string for Groq compatibility
-                args = getattr(item, "arguments", {}) or {}
-                args_str = json.dumps(args) if isinstance(args, dict) else str(args)
-                chat_messages.append(
-                    {
-                        "role": "assistant",
-                        "content": "",
-                        "tool_calls": [
-                            {
-                                "id": item.id,
-                                "type": "function",
-                                "function": {
-                                    "name": item.name,
-                                    "arguments": args_str,
-                                },
-                            }
-                        ],
-                    }
-                )
-            except AttributeError:
-                pass
-        elif item_type == "FunctionCallOutput":
-            try:
-                chat_messages.append(
-                    {
-                        "role": "tool",
-                        "content": str(item.content),
-                        "tool_call_id": item.tool_call_id,
-                    }
-                )
-            except AttributeError:
-                pass
+    stable_prefix = prompt_layout == "stable_prefix"
+    # Trim blocks never take more than a quarter of the window
+    trim_block = min(_TRIM_BLOCK, max(1, max_turns // 2)) if stable_prefix else 1
+    if message_builder is None:
+        message_builder = MessageBuilder()
+    system_prompt, chat_messages = message_builder.build(chat_ctx.items)
 
     # Build final message list
     messages = []
@@ -347,89 +720,126 @@ def _build_messages_from_context(
     if system_prompt:
         messages.append(system_prompt)
 
-    # 2. Inject tool data context
-    if tool_data_cache:
+    # 2. Tool data context
+    context_message = None
+    if tool_data_cache is not None:
         context = tool_data_cache.get_context_message()
         if context:
-            messages.append({"role": "system", "content": context})
+            context_message = {"role": "system", "content": context}
+            if not stable_prefix:
+                messages.append(context_message)
 
     # 3. Apply sliding window to chat history
     # max_turns * 2 accounts for user + assistant pairs
     max_messages = max_turns * 2
     if len(chat_messages) > max_messages:
-        trimmed = len(chat_messages) - max_messages
-        chat_messages = chat_messages[-max_messages:]
+        trimmed = _round_up(len(chat_messages) - max_messages, trim_block)
+        trimmed = min(trimmed, len(chat_messages) - 1)
+        chat_messages = chat_messages[trimmed:]
         logger.debug(f"Sliding window: trimmed {trimmed} old messages")
 
+    if context_tokens:
+        reserved = (
+            response_token_reserve
+            + sum(estimate_message_tokens(m, estimate_tokens) for m in messages)
+            + estimate_tools_tokens(tools, estimate_tokens)
+        )
+        if stable_prefix and context_message is not None:
+            reserved += estimate_message_tokens(context_message, estimate_tokens)
+        chat_messages = _apply_token_budget(
+            chat_messages, context_tokens - reserved, estimate_tokens, trim_block
+        )
+
     messages.extend(chat_messages)
+
+    # stable_prefix: volatile context goes after the stable history
+    if stable_prefix and context_message is not None:
+        messages.insert(_last_user_index(messages), context_message)
     return messages
 
 
+def _round_up(count: int, block: int) -> int:
+    return -(-count // block) * block
+
+
+def _last_user_index(messages: list[dict]) -> int:
+    """Index of the latest user message (end of the list if there is none)."""
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].get("role") == "user":
+            return i
+    return len(messages)
+
+
+def _apply_token_budget(
+    chat_messages: list[dict],
+    budget: int,
+    estimate_tokens: TokenEstimator,
+    trim_block: int = 1,
+) -> list[dict]:
+    """Keep the newest messages that fit in the token budget.
+
+    The latest message is always kept (it is what the model must answer).
+    Tool results whose tool call was dropped are dropped too, since providers
+    reject orphaned tool messages. With trim_block > 1, whole blocks of old
+    messages are dropped, so the first kept message changes less often.
+    """
+    used = 0
+    start = len(chat_messages)
+    for i in range(len(chat_messages) - 1, -1, -1):
+        tokens = estimate_message_tokens(chat_messages[i], estimate_tokens)
+        if used + tokens > budget and start < len(chat_messages):
+            break
+        used += tokens
+        start = i
+
+    if start and trim_block > 1:
+        start = min(_round_up(start, trim_block), len(chat_messages) - 1)
+        used = sum(estimate_message_tokens(m, estimate_tokens) for m in chat_messages[start:])
+
+    # Never start history with an orphaned tool result
+    while start < len(chat_messages) - 1 and chat_messages[start].get("role") == "tool":
+        used -= estimate_message_tokens(chat_messages[start], estimate_tokens)
+        start += 1
+
+    dropped = sum(
+        estimate_message_tokens(m, estimate_tokens) for m in chat_messages[:start]
+    )
+    logger.info(
+        f"Context budget: {max(budget, 0)} tokens for history, "
+        f"kept {len(chat_messages) - start} message(s) (~{used} tokens), "
+        f"dropped {start} (~{dropped} tokens)"
+    )
+    return chat_messages[start:]
+
+
 async def _discover_tools(agent) -> list[dict] | None:
-    """Discover tools from agent methods and MCP servers.
+    """Collect tool definitions for the agent.
 
-    Tools are cached on the agent instance after first discovery to avoid
-    redundant MCP API calls on every user utterance.
+    Agent method schemas are shared per class, and MCP/n8n schemas come from
+    the agent's ToolSnapshot (process-wide registry) when it has one. The
+    combined list is cached on the agent instance until tools are reloaded.
     """
     # Return cached tools if available
-    if hasattr(agent, "_llm_tools_cache") and agent._llm_tools_cache is not None:
+    if (
+        getattr(agent, "_llm_tools_cache", None) is not None
+        and getattr(agent, "_tool_dispatch", None) is not None
+    ):
         return agent._llm_tools_cache
 
-    tools = []
-
     # Get @function_tool decorated methods from agent (bound methods on class)
-    if hasattr(agent, "_tools") and agent._tools:
-        for tool in agent._tools:
-            if hasattr(tool, "__func__"):
-                func = tool.__func__
-                name = func.__name__
-                description = func.__doc__ or ""
-                sig = inspect.signature(func)
-                properties = {}
-                required = []
-
-                for param_name, param in sig.parameters.items():
-                    if param_name == "self":
-                        continue
-                    param_type = "string"
-                    if param.annotation is not inspect.Parameter.empty:
-                        if param.annotation is str:
-                            param_type = "string"
-                        elif param.annotation is int:
-                            param_type = "integer"
-                        elif param.annotation is float:
-                            param_type = "number"
-                        elif param.annotation is bool:
-                            param_type = "boolean"
-                    properties[param_name] = {"type": param_type}
-                    if param.default is inspect.Parameter.empty and param_name != "self":
-                        required.append(param_name)
-
-                tools.append(
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": name,
-                            "description": description,
-                            "parameters": {
-                                "type": "object",
-                                "properties": properties,
-                                "required": required,
-                            },
-                        },
-                    }
-                )
+    tools = agent_tool_schemas(agent)
 
     # Get MCP tools from all configured servers (except n8n and home_assistant)
-    # n8n uses webhook-based workflow discovery, not direct MCP tools
-    # home_assistant uses wrapper tools (hass_control, hass_get_state) for simpler LLM interface
-    if hasattr(agent, "_caal_mcp_servers") and agent._caal_mcp_servers:
+    snapshot = getattr(agent, "_tool_snapshot", None)
+    if snapshot is not None:
+        tools.extend(snapshot.mcp_tool_list())
+    elif hasattr(agent, "_caal_mcp_servers") and agent._caal_mcp_servers:
         for server_name, server in agent._caal_mcp_servers.items():
             # Skip servers that use wrapper tools instead of raw MCP tools
-            if server_name in ("n8n", "home_assistant"):
+            if server_name in WRAPPED_MCP_SERVERS:
                 continue
 
-            mcp_tools = await _get_mcp_tools(server)
+            mcp_tools = await get_mcp_tools(server)
             # Prefix tools with server name to avoid collisions
             for tool in mcp_tools:
                 original_name = tool["function"]["name"]
@@ -446,51 +856,92 @@ async def _discover_tools(agent) -> list[dict] | None:
     if hasattr(agent, "_hass_tool_definitions") and agent._hass_tool_definitions:
         tools.extend(agent._hass_tool_definitions)
 
-    # Cache tools on agent and return
+    # Cache tools (and the matching dispatch table) on agent and return
     result = tools if tools else None
+    agent._tool_dispatch = _build_dispatch_table(agent, tools)
     agent._llm_tools_cache = result
 
     return result
 
 
-async def _get_mcp_tools(mcp_server) -> list[dict]:
-    """Get tools from an MCP server in OpenAI format."""
-    tools = []
+def _recent_user_text(chat_ctx, count: int = 2) -> str:
+    """Text of the last few user messages (query for tool selection)."""
+    texts = []
+    for item in reversed(chat_ctx.items):
+        if type(item).__name__ == "ChatMessage" and item.role == "user":
+            texts.append(item.text_content or "")
+            if len(texts) == count:
+                break
+    return " ".join(reversed(texts))
 
-    if not mcp_server or not hasattr(mcp_server, "_client") or not mcp_server._client:
-        return tools
 
-    try:
-        tools_result = await mcp_server._client.list_tools()
-        if hasattr(tools_result, "tools"):
-            for mcp_tool in tools_result.tools:
-                # Convert MCP schema to OpenAI format
-                parameters = {"type": "object", "properties": {}, "required": []}
-                if hasattr(mcp_tool, "inputSchema") and mcp_tool.inputSchema:
-                    schema = mcp_tool.inputSchema
-                    if isinstance(schema, dict):
-                        parameters = schema.copy()
-                    elif hasattr(schema, "properties"):
-                        parameters["properties"] = schema.properties or {}
-                        parameters["required"] = getattr(schema, "required", []) or []
-
-                tools.append(
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": mcp_tool.name,
-                            "description": getattr(mcp_tool, "description", "") or "",
-                            "parameters": parameters,
-                        },
-                    }
+def _build_dispatch_table(agent, tools: list[dict]) -> dict[str, ToolExecutor]:
+    """Map each advertised tool name to a pre-bound executor.
+
+    Routing priority (first match wins):
+    1. Home Assistant tools (callable dict)
+    2. Agent methods (@function_tool decorated on class)
+    3. n8n workflows (webhook-based execution)
+    4. MCP servers (server_name__tool_name prefix)
+    """
+    hass_callables = getattr(agent, "_hass_tool_callables", None) or {}
+    n8n_name_map = getattr(agent, "_n8n_workflow_name_map", None) or {}
+    n8n_base_url = getattr(agent, "_n8n_base_url", None)
+    mcp_servers = getattr(agent, "_caal_mcp_servers", None) or {}
+
+    dispatch: dict[str, ToolExecutor] = {}
+    for tool in tools:
+        name = tool["function"]["name"]
+        if name in dispatch:
+            continue
+
+        if name in hass_callables:
+            dispatch[name] = _callable_executor("HASS tool", name, hass_callables[name])
+        elif callable(getattr(agent, name, None)):
+            dispatch[name] = _callable_executor("agent tool", name, getattr(agent, name))
+        elif name in n8n_name_map and n8n_base_url:
+            dispatch[name] = _n8n_executor(name, n8n_base_url, n8n_name_map[name])
+        elif "__" in name:
+            server_name, actual_tool = name.split("__", 1)
+            if server_name in mcp_servers:
+                dispatch[name] = _mcp_executor(
+                    name, mcp_servers[server_name], actual_tool
                 )
 
-        # Don't log here - caller logs the summary
+        if name not in dispatch:
+            logger.warning(f"No executor for advertised tool: {name}")
 
-    except Exception as e:
-        logger.warning(f"Error getting MCP tools: {e}")
+    return dispatch
+
+
+def _callable_executor(kind: str, tool_name: str, func: Callable[..., Awaitable[Any]]):
+    async def execute(arguments: dict) -> Any:
+        logger.info(f"Calling {kind}: {tool_name}")
+        result = await func(**arguments)
+        logger.info(f"{kind[0].upper()}{kind[1:]} {tool_name} completed")
+        return result
+
+    return execute
+
+
+def _n8n_executor(tool_name: str, base_url: str, workflow_name: str):
+    async def execute(arguments: dict) -> Any:
+        logger.info(f"Calling n8n workflow: {tool_name}")
+        result = await execute_n8n_workflow(base_url, workflow_name, arguments)
+        logger.info(f"n8n workflow {tool_name} completed")
+        return result
 
-    return tools
+    return execute
+
+
+def _mcp_executor(tool_name: str, server, actual_tool: str):
+    async def execute(arguments: dict) -> Any:
+        result = await _call_mcp_tool(server, actual_tool, arguments)
+        if result is None:
+            raise ValueError(f"MCP tool {tool_name} failed")
+        return result
+
+    return execute
 
 
 async def _execute_tool_calls(
@@ -500,8 +951,22 @@ async def _execute_tool_calls(
     response_content: str | None,
     provider: LLMProvider,
     tool_data_cache: ToolDataCache | None = None,
-) -> list[dict]:
-    """Execute tool calls and append results to messages.
+    max_concurrent_tools: int = 4,
+    tool_timeout: float | None = 30.0,
+    tool_result_cache: ToolResultCache | None = None,
+    tool_result_reducer: ToolResultReducer | None = None,
+    trace: TurnTrace | None = None,
+    cancel_safe_tools: Collection[str] = (),
+    turn_budget: TurnBudget | None = None,
+    tool_jobs: ToolJobManager | None = None,
+    response_templates: ResponseTemplates | None = None,
+    tool_schemas: dict[str, dict | None] | None = None,
+) -> tuple[list[dict], str | None]:
+    """Execute tool calls concurrently and append results to messages.
+
+    Independent calls in a round run in parallel (bounded by
+    max_concurrent_tools). Results are appended in the original tool call
+    order so providers accept the history regardless of completion order.
 
     Args:
         agent: The agent instance
@@ -510,7 +975,41 @@ async def _execute_tool_calls(
         response_content: Original LLM response content (if any)
         provider: LLM provider (for formatting tool results)
         tool_data_cache: Optional cache to store structured tool response data
+        max_concurrent_tools: Max tools executing at once within the round
+        tool_timeout: Per-tool timeout in seconds (None = no timeout)
+        tool_result_cache: Optional TTL cache for results of idempotent tools
+        tool_result_reducer: Optional per-tool size reduction of results
+        trace: Optional latency trace (one "tool" span per execution)
+        cancel_safe_tools: Tool names (or fnmatch patterns) aborted when the
+            round is cancelled; other tools are left to finish in the background
+        turn_budget: Optional turn deadline, shortening tool timeouts to the
+            time left in the turn
+        tool_jobs: Optional background runner; async tools return an
+            acknowledgement instead of their result
+        response_templates: Optional templates rendering the spoken reply
+            of the round
+        tool_schemas: Optional tool name -> parameters schema of every
+            dispatchable tool; arguments are coerced to it, and calls that
+            don't match are answered with the validation error instead of
+            being executed
+
+    Returns:
+        The updated messages, and the templated reply if every call
+        succeeded and has a template (None = the LLM should answer)
     """
+    # Check arguments locally: a bad call fails here, with a precise error,
+    # instead of remotely after a network round trip
+    argument_errors: dict[tuple[str, str], str] = {}
+    if tool_schemas:
+        for tc in tool_calls:
+            if tc.name not in tool_schemas:
+                continue
+            try:
+                tc.arguments = validate_arguments(tc.name, tc.arguments, tool_schemas[tc.name])
+            except ToolArgumentError as e:
+                logger.warning(str(e))
+                argument_errors[_call_key(tc)] = str(e)
+
     # Add assistant message with tool calls
     tool_call_message = provider.format_tool_call_message(
         content=response_content,
@@ -518,119 +1017,223 @@ async def _execute_tool_calls(
     )
     messages.append(tool_call_message)
 
-    # Deduplicate identical tool calls (same name + same args)
-    seen = set()
-    unique_tool_calls = []
-    for tc in tool_calls:
-        key = (tc.name, json.dumps(tc.arguments, sort_keys=True))
-        if key not in seen:
-            seen.add(key)
-            unique_tool_calls.append(tc)
+    # Deduplicate identical tool calls (same name + same args). Duplicates
+    # still get a result message (providers require one per tool_call_id),
+    # they just reuse the result of the first call.
+    call_keys = [_call_key(tc) for tc in tool_calls]
+    unique_calls: dict[tuple[str, str], ToolCall] = {}
+    for key, tc in zip(call_keys, tool_calls):
+        if key not in unique_calls:
+            unique_calls[key] = tc
         else:
             logger.info(f"Dedup: skipping duplicate {tc.name} call with identical args")
-    tool_calls = unique_tool_calls
 
-    # Execute each tool
-    for tool_call in tool_calls:
-        tool_name = tool_call.name
-        arguments = tool_call.arguments
-        logger.info(f"Executing tool: {tool_name} with args: {arguments}")
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_tools))
+
+    async def _run(tool_call: ToolCall) -> _ToolOutcome:
+        outcome = await _run_untraced(tool_call)
+        if trace is not None:
+            trace.add_span(
+                "tool",
+                time.perf_counter() - outcome.elapsed,
+                tool=tool_call.name,
+                ok=outcome.error is None,
+            )
+        return outcome
+
+    async def _run_untraced(tool_call: ToolCall) -> _ToolOutcome:
+        if error := argument_errors.get(_call_key(tool_call)):
+            return _ToolOutcome(error=error)
 
-        try:
-            tool_result = await _execute_single_tool(agent, tool_name, arguments)
+        if tool_jobs is not None and tool_jobs.is_async(tool_call.name):
+            job = tool_jobs.submit(
+                tool_call.name,
+                tool_call.arguments,
+                lambda: _execute_single_tool(agent, tool_call.name, tool_call.arguments),
+            )
+            return _ToolOutcome(result=job.acknowledgement())
+
+        async with semaphore:
+            logger.info(f"Executing tool: {tool_call.name} with args: {tool_call.arguments}")
+            start = time.perf_counter()
+            if tool_result_cache is not None:
+                call = tool_result_cache.get_or_call(
+                    tool_call.name,
+                    tool_call.arguments,
+                    lambda: _execute_single_tool(agent, tool_call.name, tool_call.arguments),
+                )
+            else:
+                call = _execute_single_tool(agent, tool_call.name, tool_call.arguments)
+            timeout = tool_timeout
+            deadline_bound = False
+            if turn_budget is not None:
+                timeout = turn_budget.tool_timeout(tool_timeout)
+                deadline_bound = turn_budget.is_deadline_bound(tool_timeout)
+            task = asyncio.ensure_future(asyncio.wait_for(call, timeout=timeout))
+            cancel_safe = _is_cancel_safe(tool_call.name, cancel_safe_tools, tool_result_cache)
+            try:
+                # A barge-in cancels this round: abort reads, but never leave
+                # an action (light switch, n8n workflow) half-done
+                result = await (task if cancel_safe else asyncio.shield(task))
+                return _ToolOutcome(result=result, elapsed=time.perf_counter() - start)
+            except asyncio.CancelledError:
+                if cancel_safe:
+                    logger.info(f"Interrupted: cancelled tool {tool_call.name}")
+                else:
+                    logger.info(f"Interrupted: letting tool {tool_call.name} finish")
+                    task.add_done_callback(partial(_log_detached_tool, tool_call.name))
+                raise
+            except asyncio.TimeoutError:
+                if deadline_bound:
+                    logger.warning(
+                        f"Tool {tool_call.name} stopped at the turn deadline after {timeout:.1f}s"
+                    )
+                    error_msg = turn_budget.timeout_result(tool_call.name)
+                else:
+                    error_msg = f"Tool {tool_call.name} timed out after {tool_timeout:g}s"
+                    logger.warning(error_msg)
+            except Exception as e:
+                error_msg = f"Error executing tool {tool_call.name}: {e}"
+                logger.error(error_msg, exc_info=True)
+            return _ToolOutcome(error=error_msg, elapsed=time.perf_counter() - start)
+
+    round_start = time.perf_counter()
+    outcomes = dict(
+        zip(
+            unique_calls.keys(),
+            await asyncio.gather(*(_run(tc) for tc in unique_calls.values())),
+        )
+    )
+    wall_ms = (time.perf_counter() - round_start) * 1000
+    if len(outcomes) > 1:
+        sequential_ms = sum(o.elapsed for o in outcomes.values()) * 1000
+        logger.info(
+            f"Tool round: {len(outcomes)} call(s) in {wall_ms:.0f}ms "
+            f"(sequential ~{sequential_ms:.0f}ms, saved ~{sequential_ms - wall_ms:.0f}ms)"
+        )
+    if tool_result_cache is not None:
+        logger.debug(f"Tool result cache: {tool_result_cache.stats()}")
 
-            # Cache structured data if present
-            if tool_data_cache and isinstance(tool_result, dict):
+    # Cache structured data once per unique call
+    if tool_data_cache is not None:
+        for key, tc in unique_calls.items():
+            tool_result = outcomes[key].result
+            if isinstance(tool_result, dict):
                 # Look for common data fields, otherwise cache the whole result
                 data = (
                     tool_result.get("data")
                     or tool_result.get("results")
                     or tool_result
                 )
-                tool_data_cache.add(tool_name, data, arguments=arguments)
-                logger.debug(f"Cached tool data for {tool_name}")
+                tool_data_cache.add(tc.name, data, arguments=tc.arguments)
+                logger.debug(f"Cached tool data for {tc.name}")
+
+    # Reply built locally when every call succeeded and has a template
+    templated_reply = None
+    if response_templates is not None:
+        replies = []
+        for key, tc in unique_calls.items():
+            outcome = outcomes[key]
+            if outcome.error is not None:
+                break
+            reply = response_templates.render(tc.name, tc.arguments, outcome.result)
+            if reply is None:
+                break
+            replies.append(reply)
+        else:
+            templated_reply = " ".join(replies) or None
+
+    # Render each unique result once (reduced to its prompt budget)
+    async def _render(tool_call: ToolCall, outcome: _ToolOutcome) -> str:
+        if outcome.error is not None:
+            return outcome.error
+        if tool_result_reducer is not None:
+            return await tool_result_reducer.reduce(
+                tool_call.name, outcome.result, tool_call.arguments
+            )
+        if isinstance(outcome.result, dict):
+            # Preserve JSON structure for LLM
+            return json.dumps(outcome.result)
+        return str(outcome.result)
+
+    contents = dict(
+        zip(
+            unique_calls.keys(),
+            await asyncio.gather(
+                *(_render(tc, outcomes[key]) for key, tc in unique_calls.items())
+            ),
+        )
+    )
 
-            # Format tool result - preserve JSON structure for LLM
-            if isinstance(tool_result, dict):
-                result_content = json.dumps(tool_result)
-            else:
-                result_content = str(tool_result)
+    # Append results in original tool call order
+    for key, tool_call in zip(call_keys, tool_calls):
+        result_content = contents[key]
 
-            result_message = provider.format_tool_result(
-                content=result_content,
-                tool_call_id=tool_call.id,
-                tool_name=tool_name,
-            )
-            messages.append(result_message)
-
-        except Exception as e:
-            error_msg = f"Error executing tool {tool_name}: {e}"
-            logger.error(error_msg, exc_info=True)
-            result_message = provider.format_tool_result(
-                content=error_msg,
-                tool_call_id=tool_call.id,
-                tool_name=tool_name,
-            )
-            messages.append(result_message)
+        result_message = provider.format_tool_result(
+            content=result_content,
+            tool_call_id=tool_call.id,
+            tool_name=tool_call.name,
+        )
+        messages.append(result_message)
 
-    return messages
+    return messages, templated_reply
 
 
-async def _execute_single_tool(agent, tool_name: str, arguments: dict) -> Any:
-    """Execute a single tool call.
+def _call_key(tool_call: ToolCall) -> tuple[str, str]:
+    """Identity of a tool call: same name and arguments give the same result."""
+    return tool_call.name, json.dumps(tool_call.arguments, sort_keys=True)
 
-    Routing priority:
-    1. Home Assistant tools (callable dict)
-    2. Agent methods (@function_tool decorated on class)
-    3. n8n workflows (webhook-based execution)
-    4. MCP servers (with server_name__tool_name prefix parsing)
-    """
-    # Check Home Assistant tools (callable functions stored in dict)
-    if hasattr(agent, "_hass_tool_callables") and tool_name in agent._hass_tool_callables:
-        logger.info(f"Calling HASS tool: {tool_name}")
-        result = await agent._hass_tool_callables[tool_name](**arguments)
-        logger.info(f"HASS tool {tool_name} completed")
-        return result
 
-    # Check if it's an agent method (decorated on class)
-    if hasattr(agent, tool_name) and callable(getattr(agent, tool_name)):
-        logger.info(f"Calling agent tool: {tool_name}")
-        result = await getattr(agent, tool_name)(**arguments)
-        logger.info(f"Agent tool {tool_name} completed")
-        return result
+def _is_cancel_safe(
+    tool_name: str,
+    patterns: Collection[str],
+    tool_result_cache: ToolResultCache | None,
+) -> bool:
+    if tool_result_cache is not None and tool_result_cache.ttl_for(tool_name) > 0:
+        return True
+    return any(fnmatch.fnmatchcase(tool_name, pattern) for pattern in patterns)
 
-    # Check if it's an n8n workflow
-    if (
-        hasattr(agent, "_n8n_workflow_name_map")
-        and tool_name in agent._n8n_workflow_name_map
-        and hasattr(agent, "_n8n_base_url")
-        and agent._n8n_base_url
-    ):
-        logger.info(f"Calling n8n workflow: {tool_name}")
-        workflow_name = agent._n8n_workflow_name_map[tool_name]
-        result = await execute_n8n_workflow(
-            agent._n8n_base_url, workflow_name, arguments
-        )
-        logger.info(f"n8n workflow {tool_name} completed")
-        return result
 
-    # Check MCP servers (with multi-server routing)
-    if hasattr(agent, "_caal_mcp_servers") and agent._caal_mcp_servers:
-        # Parse server name from prefixed tool name
-        # Format: server_name__actual_tool (double underscore separator)
-        if "__" in tool_name:
-            server_name, actual_tool = tool_name.split("__", 1)
-        else:
-            # Unprefixed tools default to n8n server
-            server_name, actual_tool = "n8n", tool_name
+def _log_detached_tool(tool_name: str, task: asyncio.Future) -> None:
+    """Report the outcome of a tool left running after its turn was cancelled."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is None:
+        logger.info(f"Tool {tool_name} finished after its turn was interrupted")
+    elif isinstance(error, asyncio.TimeoutError):
+        logger.warning(f"Tool {tool_name} timed out after its turn was interrupted")
+    else:
+        logger.error(f"Tool {tool_name} failed after its turn was interrupted: {error}")
+
+
+class _ToolOutcome:
+    """Result (or error) of a single tool execution within a round."""
 
-        if server_name in agent._caal_mcp_servers:
-            server = agent._caal_mcp_servers[server_name]
-            result = await _call_mcp_tool(server, actual_tool, arguments)
-            if result is not None:
-                return result
+    __slots__ = ("result", "error", "elapsed")
 
-    raise ValueError(f"Tool {tool_name} not found")
+    def __init__(self, result: Any = None, error: str | None = None, elapsed: float = 0.0):
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+
+async def _execute_single_tool(agent, tool_name: str, arguments: dict) -> Any:
+    """Execute a single tool call through the agent's dispatch table.
+
+    The table is built by _discover_tools together with the advertised tool
+    list, so names the model was never offered are rejected without any
+    network call.
+    """
+    dispatch = getattr(agent, "_tool_dispatch", None)
+    if dispatch is None:
+        await _discover_tools(agent)
+        dispatch = getattr(agent, "_tool_dispatch", None) or {}
+
+    execute = dispatch.get(tool_name)
+    if execute is None:
+        raise ValueError(f"Tool {tool_name} not found")
+    return await execute(arguments)
 
 
 async def _call_mcp_tool(mcp_server, tool_name: str, arguments: dict) -> Any | None:
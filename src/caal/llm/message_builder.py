@@ -0,0 +1,157 @@
+"""Incremental conversion of LiveKit chat context into provider messages.
+
+chat_ctx grows by one or two items per turn, but converting it from scratch
+walks (and re-serializes) the whole session on every LLM call. MessageBuilder
+keeps the converted messages between calls and only converts items appended
+since the previous call.
+
+Usage:
+    builder = MessageBuilder()  # One per agent/session
+    system_prompt, chat_messages = builder.build(chat_ctx.items)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["MessageBuilder", "convert_chat_item"]
+
+
+def convert_chat_item(item: Any) -> dict | None:
+    """Convert a single chat_ctx item to a message dict.
+
+    Args:
+        item: LiveKit ChatMessage, FunctionCall or FunctionCallOutput
+
+    Returns:
+        Message dict, or None for items that are not sent to the LLM
+    """
+    item_type = type(item).__name__
+
+    if item_type == "ChatMessage":
+        return {"role": item.role, "content": item.text_content}
+
+    if item_type == "FunctionCall":
+        try:
+            # Arguments must be JSON string for Groq compatibility
+            args = getattr(item, "arguments", {}) or {}
+            args_str = json.dumps(args) if isinstance(args, dict) else str(args)
+            return {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": item.id,
+                        "type": "function",
+                        "function": {
+                            "name": item.name,
+                            "arguments": args_str,
+                        },
+                    }
+                ],
+            }
+        except AttributeError:
+            return None
+
+    if item_type == "FunctionCallOutput":
+        try:
+            return {
+                "role": "tool",
+                "content": str(item.content),
+                "tool_call_id": item.tool_call_id,
+            }
+        except AttributeError:
+            return None
+
+    return None
+
+
+class MessageBuilder:
+    """Converts chat_ctx items to messages, reusing work from previous calls.
+
+    Fast path: when the items seen last time are still the leading items
+    (same count, same first and last objects), only the newly appended items
+    are converted. Otherwise (history truncated, instructions replaced, items
+    inserted) the list is rebuilt, reusing cached conversions for any item
+    whose id still maps to the same object.
+
+    Items are matched by identity, so the builder assumes chat items are not
+    mutated in place once added — which holds for LiveKit's chat context.
+    """
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._first: Any = None
+        self._last: Any = None
+        self._system_prompt: dict | None = None
+        self._chat_messages: list[dict] = []
+        # item id -> (item, converted message)
+        self._by_id: dict[str, tuple[Any, dict | None]] = {}
+
+    def build(self, items: Sequence[Any]) -> tuple[dict | None, list[dict]]:
+        """Convert chat_ctx items to (system_prompt, chat_messages).
+
+        The system prompt is the last system ChatMessage; all other messages
+        are returned in order. The returned list is owned by the builder and
+        must not be mutated by the caller.
+
+        Args:
+            items: chat_ctx.items
+
+        Returns:
+            Tuple of (system prompt message or None, chat messages)
+        """
+        count = len(items)
+        if (
+            self._count
+            and count >= self._count
+            and items[0] is self._first
+            and items[self._count - 1] is self._last
+        ):
+            for item in items[self._count:]:
+                self._add(item, self._convert(item))
+        else:
+            self._rebuild(items)
+
+        self._count = count
+        self._first = items[0] if count else None
+        self._last = items[-1] if count else None
+        return self._system_prompt, self._chat_messages
+
+    def _convert(self, item: Any) -> dict | None:
+        """Convert an item, reusing the cached message for the same object."""
+        item_id = getattr(item, "id", None)
+        if item_id is not None:
+            cached = self._by_id.get(item_id)
+            if cached is not None and cached[0] is item:
+                return cached[1]
+        msg = convert_chat_item(item)
+        if item_id is not None:
+            self._by_id[item_id] = (item, msg)
+        return msg
+
+    def _add(self, item: Any, msg: dict | None) -> None:
+        if msg is None:
+            return
+        if type(item).__name__ == "ChatMessage" and msg["role"] == "system":
+            self._system_prompt = msg
+        else:
+            self._chat_messages.append(msg)
+
+    def _rebuild(self, items: Sequence[Any]) -> None:
+        self._system_prompt = None
+        self._chat_messages = []
+        for item in items:
+            self._add(item, self._convert(item))
+
+        # Drop cached conversions for items no longer in the context
+        if len(self._by_id) > len(items):
+            live_ids = {getattr(item, "id", None) for item in items}
+            self._by_id = {k: v for k, v in self._by_id.items() if k in live_ids}
+
+        logger.debug(f"Message builder: rebuilt from {len(items)} items")
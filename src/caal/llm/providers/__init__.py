@@ -9,6 +9,10 @@ Providers:
     - GroqProvider: Groq cloud API
     - OpenAICompatibleProvider: Any OpenAI-compatible server
     - OpenRouterProvider: OpenRouter cloud API (400+ models)
+    - FailoverProvider: Ordered chain of the above with TTFT deadlines,
+      hedged requests and circuit breaking
+    - ScheduledProvider: Priority admission queue per local backend
+      (Ollama, OpenAI-compatible servers)
 
 Example:
     >>> from caal.llm.providers import create_provider
@@ -34,21 +38,36 @@ import logging
 import os
 from typing import Any
 
-from .base import LLMProvider, LLMResponse, ToolCall
+from .base import LLMProvider, LLMResponse, StreamChunk, ToolCall
+from .failover_provider import FailoverProvider
 from .groq_provider import GroqProvider
 from .ollama_provider import OllamaProvider
 from .openai_compatible_provider import OpenAICompatibleProvider
 from .openrouter_provider import OpenRouterProvider
+from .scheduler import (
+    Priority,
+    RequestScheduler,
+    ScheduledProvider,
+    default_max_concurrency,
+    get_scheduler,
+)
 
 __all__ = [
     "LLMProvider",
     "LLMResponse",
+    "StreamChunk",
     "ToolCall",
     "OllamaProvider",
     "GroqProvider",
     "OpenAICompatibleProvider",
     "OpenRouterProvider",
+    "FailoverProvider",
+    "ScheduledProvider",
+    "RequestScheduler",
+    "Priority",
+    "get_scheduler",
     "create_provider",
+    "create_provider_from_settings",
 ]
 
 logger = logging.getLogger(__name__)
@@ -119,9 +138,16 @@ def create_provider_from_settings(settings: dict[str, Any]) -> LLMProvider:
             - openrouter_api_key: OpenRouter API key (required)
             - temperature: Sampling temperature
             - num_ctx: Context window size (Ollama only)
+            - llm_fallback_providers: Provider names to fail over to, in order
+            - llm_ttft_deadline: Seconds to wait for a first token before
+              failing over
+            - llm_hedge: Race the next provider instead of cancelling a slow one
+            - llm_max_concurrency: Parallel requests per local backend
+              (0 = OLLAMA_NUM_PARALLEL)
 
     Returns:
-        Configured LLMProvider instance
+        Configured LLMProvider instance (a FailoverProvider when fallback
+        providers are configured)
 
     Example:
         >>> from caal.settings import load_settings
@@ -129,14 +155,46 @@ def create_provider_from_settings(settings: dict[str, Any]) -> LLMProvider:
         >>> provider = create_provider_from_settings(settings)
     """
     provider_name = settings.get("llm_provider", "ollama").lower()
+    provider = _create_provider_by_name(provider_name, settings)
+
+    chain = [provider]
+    for name in settings.get("llm_fallback_providers") or []:
+        name = name.lower()
+        if any(p.provider_name == name for p in chain):
+            continue
+        try:
+            chain.append(_create_provider_by_name(name, settings))
+        except ValueError as e:
+            logger.warning(f"Skipping fallback LLM provider {name}: {e}")
+
+    if len(chain) == 1:
+        return provider
+    return FailoverProvider(
+        chain,
+        ttft_deadline=settings.get("llm_ttft_deadline", 5.0),
+        hedge=settings.get("llm_hedge", False),
+    )
+
+
+def _create_provider_by_name(provider_name: str, settings: dict[str, Any]) -> LLMProvider:
+    """Create a single provider from its settings keys.
+
+    Local backends (Ollama, OpenAI-compatible servers) are wrapped in a
+    ScheduledProvider sharing one RequestScheduler per server.
+    """
+    max_concurrency = default_max_concurrency(settings.get("llm_max_concurrency", 0))
 
     if provider_name == "ollama":
-        return OllamaProvider(
-            model=settings.get("ollama_model", "qwen3:8b"),
-            base_url=settings.get("ollama_host"),
-            think=settings.get("think", False),
-            temperature=settings.get("temperature", 0.15),
-            num_ctx=settings.get("num_ctx", 8192),
+        host = settings.get("ollama_host") or os.environ.get("OLLAMA_HOST", "localhost:11434")
+        return ScheduledProvider(
+            OllamaProvider(
+                model=settings.get("ollama_model", "qwen3:8b"),
+                base_url=settings.get("ollama_host"),
+                think=settings.get("think", False),
+                temperature=settings.get("temperature", 0.15),
+                num_ctx=settings.get("num_ctx", 8192),
+            ),
+            get_scheduler(f"ollama:{host}", max_concurrency),
         )
     elif provider_name == "groq":
         # API key from settings, fallback to environment variable
@@ -149,11 +207,15 @@ def create_provider_from_settings(settings: dict[str, Any]) -> LLMProvider:
     elif provider_name == "openai_compatible":
         # API key from settings, fallback to environment variable
         api_key = settings.get("openai_api_key") or os.environ.get("OPENAI_API_KEY")
-        return OpenAICompatibleProvider(
-            model=settings.get("openai_model", "gpt-3.5-turbo"),
-            base_url=settings.get("openai_base_url", "http://localhost:8000/v1"),
-            api_key=api_key,
-            temperature=settings.get("temperature", 0.7),
+        base_url = settings.get("openai_base_url", "http://localhost:8000/v1")
+        return ScheduledProvider(
+            OpenAICompatibleProvider(
+                model=settings.get("openai_model", "gpt-3.5-turbo"),
+                base_url=base_url,
+                api_key=api_key,
+                temperature=settings.get("temperature", 0.7),
+            ),
+            get_scheduler(f"openai_compatible:{base_url}", max_concurrency),
         )
     elif provider_name == "openrouter":
         # API key from settings, fallback to environment variable
@@ -7,14 +7,17 @@ while sharing common tool orchestration logic.
 
 from __future__ import annotations
 
+import json
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from ..tokens import get_token_estimator
+
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
-__all__ = ["LLMProvider", "LLMResponse", "ToolCall"]
+__all__ = ["LLMProvider", "LLMResponse", "StreamChunk", "ToolCall", "ToolCallAccumulator"]
 
 
 @dataclass
@@ -34,6 +37,61 @@ class LLMResponse:
     tool_calls: list[ToolCall]
 
 
+@dataclass
+class StreamChunk:
+    """Incremental piece of a tool-aware streaming response.
+
+    Content deltas are emitted as soon as they arrive. Tool calls are only
+    emitted once fully assembled (name + complete arguments).
+    """
+
+    content: str | None = None
+    tool_calls: list[ToolCall] = field(default_factory=list)
+
+
+class ToolCallAccumulator:
+    """Assembles OpenAI-style streamed tool call deltas.
+
+    OpenAI-compatible APIs (Groq, OpenRouter, vLLM, ...) stream tool calls as
+    fragments keyed by index: the first fragment carries id and name, later
+    fragments append to the JSON arguments string.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[int, dict[str, str]] = {}
+
+    def add(self, delta_tool_calls: Any) -> None:
+        """Merge the tool_calls field of one streamed delta."""
+        for tc in delta_tool_calls or []:
+            index = getattr(tc, "index", None)
+            if index is None:
+                index = len(self._calls)
+            call = self._calls.setdefault(index, {"id": "", "name": "", "arguments": ""})
+            if getattr(tc, "id", None):
+                call["id"] = tc.id
+            func = getattr(tc, "function", None)
+            if func is not None:
+                if getattr(func, "name", None):
+                    call["name"] += func.name
+                if getattr(func, "arguments", None):
+                    call["arguments"] += func.arguments
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def build(self, provider: LLMProvider) -> list[ToolCall]:
+        """Return the assembled tool calls, parsing arguments via the provider."""
+        return [
+            ToolCall(
+                id=call["id"],
+                name=call["name"],
+                arguments=provider.parse_tool_arguments(call["arguments"] or "{}"),
+            )
+            for _, call in sorted(self._calls.items())
+            if call["name"]
+        ]
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers.
 
@@ -62,6 +120,23 @@ class LLMProvider(ABC):
         """Whether provider supports think parameter (Qwen3 specific)."""
         return False
 
+    @property
+    def context_window(self) -> int | None:
+        """Context window size in tokens, if the provider enforces one locally.
+
+        Used to derive the chat history token budget. None means the window
+        is large enough that history is bounded by max_turns only.
+        """
+        return None
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate the token count of text for this provider/model.
+
+        Uses the estimator registered via caal.llm.tokens for this provider
+        or model, falling back to a fast character-based heuristic.
+        """
+        return get_token_estimator(self.provider_name, self.model)(text)
+
     @abstractmethod
     async def chat(
         self,
@@ -100,6 +175,35 @@ class LLMProvider(ABC):
         """
         ...
 
+    async def chat_stream_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Execute streaming chat completion that may also call tools.
+
+        Content deltas are yielded as they arrive so callers can start
+        speaking before generation finishes. Tool calls are yielded once
+        assembled, typically at the end of the stream.
+
+        The default implementation falls back to a single non-streaming
+        chat() call. Providers with native streamed tool calls override it.
+
+        Args:
+            messages: List of message dicts with role/content
+            tools: List of tool definitions in OpenAI format
+            **kwargs: Provider-specific options
+
+        Yields:
+            StreamChunk with either a content delta or completed tool calls
+        """
+        response = await self.chat(messages=messages, tools=tools, **kwargs)
+        if response.content:
+            yield StreamChunk(content=response.content)
+        if response.tool_calls:
+            yield StreamChunk(tool_calls=response.tool_calls)
+
     def parse_tool_arguments(self, arguments: Any) -> dict[str, Any]:
         """Parse tool call arguments to dict.
 
@@ -155,8 +259,6 @@ class LLMProvider(ABC):
         Returns:
             Message dict for assistant with tool calls
         """
-        import json
-
         return {
             "role": "assistant",
             "content": content or "",
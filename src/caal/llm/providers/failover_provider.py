@@ -0,0 +1,460 @@
+"""Failover chain over several LLM providers.
+
+Wraps an ordered list of providers (e.g. local Ollama, then Groq, then
+OpenRouter) behind the LLMProvider interface, so llm_node is unchanged:
+
+- Each provider gets a time-to-first-token deadline. A provider that
+  misses it (or fails before its first chunk) hands the request to the
+  next one in the chain. For a local backend behind a ScheduledProvider,
+  the deadline starts once the request leaves the admission queue.
+- With hedging, the slow provider is not cancelled: the next one starts in
+  parallel and whichever produces a first chunk first serves the request.
+- A circuit breaker skips a provider for reset_timeout seconds after
+  failure_threshold consecutive failures, then lets one request through
+  to probe it.
+
+Once a provider has produced its first chunk the response is committed to
+it: text may already have been spoken, so later errors are raised as-is.
+
+Tool call and tool result messages are built in a neutral format and
+re-formatted for whichever provider serves each request (Ollama wants
+argument dicts, Groq wants JSON strings and a tool name on results).
+
+Usage:
+    provider = FailoverProvider(
+        [OllamaProvider(...), GroqProvider(...)],
+        ttft_deadline=5.0,
+        hedge=True,
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any
+
+from .base import LLMProvider, LLMResponse, StreamChunk, ToolCall
+from .scheduler import ScheduledProvider
+
+__all__ = ["FailoverProvider"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ProviderState:
+    """Circuit breaker state and counters for one provider in the chain."""
+
+    provider: LLMProvider
+    ttft_deadline: float | None
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    served: int = 0
+    failures: int = 0
+    deadline_misses: int = 0
+    hedges: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.provider.provider_name}/{self.provider.model}"
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.open_until
+
+
+class _Attempt:
+    """A started stream waiting for its first chunk.
+
+    started is set once the provider is working on the request: right away,
+    or when a ScheduledProvider admits it from its queue.
+    """
+
+    def __init__(
+        self,
+        state: _ProviderState,
+        method: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        kwargs: dict[str, Any],
+    ) -> None:
+        self.state = state
+        self.started: float | None = None
+        self.admitted: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        provider = state.provider
+        if isinstance(provider, ScheduledProvider):
+            kwargs = {**kwargs, "on_admitted": self._on_admitted}
+        else:
+            self._on_admitted()
+        self.stream = getattr(provider, method)(
+            messages=_adapt_messages(provider, messages), tools=tools, **kwargs
+        )
+        self.first = asyncio.ensure_future(self.stream.__anext__())
+
+    def _on_admitted(self) -> None:
+        if not self.admitted.done():
+            self.started = time.perf_counter()
+            self.admitted.set_result(None)
+
+    async def close(self) -> None:
+        self.first.cancel()
+        await asyncio.gather(self.first, return_exceptions=True)
+        try:
+            await self.stream.aclose()
+        except Exception:
+            pass
+
+
+class FailoverProvider(LLMProvider):
+    """LLM provider that fails over along an ordered chain of providers.
+
+    Args:
+        providers: Providers in order of preference (first = primary)
+        ttft_deadline: Seconds to wait for a provider's first chunk before
+            moving on, either one value or one per provider (None = wait).
+            Time queued by a ScheduledProvider does not count. The last
+            available provider never has a deadline.
+        hedge: Keep a provider that missed its deadline running and race it
+            against the next one, instead of cancelling it
+        failure_threshold: Consecutive failures that open a provider's circuit
+        reset_timeout: Seconds a provider is skipped once its circuit opens
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[LLMProvider],
+        ttft_deadline: float | Sequence[float | None] | None = 5.0,
+        hedge: bool = False,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        if not providers:
+            raise ValueError("FailoverProvider needs at least one provider")
+        if ttft_deadline is None or isinstance(ttft_deadline, (int, float)):
+            deadlines = [ttft_deadline] * len(providers)
+        else:
+            deadlines = list(ttft_deadline) + [None] * len(providers)
+        self._states = [
+            _ProviderState(provider=p, ttft_deadline=d)
+            for p, d in zip(providers, deadlines)
+        ]
+        self._hedge = hedge
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+
+        logger.debug(
+            "FailoverProvider initialized: "
+            + " → ".join(s.label for s in self._states)
+            + f" (hedge={hedge})"
+        )
+
+    @property
+    def providers(self) -> list[LLMProvider]:
+        return [s.provider for s in self._states]
+
+    @property
+    def primary(self) -> LLMProvider:
+        return self._states[0].provider
+
+    # Identity and budgets follow the primary provider, so token estimates
+    # and logs match the provider that serves most requests
+    @property
+    def provider_name(self) -> str:
+        return self.primary.provider_name
+
+    @property
+    def model(self) -> str:
+        return self.primary.model
+
+    @property
+    def supports_think(self) -> bool:
+        return self.primary.supports_think
+
+    @property
+    def think(self) -> bool:
+        return getattr(self.primary, "think", False)
+
+    @property
+    def temperature(self) -> float | None:
+        return getattr(self.primary, "temperature", None)
+
+    @property
+    def context_window(self) -> int | None:
+        # History must fit whichever provider ends up serving the request
+        windows = [s.provider.context_window for s in self._states]
+        known = [w for w in windows if w]
+        return min(known) if known else None
+
+    def estimate_tokens(self, text: str) -> int:
+        return self.primary.estimate_tokens(text)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-provider counters and circuit state."""
+        now = time.monotonic()
+        return {
+            s.label: {
+                "served": s.served,
+                "failures": s.failures,
+                "deadline_misses": s.deadline_misses,
+                "hedges": s.hedges,
+                "circuit_open": not s.is_available(now),
+            }
+            for s in self._states
+        }
+
+    # === Requests ===
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """Non-streaming chat on the first provider that succeeds.
+
+        No TTFT deadline applies (nothing is streamed); providers are tried
+        in order until one returns.
+        """
+        last_error: Exception | None = None
+        for state in self._candidates():
+            try:
+                response = await state.provider.chat(
+                    messages=_adapt_messages(state.provider, messages),
+                    tools=tools,
+                    **kwargs,
+                )
+            except Exception as e:
+                last_error = e
+                self._record_failure(state, e)
+                continue
+            self._record_success(state)
+            return response
+        raise last_error or RuntimeError("No LLM provider available")
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        async with aclosing(self._stream("chat_stream", messages, tools, kwargs)) as stream:
+            async for chunk in stream:
+                yield chunk
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        stream = self._stream("chat_stream_with_tools", messages, tools, kwargs)
+        async with aclosing(stream):
+            async for chunk in stream:
+                yield chunk
+
+    async def _stream(
+        self,
+        method: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        kwargs: dict[str, Any],
+    ) -> AsyncIterator[Any]:
+        """Stream from the first provider to produce a first chunk in time."""
+        candidates = self._candidates()
+        pending: list[_Attempt] = []
+        winner: _Attempt | None = None
+        last_error: Exception | None = None
+        next_index = 0
+
+        def start_next() -> None:
+            nonlocal next_index
+            state = candidates[next_index]
+            next_index += 1
+            pending.append(_Attempt(state, method, messages, tools, kwargs))
+
+        try:
+            while winner is None:
+                if not pending:
+                    if next_index >= len(candidates):
+                        raise last_error or RuntimeError("No LLM provider available")
+                    start_next()
+
+                # Deadline of the newest attempt, only while a fallback remains
+                newest = pending[-1]
+                waiting = [a.first for a in pending]
+                timeout = None
+                if next_index < len(candidates) and newest.state.ttft_deadline is not None:
+                    if newest.started is None:
+                        # Still queued: the deadline starts on admission
+                        waiting.append(newest.admitted)
+                    else:
+                        timeout = max(
+                            0.0,
+                            newest.started + newest.state.ttft_deadline - time.perf_counter(),
+                        )
+
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    newest.state.deadline_misses += 1
+                    if self._hedge:
+                        newest.state.hedges += 1
+                        logger.warning(
+                            f"{newest.state.label} missed its "
+                            f"{newest.state.ttft_deadline:g}s TTFT deadline, hedging"
+                        )
+                    else:
+                        logger.warning(
+                            f"{newest.state.label} missed its "
+                            f"{newest.state.ttft_deadline:g}s TTFT deadline, failing over"
+                        )
+                        pending.remove(newest)
+                        await newest.close()
+                        self._record_failure(newest.state, TimeoutError("TTFT deadline"))
+                    start_next()
+                    continue
+
+                # Earliest provider in the chain wins a tie
+                for attempt in list(pending):
+                    if not attempt.first.done():
+                        continue
+                    error = attempt.first.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        winner = attempt
+                        break
+                    pending.remove(attempt)
+                    last_error = error
+                    self._record_failure(attempt.state, error)
+                    await attempt.close()
+
+            for attempt in pending:
+                if attempt is not winner:
+                    await attempt.close()
+            pending = [winner]
+
+            state = winner.state
+            # A first chunk means the request was admitted (started is set)
+            ttft_ms = (time.perf_counter() - winner.started) * 1000
+            if state is not candidates[0] or len(candidates) < len(self._states):
+                logger.info(f"LLM request served by {state.label} (TTFT {ttft_ms:.0f}ms)")
+
+            if isinstance(winner.first.exception(), StopAsyncIteration):
+                self._record_success(state)
+                return
+
+            yield winner.first.result()
+            try:
+                async for chunk in winner.stream:
+                    yield chunk
+            except Exception as e:
+                self._record_failure(state, e)
+                raise
+            self._record_success(state)
+        finally:
+            for attempt in pending:
+                await attempt.close()
+
+    # === Circuit breaker ===
+
+    def _candidates(self) -> list[_ProviderState]:
+        """Providers to try, in order, skipping those with an open circuit."""
+        now = time.monotonic()
+        available = [s for s in self._states if s.is_available(now)]
+        # Every circuit open: trying something beats failing outright
+        return available or list(self._states)
+
+    def _record_success(self, state: _ProviderState) -> None:
+        state.served += 1
+        state.consecutive_failures = 0
+        state.open_until = 0.0
+
+    def _record_failure(self, state: _ProviderState, error: BaseException) -> None:
+        state.failures += 1
+        state.consecutive_failures += 1
+        logger.warning(f"LLM provider {state.label} failed: {error}")
+        if state.consecutive_failures >= self._failure_threshold:
+            state.open_until = time.monotonic() + self._reset_timeout
+            logger.warning(
+                f"Circuit open for {state.label} after {state.consecutive_failures} "
+                f"consecutive failures, skipping it for {self._reset_timeout:g}s"
+            )
+
+    # === Message formatting ===
+
+    def parse_tool_arguments(self, arguments: Any) -> dict[str, Any]:
+        return _parse_arguments(arguments)
+
+    def format_tool_result(
+        self,
+        content: str,
+        tool_call_id: str | None,
+        tool_name: str,
+    ) -> dict[str, Any]:
+        """Neutral tool result, re-formatted per provider (keeps the name)."""
+        return {
+            "role": "tool",
+            "content": content,
+            "tool_call_id": tool_call_id,
+            "name": tool_name,
+        }
+
+
+def _parse_arguments(arguments: Any) -> dict[str, Any]:
+    if isinstance(arguments, dict):
+        return arguments
+    if isinstance(arguments, str):
+        try:
+            parsed = json.loads(arguments or "{}")
+        except json.JSONDecodeError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
+def _adapt_messages(
+    provider: LLMProvider, messages: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Re-format tool call and tool result messages for a provider.
+
+    Other messages are passed through unchanged. Missing tool call IDs
+    (Ollama does not always return one) are filled in, because
+    OpenAI-compatible APIs reject tool results they cannot match.
+    """
+    if not any(m.get("role") == "tool" or m.get("tool_calls") for m in messages):
+        return messages
+
+    adapted: list[dict[str, Any]] = []
+    names: dict[str, str] = {}
+    unanswered: list[str] = []
+    for msg in messages:
+        if msg.get("role") == "assistant" and msg.get("tool_calls"):
+            calls = []
+            for tc in msg["tool_calls"]:
+                func = tc.get("function", {})
+                call_id = tc.get("id") or f"call_{len(names)}"
+                names[call_id] = func.get("name", "")
+                calls.append(
+                    ToolCall(
+                        id=call_id,
+                        name=func.get("name", ""),
+                        arguments=_parse_arguments(func.get("arguments")),
+                    )
+                )
+            unanswered = [c.id for c in calls]
+            adapted.append(provider.format_tool_call_message(msg.get("content"), calls))
+        elif msg.get("role") == "tool":
+            call_id = msg.get("tool_call_id") or (unanswered[0] if unanswered else None)
+            if call_id in unanswered:
+                unanswered.remove(call_id)
+            name = msg.get("name") or names.get(call_id or "", "")
+            adapted.append(provider.format_tool_result(msg.get("content", ""), call_id, name))
+        else:
+            adapted.append(msg)
+    return adapted
@@ -13,7 +13,7 @@ from typing import TYPE_CHECKING, Any
 
 from groq import AsyncGroq
 
-from .base import LLMProvider, LLMResponse, ToolCall
+from .base import LLMProvider, LLMResponse, StreamChunk, ToolCall, ToolCallAccumulator
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -176,6 +176,60 @@ class GroqProvider(LLMProvider):
             if chunk.choices and chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
+    async def chat_stream_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Execute streaming Groq chat completion with tool calling enabled.
+
+        Content deltas are yielded immediately. Tool call deltas are
+        accumulated by index and yielded once the stream completes.
+
+        Args:
+            messages: List of message dicts
+            tools: Optional tool definitions
+            **kwargs: Additional options
+
+        Yields:
+            StreamChunk with a content delta or completed tool calls
+        """
+        request_kwargs: dict[str, Any] = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": self._temperature,
+            "max_tokens": self._max_tokens,
+            "stream": True,
+        }
+
+        # Disable thinking for Qwen3 models (reduces latency)
+        if "qwen" in self._model.lower():
+            request_kwargs["reasoning_effort"] = "none"
+
+        # Use low reasoning effort for GPT-OSS models (faster responses)
+        if "gpt-oss" in self._model.lower():
+            request_kwargs["reasoning_effort"] = "low"
+
+        if tools:
+            request_kwargs["tools"] = tools
+            request_kwargs["tool_choice"] = "auto"
+
+        stream = await self._client.chat.completions.create(**request_kwargs)
+
+        accumulator = ToolCallAccumulator()
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                yield StreamChunk(content=delta.content)
+            if delta.tool_calls:
+                accumulator.add(delta.tool_calls)
+
+        if accumulator:
+            yield StreamChunk(tool_calls=accumulator.build(self))
+
     def parse_tool_arguments(self, arguments: Any) -> dict[str, Any]:
         """Parse Groq tool arguments from JSON string.
 
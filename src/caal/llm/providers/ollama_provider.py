@@ -1,18 +1,20 @@
 """Ollama LLM provider implementation.
 
 Provides native Ollama integration with think parameter support for Qwen3 models.
-Uses the ollama Python library for direct API calls.
+Uses the ollama library's AsyncClient: requests share a pooled keep-alive
+httpx connection and streamed NDJSON is parsed line by line as it arrives,
+on the event loop, without a worker thread per request.
 """
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import TYPE_CHECKING, Any
 
+import httpx
 import ollama
 
-from .base import LLMProvider, LLMResponse, ToolCall
+from .base import LLMProvider, LLMResponse, StreamChunk, ToolCall
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -21,6 +23,13 @@ __all__ = ["OllamaProvider"]
 
 logger = logging.getLogger(__name__)
 
+# Keep the connection to Ollama open between turns (httpx default is 5s)
+_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=16,
+    max_keepalive_connections=4,
+    keepalive_expiry=120.0,
+)
+
 
 class OllamaProvider(LLMProvider):
     """Ollama LLM provider with think parameter support.
@@ -57,9 +66,13 @@ class OllamaProvider(LLMProvider):
         self._top_k = top_k
         self._num_ctx = num_ctx
         self._base_url = base_url
+        # Prompt tokens Ollama evaluated for the last request (tokens reused
+        # from its KV cache are not counted)
+        self.last_prompt_eval_count: int | None = None
 
-        # Create client with custom host if provided
-        self._client = ollama.Client(host=base_url) if base_url else ollama.Client()
+        # Async client with a pooled keep-alive connection (host falls back
+        # to OLLAMA_HOST when base_url is not set)
+        self._client = ollama.AsyncClient(host=base_url, limits=_CONNECTION_LIMITS)
 
         logger.debug(
             f"OllamaProvider initialized: {model} "
@@ -91,6 +104,10 @@ class OllamaProvider(LLMProvider):
     def num_ctx(self) -> int:
         return self._num_ctx
 
+    @property
+    def context_window(self) -> int | None:
+        return self._num_ctx
+
     def _get_options(self) -> dict[str, Any]:
         """Get Ollama options dict."""
         return {
@@ -100,6 +117,15 @@ class OllamaProvider(LLMProvider):
             "num_ctx": self._num_ctx,
         }
 
+    def _record_prompt_eval(self, response: Any) -> None:
+        """Log prompt-eval stats from a final (done) Ollama response."""
+        prompt_tokens = getattr(response, "prompt_eval_count", None)
+        if prompt_tokens is None:
+            return
+        self.last_prompt_eval_count = prompt_tokens
+        duration_ms = (getattr(response, "prompt_eval_duration", None) or 0) / 1e6
+        logger.info(f"Ollama prompt eval: {prompt_tokens} tokens in {duration_ms:.0f}ms")
+
     async def chat(
         self,
         messages: list[dict[str, Any]],
@@ -119,9 +145,7 @@ class OllamaProvider(LLMProvider):
         think = kwargs.get("think", self._think)
         options = self._get_options()
 
-        # Run sync client.chat in thread pool
-        response = await asyncio.to_thread(
-            self._client.chat,
+        response = await self._client.chat(
             model=self._model,
             messages=messages,
             tools=tools,
@@ -129,6 +153,7 @@ class OllamaProvider(LLMProvider):
             stream=False,
             options=options,
         )
+        self._record_prompt_eval(response)
 
         # Extract tool calls if present
         tool_calls: list[ToolCall] = []
@@ -170,25 +195,80 @@ class OllamaProvider(LLMProvider):
         think = kwargs.get("think", self._think)
         options = self._get_options()
 
-        # Run sync client.chat with streaming in thread pool
-        # We need to iterate in a thread since client.chat returns a sync iterator
-        def _stream():
-            return self._client.chat(
-                model=self._model,
-                messages=messages,
-                tools=tools,
-                think=think,
-                stream=True,
-                options=options,
-            )
-
-        response = await asyncio.to_thread(_stream)
-
-        # Iterate over chunks (sync iterator from thread)
-        for chunk in response:
-            if hasattr(chunk, "message") and hasattr(chunk.message, "content"):
-                if chunk.message.content:
-                    yield chunk.message.content
+        stream = await self._client.chat(
+            model=self._model,
+            messages=messages,
+            tools=tools,
+            think=think,
+            stream=True,
+            options=options,
+        )
+
+        # Closing the stream (also on cancellation) closes the HTTP response,
+        # which makes Ollama stop generating
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "done", False):
+                    self._record_prompt_eval(chunk)
+                if hasattr(chunk, "message") and hasattr(chunk.message, "content"):
+                    if chunk.message.content:
+                        yield chunk.message.content
+        finally:
+            await stream.aclose()
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        """Execute streaming Ollama chat completion with tool calling enabled.
+
+        Ollama emits tool calls fully formed inside a streamed chunk, so no
+        delta assembly is needed.
+
+        Args:
+            messages: List of message dicts
+            tools: Optional tool definitions
+            **kwargs: Additional options (think override, etc.)
+
+        Yields:
+            StreamChunk with a content delta or completed tool calls
+        """
+        think = kwargs.get("think", self._think)
+        options = self._get_options()
+
+        stream = await self._client.chat(
+            model=self._model,
+            messages=messages,
+            tools=tools,
+            think=think,
+            stream=True,
+            options=options,
+        )
+
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "done", False):
+                    self._record_prompt_eval(chunk)
+                msg = getattr(chunk, "message", None)
+                if msg is None:
+                    continue
+                if getattr(msg, "content", None):
+                    yield StreamChunk(content=msg.content)
+                if getattr(msg, "tool_calls", None):
+                    yield StreamChunk(
+                        tool_calls=[
+                            ToolCall(
+                                id=getattr(tc, "id", "") or "",
+                                name=tc.function.name,
+                                arguments=tc.function.arguments or {},
+                            )
+                            for tc in msg.tool_calls
+                        ]
+                    )
+        finally:
+            await stream.aclose()
 
     # parse_tool_arguments: Use default (Ollama returns dict)
     # format_tool_result: Use default (no name field needed)
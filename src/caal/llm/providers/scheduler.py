@@ -0,0 +1,359 @@
+"""Admission scheduling for LLM requests to a shared backend.
+
+A local LLM server runs a fixed number of requests in parallel (Ollama:
+OLLAMA_NUM_PARALLEL) and queues the rest first-come, first-served. That lets
+a background summarization delay a user's turn. RequestScheduler admits at
+most max_concurrent requests per backend and hands free slots out by
+priority:
+
+    INTERACTIVE    - the first LLM round of a user turn
+    TOOL_FOLLOWUP  - rounds after tool results came back
+    BACKGROUND     - summarization (web search results, oversized tool output)
+
+Requests of the same priority are served in arrival order. Schedulers are
+shared per backend (e.g. per Ollama host) by every session in the process.
+The scheduler is thread-safe, so sessions on different event loops share
+slots too.
+
+ScheduledProvider wraps a provider so that each request (a whole stream, for
+streaming calls) holds a slot. Callers pick the class with a priority=
+keyword argument; providers without a scheduler ignore it. Streaming calls
+also take on_admitted=, called once the request leaves the queue, so that
+TTFT deadlines (FailoverProvider) exclude the queue wait.
+
+Usage:
+    provider = ScheduledProvider(OllamaProvider(...), get_scheduler("ollama:host", 4))
+    response = await provider.chat(messages, priority=Priority.BACKGROUND)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing, asynccontextmanager
+from enum import IntEnum
+from typing import Any
+
+from .base import LLMProvider, LLMResponse, StreamChunk, ToolCall
+
+__all__ = [
+    "Priority",
+    "RequestScheduler",
+    "ScheduledProvider",
+    "default_max_concurrency",
+    "get_scheduler",
+]
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged
+_SLOW_WAIT_MS = 100.0
+
+# Wait time samples kept per priority
+_WAIT_WINDOW = 500
+
+
+class Priority(IntEnum):
+    """Request priority classes (lower value = served first)."""
+
+    INTERACTIVE = 0
+    TOOL_FOLLOWUP = 1
+    BACKGROUND = 2
+
+
+class _Waiter:
+    """A queued request, woken on its own event loop when granted a slot."""
+
+    __slots__ = ("priority", "seq", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, priority: Priority, seq: int, loop: asyncio.AbstractEventLoop) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.loop = loop
+        self.future: asyncio.Future[None] = loop.create_future()
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: _Waiter) -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RequestScheduler:
+    """Priority admission queue with a concurrency limit for one backend.
+
+    Args:
+        name: Backend label for logs and metrics
+        max_concurrent: Requests allowed to run at once
+    """
+
+    def __init__(self, name: str, max_concurrent: int = 1) -> None:
+        self.name = name
+        self._max_concurrent = max(1, max_concurrent)
+        self._lock = threading.Lock()
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._waiting = 0
+        self._admitted = dict.fromkeys(Priority, 0)
+        self._waits: dict[Priority, deque[float]] = {
+            p: deque(maxlen=_WAIT_WINDOW) for p in Priority
+        }
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value: int) -> None:
+        with self._lock:
+            self._max_concurrent = max(1, value)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE) -> AsyncIterator[None]:
+        """Hold one of the backend's request slots for the duration of the block."""
+        start = time.perf_counter()
+        await self._acquire(priority)
+        wait_ms = (time.perf_counter() - start) * 1000
+        # Schedulers are shared across session threads, like stats() callers
+        with self._lock:
+            self._admitted[priority] += 1
+            self._waits[priority].append(wait_ms)
+            waiting = self._waiting
+        if wait_ms > _SLOW_WAIT_MS:
+            logger.info(
+                f"LLM queue {self.name}: {priority.name} request waited {wait_ms:.0f}ms "
+                f"({waiting} still queued)"
+            )
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        with self._lock:
+            if self._active < self._max_concurrent and not self._waiting:
+                self._active += 1
+                return
+            waiter = _Waiter(priority, next(self._seq), asyncio.get_running_loop())
+            heapq.heappush(self._queue, waiter)
+            self._waiting += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    waiter.cancelled = True
+                    self._waiting -= 1
+            if granted:
+                # The slot was handed over as we were cancelled: pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while True:
+            with self._lock:
+                while self._queue:
+                    waiter = heapq.heappop(self._queue)
+                    if waiter.cancelled:
+                        continue
+                    # The slot moves straight to the waiter (active count unchanged)
+                    waiter.granted = True
+                    self._waiting -= 1
+                    break
+                else:
+                    self._active -= 1
+                    return
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                return
+            except RuntimeError:
+                # The waiter's event loop is closed: nobody will use or
+                # release the slot, so offer it to the next waiter
+                logger.debug(f"LLM queue {self.name}: dropped waiter on a closed event loop")
+
+    def stats(self) -> dict[str, Any]:
+        """Active requests, queue depth and wait times per priority."""
+        with self._lock:
+            queued = dict.fromkeys((p.name for p in Priority), 0)
+            for waiter in self._queue:
+                if not waiter.cancelled:
+                    queued[waiter.priority.name] += 1
+            active = self._active
+            admitted = {p.name: n for p, n in self._admitted.items()}
+            waits = {p: sorted(samples) for p, samples in self._waits.items()}
+
+        wait_ms = {}
+        for priority, ordered in waits.items():
+            if not ordered:
+                continue
+            wait_ms[priority.name] = {
+                "count": len(ordered),
+                "p50": round(ordered[len(ordered) // 2], 1),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                "max": round(ordered[-1], 1),
+            }
+        return {
+            "backend": self.name,
+            "max_concurrent": self._max_concurrent,
+            "active": active,
+            "queued": queued,
+            "admitted": admitted,
+            "wait_ms": wait_ms,
+        }
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_schedulers: dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(backend: str, max_concurrent: int) -> RequestScheduler:
+    """Get the process-wide scheduler for a backend, creating it if needed.
+
+    Args:
+        backend: Backend key, e.g. "ollama:http://localhost:11434"
+        max_concurrent: Concurrency limit (updates an existing scheduler)
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(backend)
+        if scheduler is None:
+            scheduler = _schedulers[backend] = RequestScheduler(backend, max_concurrent)
+        elif scheduler.max_concurrent != max(1, max_concurrent):
+            scheduler.max_concurrent = max_concurrent
+        return scheduler
+
+
+def default_max_concurrency(configured: int = 0) -> int:
+    """Concurrency limit for a local backend.
+
+    Args:
+        configured: Limit from settings (0 = OLLAMA_NUM_PARALLEL, or 4 if
+            unset, Ollama's own default when memory allows)
+    """
+    if configured > 0:
+        return configured
+    try:
+        return max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+    except ValueError:
+        return 4
+
+
+class ScheduledProvider(LLMProvider):
+    """Provider wrapper that admits each request through a RequestScheduler.
+
+    Args:
+        provider: Provider sending the requests
+        scheduler: Scheduler of the provider's backend
+    """
+
+    def __init__(self, provider: LLMProvider, scheduler: RequestScheduler) -> None:
+        self._provider = provider
+        self._scheduler = scheduler
+
+    @property
+    def provider(self) -> LLMProvider:
+        return self._provider
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self._scheduler
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider-specific settings (think, num_ctx, temperature, ...)
+        if name == "_provider":
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+    @property
+    def provider_name(self) -> str:
+        return self._provider.provider_name
+
+    @property
+    def model(self) -> str:
+        return self._provider.model
+
+    @property
+    def supports_think(self) -> bool:
+        return self._provider.supports_think
+
+    @property
+    def context_window(self) -> int | None:
+        return self._provider.context_window
+
+    def estimate_tokens(self, text: str) -> int:
+        return self._provider.estimate_tokens(text)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        async with self._scheduler.slot(priority):
+            return await self._provider.chat(messages=messages, tools=tools, **kwargs)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        on_admitted: Callable[[], None] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        async with self._scheduler.slot(priority):
+            if on_admitted is not None:
+                on_admitted()
+            stream = self._provider.chat_stream(messages=messages, tools=tools, **kwargs)
+            async with aclosing(stream):
+                async for chunk in stream:
+                    yield chunk
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        on_admitted: Callable[[], None] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[StreamChunk]:
+        async with self._scheduler.slot(priority):
+            if on_admitted is not None:
+                on_admitted()
+            stream = self._provider.chat_stream_with_tools(
+                messages=messages, tools=tools, **kwargs
+            )
+            async with aclosing(stream):
+                async for chunk in stream:
+                    yield chunk
+
+    def parse_tool_arguments(self, arguments: Any) -> dict[str, Any]:
+        return self._provider.parse_tool_arguments(arguments)
+
+    def format_tool_result(
+        self,
+        content: str,
+        tool_call_id: str | None,
+        tool_name: str,
+    ) -> dict[str, Any]:
+        return self._provider.format_tool_result(content, tool_call_id, tool_name)
+
+    def format_tool_call_message(
+        self,
+        content: str | None,
+        tool_calls: list[ToolCall],
+    ) -> dict[str, Any]:
+        return self._provider.format_tool_call_message(content, tool_calls)
@@ -0,0 +1,255 @@
+"""Templated replies for simple tool calls.
+
+After a successful hass_control call or a trivial n8n workflow, the second
+LLM round only turns "Done: turn_on lamp" into one spoken sentence.
+ResponseTemplates builds that sentence locally instead. When every call of a
+tool round has a template and succeeded, llm_node speaks the rendered
+templates and skips the follow-up LLM call.
+
+Templates are str.format strings with plain field names ({target}, not
+{data.name} or {items[0]}). Fields come from the tool arguments, the keys of
+a JSON object result, and {result} (the whole result as text). They are
+looked up in this order:
+
+    1. The response_templates setting (tool name -> template)
+    2. The n8n workflow's "**response_template:**" sticky note annotation
+    3. The built-in localized templates for hass_control, one per action
+
+A template is only used when the result positively reports success (Home
+Assistant's "action_done" with no failed targets, "success": true, a "Done"
+text...). A result that reports an error, or doesn't say either way, falls
+back to the LLM, as does a template that references a missing field.
+
+Usage:
+    templates = ResponseTemplates("fr")
+    templates.render("hass_control", {"action": "turn_on", "target": "Lampe"}, "Done")
+    # "J'ai allumé Lampe."
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import string
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HASS_TEMPLATES", "ResponseTemplates"]
+
+# hass_control replies per language and action ("failed" when the call errors)
+HASS_TEMPLATES: dict[str, dict[str, str]] = {
+    "en": {
+        "turn_on": "{target} is on.",
+        "turn_off": "{target} is off.",
+        "volume_up": "Turned up {target}.",
+        "volume_down": "Turned down {target}.",
+        "set_volume": "{target} volume set to {value}.",
+        "mute": "{target} muted.",
+        "unmute": "{target} unmuted.",
+        "pause": "Paused {target}.",
+        "play": "Resumed {target}.",
+        "next": "Next track on {target}.",
+        "previous": "Previous track on {target}.",
+        "failed": "Sorry, I couldn't control {target}.",
+    },
+    "fr": {
+        "turn_on": "J'ai allumé {target}.",
+        "turn_off": "J'ai éteint {target}.",
+        "volume_up": "J'ai monté le volume de {target}.",
+        "volume_down": "J'ai baissé le volume de {target}.",
+        "set_volume": "Volume de {target} réglé à {value}.",
+        "mute": "J'ai coupé le son de {target}.",
+        "unmute": "J'ai remis le son de {target}.",
+        "pause": "J'ai mis {target} en pause.",
+        "play": "J'ai relancé {target}.",
+        "next": "Piste suivante sur {target}.",
+        "previous": "Piste précédente sur {target}.",
+        "failed": "Désolé, je n'ai pas pu contrôler {target}.",
+    },
+    "it": {
+        "turn_on": "Ho acceso {target}.",
+        "turn_off": "Ho spento {target}.",
+        "volume_up": "Ho alzato il volume di {target}.",
+        "volume_down": "Ho abbassato il volume di {target}.",
+        "set_volume": "Volume di {target} impostato a {value}.",
+        "mute": "Ho disattivato l'audio di {target}.",
+        "unmute": "Ho riattivato l'audio di {target}.",
+        "pause": "Ho messo in pausa {target}.",
+        "play": "Ho ripreso {target}.",
+        "next": "Brano successivo su {target}.",
+        "previous": "Brano precedente su {target}.",
+        "failed": "Mi dispiace, non sono riuscito a controllare {target}.",
+    },
+}
+
+# String results that report a failure rather than success (HASS and MCP
+# errors are returned as text instead of raised)
+_FAILURE_PREFIXES = (
+    "Error",
+    "error",
+    "Failed",
+    "Unknown action",
+    "Home Assistant is not connected",
+    "MCP tool ",
+)
+
+# Words that make a plain text result a failure wherever they appear
+_FAILURE_WORDS = re.compile(
+    r"\b(?:error|fail(?:ed|ure)?|unavailable|not found|unable|could not|couldn't|cannot)\b",
+    re.IGNORECASE,
+)
+
+# Plain text results that report success (hass_control's own "Done: ...")
+_SUCCESS_PREFIXES = ("done", "ok", "success")
+
+# Status values of a result object
+_SUCCESS_STATUSES = ("ok", "success", "succeeded", "done", "action_done", "query_answer")
+_FAILURE_STATUSES = ("error", "failed", "failure")
+
+_FORMATTER = string.Formatter()
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_]\w*$")
+
+
+class ResponseTemplates:
+    """Renders spoken replies for tool calls that have a template.
+
+    Args:
+        language: ISO 639-1 code selecting the hass_control templates
+        templates: Tool name -> template overrides (settings)
+        annotation_resolver: Optional lookup of a tool's annotations (e.g.
+            n8n sticky notes) for a "response_template" entry
+    """
+
+    def __init__(
+        self,
+        language: str = "en",
+        templates: Mapping[str, str] | None = None,
+        annotation_resolver: Callable[[str], dict[str, str]] | None = None,
+    ) -> None:
+        self._hass = HASS_TEMPLATES.get(language, HASS_TEMPLATES["en"])
+        self._templates = dict(templates or {})
+        self._annotation_resolver = annotation_resolver
+
+    def template_for(self, tool_name: str, arguments: Mapping[str, Any]) -> str | None:
+        """The template for a tool call, or None if it has none."""
+        template = self._templates.get(tool_name)
+        if template:
+            return template
+        if self._annotation_resolver is not None:
+            template = self._annotation_resolver(tool_name).get("response_template")
+            if template:
+                return template
+        if tool_name == "hass_control":
+            return self._hass.get(str(arguments.get("action", "")))
+        return None
+
+    def render(self, tool_name: str, arguments: Mapping[str, Any], result: Any) -> str | None:
+        """Render the reply for a tool call that succeeded.
+
+        Args:
+            tool_name: Tool that was called
+            arguments: Tool call arguments
+            result: Tool result (dict, list or text)
+
+        Returns:
+            The reply, or None if the tool has no template, the result
+            reports an error, or the template needs a field that is missing
+        """
+        template = self.template_for(tool_name, arguments)
+        if template is None or not _is_success(_decoded(result)):
+            return None
+        if not _plain_fields(template):
+            logger.warning(f"Response template for {tool_name} uses non-plain fields: {template!r}")
+            return None
+
+        decoded = _decoded(result)
+        fields: dict[str, Any] = dict(arguments)
+        if isinstance(decoded, dict):
+            fields.update(decoded)
+        fields["result"] = result if isinstance(result, str) else fields.get("message", result)
+        try:
+            reply = template.format_map(fields).strip()
+        except (KeyError, IndexError, ValueError) as e:
+            logger.debug(f"Response template for {tool_name} not applicable: {e!r}")
+            return None
+        return reply or None
+
+    def failure(self, arguments: Mapping[str, Any]) -> str:
+        """Reply for a hass_control call that failed."""
+        return self._hass["failed"].format(target=arguments.get("target", ""))
+
+    def is_failure(self, result: Any) -> bool:
+        """Whether a tool result reports an error."""
+        return _is_failure(_decoded(result))
+
+    def is_success(self, result: Any) -> bool:
+        """Whether a tool result positively reports success."""
+        return _is_success(_decoded(result))
+
+
+def _decoded(result: Any) -> Any:
+    """A JSON text result (Home Assistant MCP) as an object, else unchanged."""
+    if isinstance(result, str) and result.lstrip()[:1] in ("{", "["):
+        try:
+            return json.loads(result)
+        except ValueError:
+            pass
+    return result
+
+
+def _is_failure(result: Any) -> bool:
+    if isinstance(result, str):
+        return result.startswith(_FAILURE_PREFIXES) or bool(_FAILURE_WORDS.search(result))
+    if isinstance(result, dict):
+        status = str(result.get("status") or result.get("response_type") or "").lower()
+        data = result.get("data")
+        return (
+            bool(result.get("error") or result.get("errors"))
+            or result.get("success") is False
+            or bool(result.get("failed") or result.get("failures"))
+            or status in _FAILURE_STATUSES
+            or (isinstance(data, dict) and _is_failure(data))
+            or (isinstance(result.get("message"), str) and _is_failure(result["message"]))
+        )
+    if isinstance(result, list):
+        return any(_is_failure(item) for item in result)
+    return False
+
+
+def _is_success(result: Any) -> bool:
+    if not result or _is_failure(result):
+        return False
+    if isinstance(result, str):
+        return result.lstrip().lower().startswith(_SUCCESS_PREFIXES)
+    if isinstance(result, dict):
+        status = str(result.get("status") or result.get("response_type") or "").lower()
+        return (
+            result.get("success") is True
+            or (isinstance(result.get("success"), list) and bool(result["success"]))
+            or status in _SUCCESS_STATUSES
+            # n8n convention: a spoken "message" for the user
+            or isinstance(result.get("message"), str)
+            or (isinstance(result.get("data"), dict) and _is_success(result["data"]))
+        )
+    return False
+
+
+@lru_cache(maxsize=128)
+def _plain_fields(template: str) -> bool:
+    """Whether every field of a template is a plain name (no attribute,
+    index or nested lookups on tool-supplied data)."""
+    try:
+        parsed = list(_FORMATTER.parse(template))
+    except ValueError:
+        return False
+    for _, field_name, format_spec, _ in parsed:
+        if field_name is None:
+            continue
+        if not _FIELD_NAME.match(field_name) or "{" in (format_spec or ""):
+            return False
+    return True
@@ -0,0 +1,206 @@
+"""Aggregation of streamed LLM text into speakable segments for TTS.
+
+llm_node yields token-sized fragments. Sending those to a request-per-call TTS
+(SyncOpenAITTS) either wastes round-trips or waits for a full sentence before
+the first audio. The aggregator emits the first clause as soon as it is
+speakable — at clause punctuation past a small minimum, or after a maximum
+wait — and then groups the rest of the reply into sentence-sized segments.
+
+Usage:
+    config = get_aggregator_config("fr")
+    async for segment in aggregate_speech(text_stream, config):
+        ...  # One TTS request per segment
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "AggregatorConfig",
+    "LANGUAGE_CONFIGS",
+    "aggregate_speech",
+    "get_aggregator_config",
+]
+
+# Closing quotes/brackets that may follow end punctuation ('He said "yes." ')
+_CLOSERS = "\"')]»”’"
+
+
+@dataclass(frozen=True)
+class AggregatorConfig:
+    """Segmentation thresholds for one language.
+
+    Attributes:
+        sentence_punctuation: Characters ending a sentence
+        clause_punctuation: Characters ending a clause (first segment only)
+        first_min_chars: Minimum length of the first segment
+        first_max_wait: Seconds to wait for punctuation before flushing the
+            first segment at a word boundary
+        min_chars: Minimum length of later segments
+        max_chars: Segments longer than this are split at the last clause
+            punctuation or word boundary
+        idle_flush: Seconds without new text (e.g. while tools run) before
+            complete sentences shorter than min_chars are spoken anyway
+    """
+
+    sentence_punctuation: str = ".!?"
+    clause_punctuation: str = ",;:"
+    first_min_chars: int = 16
+    first_max_wait: float = 0.5
+    min_chars: int = 60
+    max_chars: int = 250
+    idle_flush: float = 0.5
+
+
+# Per-language defaults. French and Italian words run longer than English
+# ones, and French puts a space before "!", "?", ":" and ";".
+LANGUAGE_CONFIGS: dict[str, AggregatorConfig] = {
+    "en": AggregatorConfig(),
+    "fr": AggregatorConfig(
+        sentence_punctuation=".!?…",
+        first_min_chars=20,
+        min_chars=70,
+        max_chars=280,
+    ),
+    "it": AggregatorConfig(
+        sentence_punctuation=".!?…",
+        first_min_chars=20,
+        min_chars=70,
+        max_chars=280,
+    ),
+}
+
+
+def get_aggregator_config(language: str) -> AggregatorConfig:
+    """Get the aggregator config for a language, falling back to English."""
+    return LANGUAGE_CONFIGS.get(language, LANGUAGE_CONFIGS["en"])
+
+
+@lru_cache(maxsize=16)
+def _boundary_pattern(punctuation: str) -> re.Pattern[str]:
+    """Punctuation run followed by whitespace (so "3.5" is not a boundary)."""
+    return re.compile(f"[{re.escape(punctuation)}]+[{re.escape(_CLOSERS)}]*(?=\\s)")
+
+
+def _find_cut(buffer: str, config: AggregatorConfig, first: bool) -> int | None:
+    """Find where the next segment ends in the buffer, if it is complete.
+
+    Returns:
+        Index to cut the buffer at, or None to keep waiting for text
+    """
+    if first:
+        punctuation = config.sentence_punctuation + config.clause_punctuation
+        min_chars = config.first_min_chars
+    else:
+        punctuation = config.sentence_punctuation
+        min_chars = config.min_chars
+
+    for match in _boundary_pattern(punctuation).finditer(buffer, min_chars - 1):
+        return match.end()
+
+    if len(buffer) > config.max_chars:
+        head = buffer[: config.max_chars]
+        clause = None
+        for clause in _boundary_pattern(config.clause_punctuation).finditer(head):
+            pass
+        if clause is not None and clause.end() >= min_chars:
+            return clause.end()
+        space = head.rfind(" ")
+        return space if space >= min_chars else config.max_chars
+
+    return None
+
+
+async def aggregate_speech(
+    text: AsyncIterable[str],
+    config: AggregatorConfig | None = None,
+) -> AsyncIterator[str]:
+    """Group streamed text into segments suitable for one TTS request each.
+
+    Args:
+        text: Streamed text fragments (e.g. from llm_node)
+        config: Segmentation thresholds (default: English)
+
+    Yields:
+        Stripped, non-empty text segments
+    """
+    config = config or AggregatorConfig()
+    loop = asyncio.get_running_loop()
+    chunks = aiter(text)
+    next_chunk: asyncio.Future[str] | None = None
+    buffer = ""
+    first = True
+    overdue = False
+    idle = False
+    deadline: float | None = None
+
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(anext(chunks))
+
+            timeout = None
+            waiting_first = first and not overdue and deadline is not None
+            if waiting_first:
+                timeout = max(0.0, deadline - loop.time())
+            elif buffer.strip() and config.idle_flush:
+                timeout = config.idle_flush
+            done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+
+            if not done:
+                if waiting_first:
+                    # No punctuation in time: speak the first words we have
+                    overdue = True
+                else:
+                    idle = True
+            else:
+                try:
+                    chunk = next_chunk.result()
+                except StopAsyncIteration:
+                    next_chunk = None
+                    break
+                next_chunk = None
+                if first and deadline is None and chunk.strip():
+                    deadline = loop.time() + config.first_max_wait
+                buffer += chunk
+
+            while (cut := _find_cut(buffer, config, first)) is not None:
+                segment, buffer = buffer[:cut].strip(), buffer[cut:]
+                if segment:
+                    first = False
+                    yield segment
+
+            if idle:
+                # The stream stalled: speak the complete sentences we have
+                idle = False
+                last = None
+                for last in _boundary_pattern(config.sentence_punctuation).finditer(buffer):
+                    pass
+                if last is not None:
+                    segment, buffer = buffer[: last.end()].strip(), buffer[last.end():]
+                    if segment:
+                        logger.debug(f"Speech aggregator: idle flush ({len(segment)} chars)")
+                        first = False
+                        yield segment
+
+            if first and overdue and len(buffer.strip()) >= config.first_min_chars:
+                cut = buffer.rstrip().rfind(" ")
+                if cut > 0:
+                    segment, buffer = buffer[:cut].strip(), buffer[cut:]
+                    logger.debug(f"Speech aggregator: max wait flush ({len(segment)} chars)")
+                    first = False
+                    yield segment
+
+        if segment := buffer.strip():
+            yield segment
+    finally:
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
@@ -0,0 +1,95 @@
+"""Fast local token estimation for context budgeting.
+
+Exact tokenizers are model-specific and too slow to run on every message of
+every LLM call. The default estimator uses the ~4 characters per token rule
+of thumb, which is close enough to size a context window with some headroom.
+
+Estimators are pluggable per provider and per model:
+
+    >>> from caal.llm.tokens import register_token_estimator
+    >>> register_token_estimator("ollama", lambda text: len(text) // 3)
+    >>> register_token_estimator("groq", my_tiktoken_count, model="llama-3.3-70b-versatile")
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+__all__ = [
+    "TokenEstimator",
+    "estimate_tokens",
+    "estimate_message_tokens",
+    "estimate_tools_tokens",
+    "get_token_estimator",
+    "register_token_estimator",
+]
+
+TokenEstimator = Callable[[str], int]
+
+# Approximate characters per token for English-like text
+CHARS_PER_TOKEN = 4
+
+# Per-message overhead for role markers and chat template tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# (provider_name, model or None) -> estimator
+_estimators: dict[tuple[str, str | None], TokenEstimator] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of a string (~4 chars per token, rounded up)."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def register_token_estimator(
+    provider_name: str,
+    estimator: TokenEstimator,
+    model: str | None = None,
+) -> None:
+    """Register a token estimator for a provider, or for one of its models.
+
+    Args:
+        provider_name: Provider identifier (e.g., "ollama", "groq")
+        estimator: Callable returning the token count of a string
+        model: Optional model name; model-specific estimators take precedence
+    """
+    _estimators[(provider_name.lower(), model)] = estimator
+
+
+def get_token_estimator(provider_name: str, model: str | None = None) -> TokenEstimator:
+    """Get the estimator for a provider/model, falling back to the default."""
+    provider_name = provider_name.lower()
+    return (
+        _estimators.get((provider_name, model))
+        or _estimators.get((provider_name, None))
+        or estimate_tokens
+    )
+
+
+def estimate_message_tokens(
+    message: dict[str, Any],
+    estimator: TokenEstimator = estimate_tokens,
+) -> int:
+    """Estimate tokens of a chat message including tool call arguments."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimator(message.get("content") or "")
+    for tc in message.get("tool_calls") or ():
+        func = tc.get("function", {})
+        args = func.get("arguments", "")
+        if not isinstance(args, str):
+            args = json.dumps(args)
+        tokens += estimator(func.get("name", "")) + estimator(args)
+    return tokens
+
+
+def estimate_tools_tokens(
+    tools: list[dict[str, Any]] | None,
+    estimator: TokenEstimator = estimate_tokens,
+) -> int:
+    """Estimate tokens consumed by tool schemas in the prompt."""
+    if not tools:
+        return 0
+    return estimator(json.dumps(tools))
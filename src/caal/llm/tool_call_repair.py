@@ -0,0 +1,266 @@
+"""Local recovery of malformed tool calls.
+
+Local and hosted models sometimes emit a tool call as text instead of a
+structured call: in the content stream, or in a provider error such as
+Groq's "tool_use_failed" (whose failed_generation holds the raw output).
+Re-sending the request doubles latency and often fails the same way, so
+repair_tool_calls() parses the known formats instead:
+
+    Mistral      [TOOL_CALLS]name[ARGS]{"a": 1}
+                 [TOOL_CALLS][{"name": "name", "arguments": {"a": 1}}]
+    Llama        <function=name>{"a": 1}</function>
+                 <function=name{"a": 1}</function>      (Groq failed_generation)
+                 <|python_tag|>{"name": "name", "parameters": {"a": 1}}
+                 [name(a=1, b="x")]                     (Llama 3.2 pythonic)
+    Qwen/Hermes  <tool_call>{"name": "name", "arguments": {"a": 1}}</tool_call>
+    JSON         {"name": "name", "arguments": {"a": 1}}
+
+Reasoning residue ("...[/THINK]", "<think>...</think>") is dropped first.
+Recovered calls are kept only if they name an advertised tool, have object
+arguments and provide every required parameter.
+
+Usage:
+    calls = repair_tool_calls(round_content, tools)
+    if calls:
+        ...  # execute them like calls returned by the provider
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import re
+import uuid
+from typing import Any
+
+from .providers import ToolCall
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["failed_generation", "repair_tool_calls"]
+
+_THINK_BLOCK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+_THINK_END = "[/THINK]"
+
+# Markers followed by a tool name, then the JSON arguments
+_NAMED_MARKERS = (
+    # Mistral v11+: [TOOL_CALLS]name[ARGS]{...} (optionally [CALL_ID]id)
+    re.compile(r"\[TOOL_CALLS\]\s*([A-Za-z_][\w.-]*)\s*(?:\[CALL_ID\]\s*\S+?\s*)?\[ARGS\]\s*"),
+    # Llama: <function=name>{...}</function>, or without the ">"
+    re.compile(r"<function=([A-Za-z_][\w.-]*)>?\s*"),
+)
+
+# Markers followed by JSON call objects ({"name": ..., "arguments": ...})
+_OBJECT_MARKERS = re.compile(r"\[TOOL_CALLS\]|<tool_call>|<\|python_tag\|>")
+
+# Llama 3.2 pythonic calls: [name(a=1, b="x"), other()]
+_PYTHONIC_RE = re.compile(r"\[\s*[A-Za-z_]\w*\(.*\)\s*\]", re.DOTALL)
+
+_DECODER = json.JSONDecoder()
+
+# Groq (and other OpenAI-compatible) errors carry the raw model output here
+_FAILED_GENERATION_RE = re.compile(r"""['"]failed_generation['"]\s*:\s*(['"])(.*?)(?<!\\)\1""")
+
+
+def failed_generation(error: BaseException) -> str:
+    """Raw model output carried by a provider error, or the error text.
+
+    Groq rejects malformed tool calls with a "tool_use_failed" error whose
+    body includes the generation; other providers put it in the message.
+    """
+    body = getattr(error, "body", None)
+    if isinstance(body, dict):
+        inner = body.get("error", body)
+        if isinstance(inner, dict) and isinstance(inner.get("failed_generation"), str):
+            return inner["failed_generation"]
+    text = str(error)
+    match = _FAILED_GENERATION_RE.search(text)
+    if match:
+        try:
+            return ast.literal_eval(match.group(1) + match.group(2) + match.group(1))
+        except (ValueError, SyntaxError):
+            return match.group(2)
+    return text
+
+
+def repair_tool_calls(text: str | None, tools: list[dict] | None) -> list[ToolCall]:
+    """Recover tool calls written as text.
+
+    Args:
+        text: Model output (round content or failed generation)
+        tools: Tool definitions advertised for the round (OpenAI format)
+
+    Returns:
+        Valid tool calls in the order they appear (empty if none found)
+    """
+    if not text or not tools:
+        return []
+
+    schemas = {
+        t["function"]["name"]: t["function"].get("parameters") or {}
+        for t in tools
+        if t.get("function", {}).get("name")
+    }
+    text = _THINK_BLOCK_RE.sub("", text)
+    if _THINK_END in text:
+        text = text.rsplit(_THINK_END, 1)[1]
+
+    candidates = _named_calls(text) or _object_calls(text) or _pythonic_calls(text)
+    calls = []
+    for name, arguments in candidates:
+        call = _validate(name, arguments, schemas)
+        if call is not None:
+            calls.append(call)
+    if candidates:
+        logger.info(
+            f"Tool call repair: recovered {len(calls)}/{len(candidates)} call(s)"
+            + (f": {', '.join(c.name for c in calls)}" if calls else "")
+        )
+    return calls
+
+
+def _named_calls(text: str) -> list[tuple[str, Any]]:
+    found: list[tuple[int, str, Any]] = []
+    for pattern in _NAMED_MARKERS:
+        for match in pattern.finditer(text):
+            arguments = _decode_at(text, match.end())
+            if arguments is None:
+                # No arguments at all, or a truncated object (rejected later)
+                rest = text[match.end():].lstrip()
+                arguments = rest if rest.startswith("{") else {}
+            found.append((match.start(), match.group(1), arguments))
+    found.sort(key=lambda item: item[0])
+    return [(name, arguments) for _, name, arguments in found]
+
+
+def _object_calls(text: str) -> list[tuple[str, Any]]:
+    # After a marker when there is one, otherwise anywhere in the text
+    starts = [m.end() for m in _OBJECT_MARKERS.finditer(text)]
+    if not starts:
+        starts = [i for i, ch in enumerate(text) if ch in "[{"]
+
+    calls: list[tuple[str, Any]] = []
+    end = 0
+    for start in starts:
+        if start < end:
+            continue  # Inside a value already decoded
+        value, stop = _decode_value(text, start)
+        if value is None:
+            continue
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if call := _call_from_object(item):
+                calls.append(call)
+        end = stop
+    return calls
+
+
+def _pythonic_calls(text: str) -> list[tuple[str, Any]]:
+    match = _PYTHONIC_RE.search(text)
+    if match is None:
+        return []
+    try:
+        tree = ast.parse(match.group(0).strip(), mode="eval")
+    except SyntaxError:
+        return []
+    if not isinstance(tree.body, ast.List):
+        return []
+
+    calls = []
+    for node in tree.body.elts:
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.args:
+            return []
+        try:
+            arguments = {kw.arg: ast.literal_eval(kw.value) for kw in node.keywords}
+        except ValueError:
+            return []
+        calls.append((node.func.id, arguments))
+    return calls
+
+
+def _call_from_object(item: Any) -> tuple[str, Any] | None:
+    """(name, arguments) from {"name", "arguments"} or OpenAI-shaped objects."""
+    if not isinstance(item, dict):
+        return None
+    if isinstance(item.get("function"), dict):
+        item = item["function"]
+    name = item.get("name")
+    if not isinstance(name, str):
+        return None
+    for key in ("arguments", "parameters", "args", "input"):
+        if key in item:
+            return name, item[key]
+    return name, {}
+
+
+def _decode_at(text: str, start: int) -> Any:
+    value, _ = _decode_value(text, start)
+    return value
+
+
+def _decode_value(text: str, start: int) -> tuple[Any, int]:
+    """Decode the JSON (or Python literal) value starting at text[start:]."""
+    while start < len(text) and text[start].isspace():
+        start += 1
+    if start >= len(text) or text[start] not in "[{":
+        return None, start
+    try:
+        return _DECODER.raw_decode(text, start)
+    except ValueError:
+        pass
+    # Single quotes / True / None, as written by some fine-tunes
+    end = _matching_bracket(text, start)
+    if end is None:
+        return None, start
+    try:
+        return ast.literal_eval(text[start:end]), end
+    except (ValueError, SyntaxError):
+        return None, start
+
+
+def _matching_bracket(text: str, start: int) -> int | None:
+    """Index just past the bracket closing text[start] (quotes respected)."""
+    depth = 0
+    quote = None
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _validate(name: str, arguments: Any, schemas: dict[str, dict]) -> ToolCall | None:
+    if name not in schemas:
+        # Tolerate "functions.name" prefixes and case differences
+        bare = name.rsplit(".", 1)[-1]
+        name = next((n for n in schemas if n.lower() == bare.lower()), "")
+        if not name:
+            logger.warning(f"Tool call repair: unknown tool {bare!r}")
+            return None
+
+    if isinstance(arguments, str):
+        arguments = _decode_at(arguments, 0) if arguments.strip() else {}
+    if not isinstance(arguments, dict):
+        logger.warning(f"Tool call repair: {name} arguments are not an object")
+        return None
+
+    missing = [p for p in schemas[name].get("required", []) if p not in arguments]
+    if missing:
+        logger.warning(f"Tool call repair: {name} is missing {', '.join(missing)}")
+        return None
+    return ToolCall(id=f"call_{uuid.uuid4().hex[:8]}", name=name, arguments=arguments)
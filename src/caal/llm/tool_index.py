@@ -0,0 +1,172 @@
+"""Retrieval-based tool subsetting for large tool catalogs.
+
+Every advertised tool schema is part of the prompt, so dozens of n8n
+workflows and MCP tools slow down prefill on local models and make the
+model more likely to pick the wrong tool. ToolSelector sends only the tools
+relevant to the current request:
+
+    - top-k tools by BM25 over tool names and descriptions (n8n webhook notes)
+    - an always-on set (Home Assistant, web search)
+    - tools used recently, so follow-up requests keep working
+
+The index is in-process and rebuilt only when the tool list changes.
+
+Usage:
+    selector = ToolSelector(top_k=8)
+    tools = selector.select(all_tools, query="turn off the kitchen lights")
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable
+
+from .tokens import estimate_tools_tokens
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_ALWAYS_ON_TOOLS", "ToolIndex", "ToolSelector"]
+
+DEFAULT_ALWAYS_ON_TOOLS = ("hass_control", "hass_get_state", "web_search")
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Function words (en/fr/it) that carry no signal for tool matching
+_STOPWORDS = frozenset(
+    "a an and are can could do for from how i in is it me my of on or please "
+    "the this to what when where which who will with would you your "
+    "au aux de des du en est et il je la le les mes mon ou pour que qui sur "
+    "un une vous "
+    "al che del della di e gli il in la le lo mi per sono un una"
+    .split()
+)
+
+# BM25 parameters (standard values)
+_K1 = 1.2
+_B = 0.75
+
+
+def _tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        # Crude plural folding: "lights" matches "light"
+        if len(token) > 3 and token.endswith("s"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class ToolIndex:
+    """BM25 index over a fixed list of tool definitions."""
+
+    def __init__(self, tools: list[dict]) -> None:
+        self._names: list[str] = []
+        self._term_freqs: list[Counter[str]] = []
+        self._lengths: list[int] = []
+        doc_freq: Counter[str] = Counter()
+
+        for tool in tools:
+            func = tool.get("function", {})
+            name = func.get("name", "")
+            # Names are short and precise: weight them above descriptions
+            tokens = _tokenize(name) * 2 + _tokenize(func.get("description", ""))
+            freqs = Counter(tokens)
+            self._names.append(name)
+            self._term_freqs.append(freqs)
+            self._lengths.append(len(tokens))
+            doc_freq.update(freqs.keys())
+
+        count = len(self._names)
+        self._avg_length = (sum(self._lengths) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def search(self, query: str, top_k: int) -> list[tuple[str, float]]:
+        """Rank tools against a query.
+
+        Returns:
+            Up to top_k (tool name, score) pairs with a positive score,
+            best first
+        """
+        terms = [t for t in set(_tokenize(query)) if t in self._idf]
+        if not terms:
+            return []
+
+        scores = []
+        for name, freqs, length in zip(self._names, self._term_freqs, self._lengths):
+            score = 0.0
+            norm = _K1 * (1 - _B + _B * length / self._avg_length) if self._avg_length else _K1
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (_K1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((name, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:top_k]
+
+
+class ToolSelector:
+    """Chooses the subset of tools to advertise for a request.
+
+    Args:
+        top_k: Max tools selected by relevance (0 = send every tool)
+        always_on: Tool names always advertised when available
+    """
+
+    def __init__(
+        self,
+        top_k: int = 8,
+        always_on: Iterable[str] = DEFAULT_ALWAYS_ON_TOOLS,
+    ) -> None:
+        self.top_k = top_k
+        self.always_on = frozenset(always_on)
+        self._indexed_tools: list[dict] | None = None
+        self._index: ToolIndex | None = None
+        self._catalog_tokens = 0
+
+    def select(
+        self,
+        tools: list[dict],
+        query: str,
+        pinned: Iterable[str] = (),
+    ) -> list[dict]:
+        """Select relevant tools for a query, preserving catalog order.
+
+        Args:
+            tools: Full tool catalog
+            query: Recent user text
+            pinned: Extra tool names to keep (e.g. tools used recently)
+
+        Returns:
+            The selected tools (the full list if it is already small enough)
+        """
+        keep = self.always_on.union(pinned)
+        if not self.top_k or len(tools) <= self.top_k + len(keep):
+            return tools
+
+        start = time.perf_counter()
+        if self._index is None or self._indexed_tools is not tools:
+            self._index = ToolIndex(tools)
+            self._indexed_tools = tools
+            self._catalog_tokens = estimate_tools_tokens(tools)
+
+        selected_names = keep.union(name for name, _ in self._index.search(query, self.top_k))
+        selected = [t for t in tools if t.get("function", {}).get("name") in selected_names]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        saved = self._catalog_tokens - estimate_tools_tokens(selected)
+        logger.info(
+            f"Tool subset: {len(selected)}/{len(tools)} tools in {elapsed_ms:.1f}ms "
+            f"(~{saved} schema tokens saved)"
+        )
+        return selected
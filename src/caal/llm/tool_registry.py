@@ -0,0 +1,360 @@
+"""Process-wide registry of tool schemas shared by every session.
+
+Tool discovery is expensive: list_tools() on each MCP server plus one
+get_workflow_details call per n8n workflow. Schemas do not change between
+rooms, so the registry discovers them once per worker process and hands each
+session an immutable, versioned ToolSnapshot.
+
+- First session (or changed MCP config): discovery runs, concurrent sessions
+  wait on the same build
+- Snapshot older than refresh_interval: the current snapshot is returned
+  immediately and a refresh runs in the background (stale-while-revalidate)
+- refresh(): builds a new snapshot and swaps it in atomically; sessions
+  keep the snapshot they were given until they ask again
+
+Snapshots hold schemas only. Tool execution always goes through the calling
+session's own MCP connections. Tool definitions are deep-copied when a
+snapshot is built and again when a session takes them (mcp_tool_list(),
+n8n_tool_list()), so no session can change another session's tools.
+
+Usage:
+    registry = get_tool_registry()
+    snapshot = await registry.get_snapshot(mcp_servers, n8n_base_url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import inspect
+import logging
+import time
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from ..integrations.n8n import discover_n8n_workflows
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ToolRegistry",
+    "ToolSnapshot",
+    "WRAPPED_MCP_SERVERS",
+    "agent_tool_schemas",
+    "get_mcp_tools",
+    "get_tool_registry",
+]
+
+# MCP servers exposed through wrappers instead of raw MCP tools:
+# n8n uses webhook-based workflow discovery, home_assistant uses
+# hass_control/hass_get_state for a simpler LLM interface
+WRAPPED_MCP_SERVERS = ("n8n", "home_assistant")
+
+# Seconds before a snapshot is refreshed in the background
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+
+@dataclass(frozen=True)
+class ToolSnapshot:
+    """Immutable set of discovered tool schemas.
+
+    The containers are read-only and the tool dicts are private copies; use
+    mcp_tool_list() / n8n_tool_list() for definitions a session may modify.
+
+    Attributes:
+        version: Increases by one with every registry rebuild
+        mcp_tools: Server name -> tool definitions (names prefixed "server__")
+        n8n_tools: n8n workflow tool definitions
+        n8n_workflow_name_map: Sanitized tool name -> n8n workflow name
+        created_at: time.monotonic() when discovery finished
+    """
+
+    version: int
+    mcp_tools: Mapping[str, tuple[dict, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    n8n_tools: tuple[dict, ...] = ()
+    n8n_workflow_name_map: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    created_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was built."""
+        return time.monotonic() - self.created_at
+
+    @property
+    def tool_count(self) -> int:
+        return sum(len(t) for t in self.mcp_tools.values()) + len(self.n8n_tools)
+
+    def mcp_tool_list(self) -> list[dict]:
+        """Copies of every MCP tool definition, for one session."""
+        return [copy.deepcopy(tool) for tools in self.mcp_tools.values() for tool in tools]
+
+    def n8n_tool_list(self) -> list[dict]:
+        """Copies of the n8n workflow tool definitions, for one session."""
+        return copy.deepcopy(list(self.n8n_tools))
+
+
+class ToolRegistry:
+    """Builds, caches and refreshes ToolSnapshots for this process.
+
+    Args:
+        refresh_interval: Snapshot age in seconds before a background refresh
+    """
+
+    def __init__(self, refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        self._refresh_interval = refresh_interval
+        self._snapshot: ToolSnapshot | None = None
+        self._source_key: tuple | None = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def snapshot(self) -> ToolSnapshot | None:
+        """The current snapshot (None before the first discovery)."""
+        return self._snapshot
+
+    async def get_snapshot(
+        self,
+        mcp_servers: Mapping[str, Any],
+        n8n_base_url: str | None = None,
+    ) -> ToolSnapshot:
+        """Get the current snapshot, discovering tools if needed.
+
+        Args:
+            mcp_servers: The session's initialized MCP servers by name
+            n8n_base_url: n8n base URL (None if n8n is not configured)
+
+        Returns:
+            Snapshot of all MCP and n8n tool schemas
+        """
+        source_key = _source_key(mcp_servers, n8n_base_url)
+        snapshot = self._snapshot
+        if snapshot is None or source_key != self._source_key:
+            async with self._lock:
+                # Another session may have finished the build while we waited
+                if self._snapshot is None or source_key != self._source_key:
+                    return await self._rebuild(mcp_servers, n8n_base_url, source_key)
+                return self._snapshot
+
+        if snapshot.age > self._refresh_interval and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            logger.debug(f"Tool registry v{snapshot.version} is stale, refreshing in background")
+            self._refresh_task = asyncio.create_task(
+                self.refresh(mcp_servers, n8n_base_url)
+            )
+        return snapshot
+
+    async def refresh(
+        self,
+        mcp_servers: Mapping[str, Any],
+        n8n_base_url: str | None = None,
+    ) -> ToolSnapshot:
+        """Rediscover all tools and atomically swap in the new snapshot.
+
+        If discovery fails, or the MCP connections it was given have been
+        closed (the session that asked for it ended), the previous snapshot
+        is kept and the next get_snapshot() call schedules a new refresh.
+
+        Returns:
+            The new snapshot (or the previous one if discovery failed)
+        """
+        if self._snapshot is not None and not _connected(mcp_servers):
+            logger.info("Tool registry refresh skipped: the MCP connections are closed")
+            return self._snapshot
+        async with self._lock:
+            try:
+                return await self._rebuild(
+                    mcp_servers, n8n_base_url, _source_key(mcp_servers, n8n_base_url)
+                )
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.warning(
+                    f"Tool registry refresh failed, keeping v{self._snapshot.version}: {e}"
+                )
+                return self._snapshot
+
+    async def _rebuild(
+        self,
+        mcp_servers: Mapping[str, Any],
+        n8n_base_url: str | None,
+        source_key: tuple,
+    ) -> ToolSnapshot:
+        start = time.perf_counter()
+        open_servers = [server for server in mcp_servers.values() if _is_open(server)]
+        mcp_tools: dict[str, tuple[dict, ...]] = {}
+        for server_name, server in mcp_servers.items():
+            if server_name in WRAPPED_MCP_SERVERS:
+                continue
+            server_tools = await get_mcp_tools(server)
+            # Private copies, prefixed with the server name to avoid collisions
+            prefixed = []
+            for tool in copy.deepcopy(server_tools):
+                tool["function"]["name"] = f"{server_name}__{tool['function']['name']}"
+                prefixed.append(tool)
+            mcp_tools[server_name] = tuple(prefixed)
+            if server_tools:
+                logger.info(f"Added {len(server_tools)} tools from MCP server: {server_name}")
+
+        n8n_tools: list[dict] = []
+        n8n_name_map: dict[str, str] = {}
+        n8n_mcp = mcp_servers.get("n8n")
+        if n8n_mcp:
+            n8n_tools, n8n_name_map = await discover_n8n_workflows(n8n_mcp, n8n_base_url)
+            # n8n schemas are shared with its per-workflow schema cache
+            n8n_tools = copy.deepcopy(n8n_tools)
+
+        # A connection closed mid-discovery yields empty tool lists, not errors
+        if not all(_is_open(server) for server in open_servers):
+            raise RuntimeError("MCP connections closed during tool discovery")
+
+        self._version += 1
+        snapshot = ToolSnapshot(
+            version=self._version,
+            mcp_tools=MappingProxyType(mcp_tools),
+            n8n_tools=tuple(n8n_tools),
+            n8n_workflow_name_map=MappingProxyType(n8n_name_map),
+            created_at=time.monotonic(),
+        )
+        # Single assignment: readers see the old or the new snapshot, never a mix
+        self._snapshot = snapshot
+        self._source_key = source_key
+        logger.info(
+            f"Tool registry v{snapshot.version}: {snapshot.tool_count} tools "
+            f"discovered in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return snapshot
+
+
+def _is_open(server: Any) -> bool:
+    """Whether an MCP server still has a client (aclose() resets it to None)."""
+    return getattr(server, "_client", None) is not None
+
+
+def _connected(mcp_servers: Mapping[str, Any]) -> bool:
+    return all(_is_open(server) for server in mcp_servers.values())
+
+
+def _source_key(mcp_servers: Mapping[str, Any], n8n_base_url: str | None) -> tuple:
+    """Identify the tool sources, so config changes force a rebuild."""
+    servers = sorted((name, getattr(server, "url", "")) for name, server in mcp_servers.items())
+    return tuple(servers), n8n_base_url
+
+
+_registry: ToolRegistry | None = None
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the process-wide tool registry."""
+    global _registry
+    if _registry is None:
+        _registry = ToolRegistry()
+    return _registry
+
+
+async def get_mcp_tools(mcp_server) -> list[dict]:
+    """Get tools from an MCP server in OpenAI format."""
+    tools = []
+
+    if not mcp_server or not hasattr(mcp_server, "_client") or not mcp_server._client:
+        return tools
+
+    try:
+        tools_result = await mcp_server._client.list_tools()
+        if hasattr(tools_result, "tools"):
+            for mcp_tool in tools_result.tools:
+                # Convert MCP schema to OpenAI format
+                parameters = {"type": "object", "properties": {}, "required": []}
+                if hasattr(mcp_tool, "inputSchema") and mcp_tool.inputSchema:
+                    schema = mcp_tool.inputSchema
+                    if isinstance(schema, dict):
+                        parameters = schema.copy()
+                    elif hasattr(schema, "properties"):
+                        parameters["properties"] = schema.properties or {}
+                        parameters["required"] = getattr(schema, "required", []) or []
+
+                tools.append(
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": mcp_tool.name,
+                            "description": getattr(mcp_tool, "description", "") or "",
+                            "parameters": parameters,
+                        },
+                    }
+                )
+
+        # Don't log here - caller logs the summary
+
+    except Exception as e:
+        logger.warning(f"Error getting MCP tools: {e}")
+
+    return tools
+
+
+# @function_tool function -> its tool definition
+_function_schema_cache: weakref.WeakKeyDictionary[Any, dict] = weakref.WeakKeyDictionary()
+
+
+def agent_tool_schemas(agent) -> list[dict]:
+    """Get tool definitions for an agent's @function_tool methods.
+
+    Signatures are inspected once per function. Each call returns deep
+    copies, like mcp_tool_list(), so no session can change another
+    session's tools.
+    """
+    tools = []
+    for tool in getattr(agent, "_tools", None) or ():
+        if not hasattr(tool, "__func__"):
+            continue
+        func = tool.__func__
+        schema = _function_schema_cache.get(func)
+        if schema is None:
+            schema = _function_schema_cache[func] = _function_schema(func)
+        tools.append(copy.deepcopy(schema))
+    return tools
+
+
+def _function_schema(func) -> dict:
+    """Tool definition of a @function_tool function, from its signature."""
+    sig = inspect.signature(func)
+    properties = {}
+    required = []
+
+    for param_name, param in sig.parameters.items():
+        if param_name == "self":
+            continue
+        param_type = "string"
+        if param.annotation is not inspect.Parameter.empty:
+            if param.annotation is str:
+                param_type = "string"
+            elif param.annotation is int:
+                param_type = "integer"
+            elif param.annotation is float:
+                param_type = "number"
+            elif param.annotation is bool:
+                param_type = "boolean"
+        properties[param_name] = {"type": param_type}
+        if param.default is inspect.Parameter.empty:
+            required.append(param_name)
+
+    return {
+        "type": "function",
+        "function": {
+            "name": func.__name__,
+            "description": func.__doc__ or "",
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": required,
+            },
+        },
+    }
@@ -0,0 +1,241 @@
+"""TTL result cache for idempotent tool calls.
+
+Read-only tools (hass_get_state, web_search, "get_*" n8n workflows) are often
+called again with the same arguments within seconds — across rounds of one
+turn and across turns. ToolResultCache keeps their results for a per-tool TTL
+so repeat calls skip the network round-trip, and coalesces identical calls
+that are in flight at the same time into a single execution.
+
+Only tools with a TTL are cached; everything else passes straight through.
+TTLs are looked up in this order:
+    1. Exact tool name in the configured TTLs (settings)
+    2. The ttl_resolver (e.g. n8n sticky note annotations)
+    3. fnmatch patterns in the configured TTLs (e.g. "n8n__get_*")
+
+Usage:
+    cache = ToolResultCache({"hass_get_state": 5, "web_search": 300})
+    result = await cache.get_or_call("web_search", {"query": "..."}, call)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_INVALIDATIONS", "ToolResultCache"]
+
+# Tools whose execution makes cached results of other tools stale
+DEFAULT_INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    "hass_control": ("hass_get_state",),
+}
+
+# String results that report a failure rather than data. MCP, HASS and
+# web_search errors are returned as text instead of raised, and must not be
+# cached for the tool's full TTL.
+_ERROR_PREFIXES = (
+    "MCP tool ",
+    "Error",
+    "error",
+    "Failed",
+    "Home Assistant is not connected",
+    "I had trouble",
+    "The search took too long",
+)
+
+
+class _InFlight:
+    """A running tool call shared by every caller with the same key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class ToolResultCache:
+    """Per-tool TTL cache with LRU eviction and in-flight coalescing.
+
+    Cached results are shared between callers, so they must be treated as
+    read-only.
+
+    Args:
+        ttls: Tool name (or fnmatch pattern) -> TTL in seconds
+        max_entries: Max cached results before least-recently-used eviction
+        ttl_resolver: Optional fallback returning a TTL for tool names not
+            configured explicitly (None = not cacheable)
+        invalidations: Tool name -> tools whose cached results it invalidates
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        max_entries: int = 128,
+        ttl_resolver: Callable[[str], float | None] | None = None,
+        invalidations: Mapping[str, tuple[str, ...]] | None = None,
+    ) -> None:
+        ttls = dict(ttls or {})
+        self._exact_ttls = {k: float(v) for k, v in ttls.items() if not _is_pattern(k)}
+        self._pattern_ttls = [(k, float(v)) for k, v in ttls.items() if _is_pattern(k)]
+        self._ttl_resolver = ttl_resolver
+        self._invalidations = dict(
+            DEFAULT_INVALIDATIONS if invalidations is None else invalidations
+        )
+        self._max_entries = max_entries
+        # (tool_name, canonical args) -> (expires_at, result)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple[str, str], _InFlight] = {}
+        # Bumped on invalidation so results of calls started earlier are dropped
+        self._generations: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Get the cache TTL for a tool in seconds (0 = not cached)."""
+        if tool_name in self._exact_ttls:
+            return self._exact_ttls[tool_name]
+        if self._ttl_resolver is not None:
+            ttl = self._ttl_resolver(tool_name)
+            if ttl is not None:
+                return float(ttl)
+        for pattern, ttl in self._pattern_ttls:
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return ttl
+        return 0.0
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        arguments: dict,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return a cached result, or execute the call and cache its result.
+
+        Args:
+            tool_name: Tool being called
+            arguments: Tool arguments (part of the cache key)
+            call: Zero-argument coroutine function executing the tool
+
+        Returns:
+            The tool result
+        """
+        ttl = self.ttl_for(tool_name)
+        if ttl <= 0:
+            try:
+                return await call()
+            finally:
+                self._invalidate_dependents(tool_name)
+
+        key = (tool_name, _canonical_args(arguments))
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                logger.info(
+                    f"Tool cache hit: {tool_name} (expires in {expires_at - now:.1f}s)"
+                )
+                return result
+            del self._entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._coalesced += 1
+            logger.info(f"Tool cache: joining in-flight {tool_name} call")
+        else:
+            self._misses += 1
+            in_flight = _InFlight(asyncio.ensure_future(call()))
+            self._in_flight[key] = in_flight
+            generation = self._generations.get(tool_name, 0)
+            in_flight.task.add_done_callback(
+                lambda task: self._on_done(key, ttl, generation, task)
+            )
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            # Last interested caller gone (e.g. timed out): stop the call
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                in_flight.task.cancel()
+
+    def _on_done(
+        self, key: tuple[str, str], ttl: float, generation: int, task: asyncio.Task
+    ) -> None:
+        if self._in_flight.get(key) is not None and self._in_flight[key].task is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation != self._generations.get(key[0], 0):
+            return  # Invalidated while running
+        result = task.result()
+        if isinstance(result, str) and result.startswith(_ERROR_PREFIXES):
+            return
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _invalidate_dependents(self, tool_name: str) -> None:
+        for dependent in self._invalidations.get(tool_name, ()):
+            self.invalidate(dependent)
+
+    def invalidate(self, tool_name: str | None = None) -> int:
+        """Drop cached results for one tool, or all tools.
+
+        Returns:
+            Number of entries dropped
+        """
+        if tool_name is None:
+            count = len(self._entries)
+            self._entries.clear()
+            for name in {k[0] for k in self._in_flight} | self._generations.keys():
+                self._generations[name] = self._generations.get(name, 0) + 1
+            self._in_flight.clear()
+        else:
+            keys = [k for k in self._entries if k[0] == tool_name]
+            for k in keys:
+                del self._entries[k]
+            count = len(keys)
+            # Calls in flight may have read the old state: don't join or store them
+            for k in [k for k in self._in_flight if k[0] == tool_name]:
+                del self._in_flight[k]
+            self._generations[tool_name] = self._generations.get(tool_name, 0) + 1
+        if count:
+            logger.debug(f"Tool cache: invalidated {count} entr(ies) for {tool_name or 'all'}")
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss counters and current size."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "entries": len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _is_pattern(name: str) -> bool:
+    return any(c in name for c in "*?[")
+
+
+def _canonical_args(arguments: dict) -> str:
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
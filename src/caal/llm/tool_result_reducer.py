@@ -0,0 +1,260 @@
+"""Reduction of large tool results before they enter the prompt.
+
+A tool result is appended to the message history and re-sent on every
+later round and turn, so one oversized result (a full GetLiveContext dump,
+a long n8n JSON array) inflates prefill for the rest of the session.
+ToolResultReducer shrinks results according to a per-tool policy:
+
+    1. Field projection: keep only the listed keys of each JSON object
+    2. List truncation: keep the first max_items items, noting how many
+       were dropped
+    3. Size limit: shorten JSON (lists, then strings) or text (whole lines)
+       until the result fits max_chars
+    4. Optional summarization by the LLM instead of truncation, for text
+       that cannot be cut without losing the answer
+
+Usage:
+    reducer = ToolResultReducer({"hass_get_state": {"max_chars": 6000}})
+    content = await reducer.reduce("hass_get_state", result)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from typing import TYPE_CHECKING, Any
+
+from .providers.scheduler import Priority
+
+if TYPE_CHECKING:
+    from .providers import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ReductionPolicy", "ToolResultReducer", "shrink_json"]
+
+# Progressively tighter (max list items, max string chars) limits tried by
+# shrink_json before falling back to cutting the serialized text
+_SHRINK_STEPS = ((20, 500), (10, 200), (5, 100), (3, 60), (1, 40))
+
+_SUMMARY_PROMPT = (
+    "Condense the following tool output to at most {max_chars} characters. "
+    "Keep every name, ID, state and number that could answer a request; "
+    "drop boilerplate. Reply with the condensed output only.\n\n"
+    "Tool: {tool}\nArguments: {arguments}\n\nOutput:\n{output}"
+)
+
+
+@dataclass(frozen=True)
+class ReductionPolicy:
+    """How to reduce one tool's results.
+
+    Attributes:
+        max_chars: Max size of the result in the prompt (0 = unlimited)
+        fields: Keys to keep in each JSON object (empty = keep all)
+        max_items: Max items kept per JSON list (0 = unlimited)
+        summarize: Summarize oversized results with the LLM instead of
+            truncating them (falls back to truncation on failure)
+    """
+
+    max_chars: int = 4000
+    fields: tuple[str, ...] = ()
+    max_items: int = 0
+    summarize: bool = False
+
+    @classmethod
+    def from_dict(
+        cls, data: Mapping[str, Any], base: ReductionPolicy | None = None
+    ) -> ReductionPolicy:
+        """Build a policy from a settings dict, unknown keys ignored."""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        if "fields" in values:
+            values["fields"] = tuple(values["fields"])
+        return replace(base or cls(), **values)
+
+
+class ToolResultReducer:
+    """Applies per-tool ReductionPolicies to tool results.
+
+    Args:
+        policies: Tool name (or fnmatch pattern) -> policy or settings dict
+        default: Policy for tools without their own
+        provider: LLM provider used for summarization (None = never summarize)
+        summary_timeout: Seconds to wait for a summary before truncating
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, ReductionPolicy | Mapping[str, Any]] | None = None,
+        default: ReductionPolicy | None = None,
+        provider: LLMProvider | None = None,
+        summary_timeout: float = 10.0,
+    ) -> None:
+        self._default = default or ReductionPolicy()
+        self._policies: dict[str, ReductionPolicy] = {}
+        for name, policy in (policies or {}).items():
+            if not isinstance(policy, ReductionPolicy):
+                policy = ReductionPolicy.from_dict(policy, base=self._default)
+            self._policies[name] = policy
+        self._provider = provider
+        self._summary_timeout = summary_timeout
+
+    def policy_for(self, tool_name: str) -> ReductionPolicy:
+        """Get the policy for a tool (exact name, then pattern, then default)."""
+        policy = self._policies.get(tool_name)
+        if policy is not None:
+            return policy
+        for pattern, policy in self._policies.items():
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return policy
+        return self._default
+
+    async def reduce(self, tool_name: str, result: Any, arguments: dict | None = None) -> str:
+        """Reduce a tool result to the string added to the prompt.
+
+        Args:
+            tool_name: Tool that produced the result
+            result: Raw tool result (dict/list, or text)
+            arguments: Tool call arguments (context for summarization)
+
+        Returns:
+            Prompt-ready result content
+        """
+        policy = self.policy_for(tool_name)
+        data = result
+        if isinstance(result, str):
+            raw = result
+            # Text that is really JSON (MCP/n8n) can be projected and truncated
+            if raw[:1] in ("{", "[") and (policy.fields or policy.max_items or (
+                policy.max_chars and len(raw) > policy.max_chars
+            )):
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    pass
+        else:
+            raw = json.dumps(result, ensure_ascii=False, default=str)
+
+        if isinstance(data, str):
+            reduced = data
+            if policy.max_chars and len(reduced) > policy.max_chars:
+                reduced = await self._reduce_text(tool_name, reduced, arguments, policy)
+        else:
+            if policy.fields:
+                data = _project(data, frozenset(policy.fields))
+            if policy.max_items:
+                data = _truncate(data, policy.max_items, None)
+            reduced = json.dumps(data, ensure_ascii=False, default=str)
+            if policy.max_chars and len(reduced) > policy.max_chars:
+                if policy.summarize and self._provider is not None:
+                    reduced = await self._reduce_text(tool_name, reduced, arguments, policy)
+                else:
+                    reduced = shrink_json(data, policy.max_chars)
+
+        saved = len(raw) - len(reduced)
+        logger.info(
+            f"Tool result {tool_name}: {len(raw)} → {len(reduced)} chars"
+            + (f" (~{saved // 4} tokens saved)" if saved > 0 else "")
+        )
+        return reduced
+
+    async def _reduce_text(
+        self, tool_name: str, text: str, arguments: dict | None, policy: ReductionPolicy
+    ) -> str:
+        if policy.summarize and self._provider is not None:
+            summary = await self._summarize(tool_name, text, arguments, policy.max_chars)
+            if summary:
+                return summary[: policy.max_chars]
+        return truncate_lines(text, policy.max_chars)
+
+    async def _summarize(
+        self, tool_name: str, text: str, arguments: dict | None, max_chars: int
+    ) -> str | None:
+        prompt = _SUMMARY_PROMPT.format(
+            max_chars=max_chars,
+            tool=tool_name,
+            arguments=json.dumps(arguments or {}, ensure_ascii=False),
+            output=text,
+        )
+        try:
+            response = await asyncio.wait_for(
+                self._provider.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    priority=Priority.BACKGROUND,
+                ),
+                timeout=self._summary_timeout,
+            )
+            return (response.content or "").strip() or None
+        except Exception as e:
+            logger.warning(f"Summarizing {tool_name} result failed, truncating: {e}")
+            return None
+
+
+def truncate_lines(text: str, max_chars: int) -> str:
+    """Cut text to whole lines within max_chars, noting how many were dropped."""
+    if len(text) <= max_chars:
+        return text
+    lines = text.splitlines()
+    kept: list[str] = []
+    size = 0
+    for line in lines:
+        # Reserve room for the trailing note
+        if size + len(line) + 1 > max_chars - 32:
+            break
+        kept.append(line)
+        size += len(line) + 1
+    if not kept:
+        return text[: max(0, max_chars - 3)] + "..."
+    return "\n".join(kept) + f"\n[... {len(lines) - len(kept)} more lines]"
+
+
+def shrink_json(data: Any, max_chars: int) -> str:
+    """Serialize data as JSON in at most max_chars characters.
+
+    Oversized payloads keep their structure: lists are cut to their first
+    items (with a note of how many were dropped) and long strings are
+    shortened, with increasingly tight limits until the result fits.
+    """
+    text = json.dumps(data, ensure_ascii=False, default=str)
+    if len(text) <= max_chars:
+        return text
+    for max_items, max_str in _SHRINK_STEPS:
+        text = json.dumps(_truncate(data, max_items, max_str), ensure_ascii=False, default=str)
+        if len(text) <= max_chars:
+            return text
+    return text[: max(0, max_chars - 3)] + "..."
+
+
+def _truncate(value: Any, max_items: int, max_str: int | None) -> Any:
+    if isinstance(value, str):
+        if max_str is None or len(value) <= max_str:
+            return value
+        return value[:max_str] + "..."
+    if isinstance(value, dict):
+        return {k: _truncate(v, max_items, max_str) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_truncate(v, max_items, max_str) for v in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more")
+        return items
+    return value
+
+
+def _project(value: Any, keep: frozenset[str]) -> Any:
+    """Keep only the given keys in each object.
+
+    Objects without any of the keys are treated as wrappers (e.g.
+    {"data": [...]}) and projected one level down.
+    """
+    if isinstance(value, list):
+        return [_project(v, keep) for v in value]
+    if isinstance(value, dict):
+        if keep.intersection(value):
+            return {k: v for k, v in value.items() if k in keep}
+        return {k: _project(v, keep) for k, v in value.items()}
+    return value
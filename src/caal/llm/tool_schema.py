@@ -0,0 +1,435 @@
+"""Local validation and coercion of tool call arguments.
+
+A tool call with bad arguments (a string where hass_control's value expects
+an integer, a missing required field) otherwise goes out to n8n, MCP or Home
+Assistant, fails remotely, and costs a whole extra LLM round to explain.
+validate_arguments() checks the arguments against the tool's JSON schema
+before any network call. It fixes what is unambiguous and reports the rest
+in one precise message the model can act on.
+
+Coercions:
+    "5" / 5.0 -> 5 (integer), "0.5" -> 0.5 (number), 5 -> "5" (string)
+    "true" / "yes" / 1 -> True (boolean)
+    '{"a": 1}' -> {"a": 1} (object / array given as a JSON string)
+    "x" -> ["x"] (array given a single item)
+    "Turn On" -> "turn_on" (enum, ignoring case, spaces and dashes)
+    null for an optional argument -> argument omitted
+
+Schemas are compiled once into nested checks and cached by content, so
+validation per call is a walk over the arguments. Supported keywords: type,
+enum, const, properties, required, additionalProperties, items, anyOf/oneOf,
+minimum/maximum (and exclusive), minLength/maxLength, minItems/maxItems and
+pattern. Other keywords ($ref, allOf, format...) are accepted as is.
+
+Usage:
+    try:
+        arguments = validate_arguments("hass_control", arguments, schema)
+    except ToolArgumentError as e:
+        result = str(e)  # returned to the model instead of calling the tool
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ToolArgumentError", "compile_schema", "validate_arguments"]
+
+# Compiled check: (value, path, errors) -> coerced value. Problems are
+# appended to errors; the returned value is only used when there are none.
+_Check = Callable[[Any, str, list[str]], Any]
+
+_TRUE_VALUES = ("true", "yes", "on", "1")
+_FALSE_VALUES = ("false", "no", "off", "0")
+
+# Omitted from error messages beyond this many enum members
+_MAX_LISTED_ENUM = 12
+
+# Compiled schemas kept (a few per tool at most)
+_MAX_COMPILED = 256
+
+# id(schema) -> (schema, check); the schema reference keeps the id valid
+_by_identity: dict[int, tuple[dict, _Check]] = {}
+
+
+class ToolArgumentError(ValueError):
+    """Tool call arguments that do not match the tool's schema."""
+
+    def __init__(self, tool_name: str, errors: list[str]) -> None:
+        self.tool_name = tool_name
+        self.errors = errors
+        super().__init__(
+            f"Invalid arguments for {tool_name}: {'; '.join(errors)}. "
+            "The tool was not called; fix the arguments and call it again."
+        )
+
+
+def validate_arguments(tool_name: str, arguments: Any, schema: dict | None) -> dict:
+    """Validate tool call arguments and coerce them to the schema.
+
+    Args:
+        tool_name: Tool being called (for the error message)
+        arguments: Arguments from the model (a dict, or a JSON string)
+        schema: The tool's parameters schema (None = accept anything)
+
+    Returns:
+        The coerced arguments (a new dict, the input is not modified)
+
+    Raises:
+        ToolArgumentError: The arguments cannot be made to match
+    """
+    if isinstance(arguments, str):
+        arguments = _json_value(arguments, dict) if arguments.strip() else {}
+    if arguments is None:
+        arguments = {}
+    if not isinstance(arguments, dict):
+        raise ToolArgumentError(tool_name, ["arguments must be an object"])
+    if not schema:
+        return dict(arguments)
+
+    errors: list[str] = []
+    coerced = compile_schema(schema)(arguments, "", errors)
+    if errors:
+        raise ToolArgumentError(tool_name, errors)
+    if coerced != arguments:
+        logger.debug(f"Coerced {tool_name} arguments: {arguments} -> {coerced}")
+    return coerced
+
+
+def compile_schema(schema: dict) -> _Check:
+    """Compiled check for a JSON schema, cached by schema content."""
+    # Tool definitions are shared dicts: skip serializing them on every call
+    entry = _by_identity.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    check = _compile_cached(json.dumps(schema, sort_keys=True, default=str))
+    if len(_by_identity) >= _MAX_COMPILED:
+        _by_identity.clear()
+    _by_identity[id(schema)] = (schema, check)
+    return check
+
+
+@lru_cache(maxsize=_MAX_COMPILED)
+def _compile_cached(key: str) -> _Check:
+    return _compile(json.loads(key))
+
+
+def _compile(schema: Any) -> _Check:
+    if not isinstance(schema, dict):
+        return _accept
+
+    checks: list[_Check] = []
+    branches = schema.get("anyOf") or schema.get("oneOf")
+    if isinstance(branches, list) and branches:
+        checks.append(_compile_branches([_compile(branch) for branch in branches]))
+
+    types = schema.get("type")
+    if isinstance(types, str):
+        types = (types,)
+    if types:
+        checks.append(_compile_type(tuple(types)))
+
+    if "const" in schema:
+        checks.append(_compile_enum([schema["const"]]))
+    elif isinstance(schema.get("enum"), list):
+        checks.append(_compile_enum(schema["enum"]))
+
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        checks.append(_compile_object(schema))
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        checks.append(_compile_array(schema))
+    if any(key in schema for key in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")):
+        checks.append(_compile_range(schema))
+    if any(key in schema for key in ("minLength", "maxLength", "pattern")):
+        checks.append(_compile_string(schema))
+
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        for step in checks:
+            count = len(errors)
+            value = step(value, path, errors)
+            if len(errors) > count:
+                break  # Later checks would only repeat the problem
+        return value
+
+    return check
+
+
+def _accept(value: Any, path: str, errors: list[str]) -> Any:
+    return value
+
+
+def _compile_branches(branches: list[_Check]) -> _Check:
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        first_errors: list[str] | None = None
+        for branch in branches:
+            branch_errors: list[str] = []
+            result = branch(value, path, branch_errors)
+            if not branch_errors:
+                return result
+            first_errors = first_errors or branch_errors
+        errors.extend(first_errors or ())
+        return value
+
+    return check
+
+
+def _compile_type(types: tuple[str, ...]) -> _Check:
+    expected = " or ".join(_TYPE_NAMES.get(t, t) for t in types)
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if any(_is_type(value, t) for t in types):
+            return value
+        for t in types:
+            coerced = _coerce(value, t)
+            if coerced is not _INVALID:
+                return coerced
+        errors.append(f"{_name(path)} must be {expected}, got {_describe(value)}")
+        return value
+
+    return check
+
+
+def _compile_enum(members: list[Any]) -> _Check:
+    by_key = {_enum_key(m): m for m in members if isinstance(m, str)}
+    listed = ", ".join(str(m) for m in members[:_MAX_LISTED_ENUM])
+    if len(members) > _MAX_LISTED_ENUM:
+        listed += ", ..."
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if value in members:
+            return value
+        if isinstance(value, str) and _enum_key(value) in by_key:
+            return by_key[_enum_key(value)]
+        errors.append(f"{_name(path)} must be one of {listed}, got {_describe(value)}")
+        return value
+
+    return check
+
+
+def _compile_object(schema: dict) -> _Check:
+    properties = {
+        name: (_compile(sub), _allows_null(sub))
+        for name, sub in (schema.get("properties") or {}).items()
+    }
+    required = tuple(schema.get("required") or ())
+    additional = schema.get("additionalProperties", True)
+    additional_check = _compile(additional) if isinstance(additional, dict) else None
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, dict):
+            return value  # Reported by the type check
+        result = {}
+        for key, item in value.items():
+            item_path = f"{path}.{key}" if path else key
+            if key in properties:
+                sub_check, nullable = properties[key]
+                if item is None and not nullable:
+                    continue  # Sent as null: default if optional, else missing
+                result[key] = sub_check(item, item_path, errors)
+            elif additional is False:
+                errors.append(f"unexpected argument {item_path!r}")
+            elif additional_check is not None:
+                result[key] = additional_check(item, item_path, errors)
+            else:
+                result[key] = item
+        missing = [key for key in required if key not in result]
+        if missing:
+            names = ", ".join(repr(f"{path}.{key}" if path else key) for key in missing)
+            errors.append(f"missing required argument{'s' if len(missing) > 1 else ''} {names}")
+        return result
+
+    return check
+
+
+def _compile_array(schema: dict) -> _Check:
+    items = schema.get("items")
+    item_check = _compile(items) if isinstance(items, dict) else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, list):
+            return value  # Reported by the type check
+        if item_check is not None:
+            value = [item_check(item, f"{path}[{i}]", errors) for i, item in enumerate(value)]
+        if min_items is not None and len(value) < min_items:
+            errors.append(f"{_name(path)} needs at least {min_items} item(s)")
+        if max_items is not None and len(value) > max_items:
+            errors.append(f"{_name(path)} allows at most {max_items} item(s)")
+        return value
+
+    return check
+
+
+def _compile_range(schema: dict) -> _Check:
+    bounds = []
+    if isinstance(schema.get("minimum"), (int, float)):
+        bounds.append((lambda v, b: v >= b, schema["minimum"], "at least"))
+    if isinstance(schema.get("maximum"), (int, float)):
+        bounds.append((lambda v, b: v <= b, schema["maximum"], "at most"))
+    if isinstance(schema.get("exclusiveMinimum"), (int, float)):
+        bounds.append((lambda v, b: v > b, schema["exclusiveMinimum"], "greater than"))
+    if isinstance(schema.get("exclusiveMaximum"), (int, float)):
+        bounds.append((lambda v, b: v < b, schema["exclusiveMaximum"], "less than"))
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return value
+        for ok, bound, words in bounds:
+            if not ok(value, bound):
+                errors.append(f"{_name(path)} must be {words} {bound:g}, got {value:g}")
+                break
+        return value
+
+    return check
+
+
+def _compile_string(schema: dict) -> _Check:
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    try:
+        pattern = re.compile(schema["pattern"]) if schema.get("pattern") else None
+    except re.error:
+        pattern = None
+
+    def check(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, str):
+            return value
+        if min_length is not None and len(value) < min_length:
+            errors.append(f"{_name(path)} must have at least {min_length} character(s)")
+        elif max_length is not None and len(value) > max_length:
+            errors.append(f"{_name(path)} must have at most {max_length} character(s)")
+        elif pattern is not None and not pattern.search(value):
+            errors.append(f"{_name(path)} must match {pattern.pattern!r}, got {value!r}")
+        return value
+
+    return check
+
+
+_INVALID = object()
+
+_TYPE_NAMES = {
+    "integer": "an integer",
+    "number": "a number",
+    "string": "a string",
+    "boolean": "a boolean",
+    "object": "an object",
+    "array": "an array",
+    "null": "null",
+}
+
+
+def _is_type(value: Any, type_name: str) -> bool:
+    if type_name == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if type_name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, list)
+    if type_name == "null":
+        return value is None
+    return True  # Unknown type name: don't reject
+
+
+def _coerce(value: Any, type_name: str) -> Any:
+    """value converted to type_name, or _INVALID if that would be a guess."""
+    if isinstance(value, str):
+        text = value.strip()
+        if type_name == "integer":
+            number = _number(text)
+            if number is not None and float(number).is_integer():
+                return int(number)
+        elif type_name == "number":
+            number = _number(text)
+            if number is not None:
+                return number
+        elif type_name == "boolean":
+            if text.lower() in _TRUE_VALUES:
+                return True
+            if text.lower() in _FALSE_VALUES:
+                return False
+        elif type_name == "object":
+            decoded = _json_value(text, dict)
+            if decoded is not None:
+                return decoded
+        elif type_name == "array":
+            decoded = _json_value(text, list)
+            return [value] if decoded is None else decoded
+        elif type_name == "null" and text.lower() in ("", "null", "none"):
+            return None
+        return _INVALID
+
+    if isinstance(value, bool):
+        return _INVALID if type_name != "array" else [value]
+    if isinstance(value, (int, float)):
+        if type_name == "integer" and float(value).is_integer():
+            return int(value)
+        if type_name == "number":
+            return value
+        if type_name == "string":
+            return str(int(value)) if float(value).is_integer() else str(value)
+        if type_name == "boolean" and value in (0, 1):
+            return bool(value)
+    if type_name == "array" and value is not None and not isinstance(value, list):
+        return [value]
+    return _INVALID
+
+
+def _number(text: str) -> int | float | None:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if number == number and abs(number) != float("inf") else None
+
+
+def _json_value(text: str, kind: type) -> Any:
+    try:
+        decoded = json.loads(text)
+    except ValueError:
+        return None
+    return decoded if isinstance(decoded, kind) else None
+
+
+def _allows_null(schema: Any) -> bool:
+    if not isinstance(schema, dict):
+        return True
+    types = schema.get("type")
+    if types is None:
+        branches = schema.get("anyOf") or schema.get("oneOf") or ()
+        return not branches or any(_allows_null(b) for b in branches)
+    return "null" in ((types,) if isinstance(types, str) else types)
+
+
+def _enum_key(value: str) -> str:
+    return re.sub(r"[\s-]+", "_", value.strip().lower())
+
+
+def _name(path: str) -> str:
+    return repr(path) if path else "arguments"
+
+
+def _describe(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= 60 else text[:57] + "..."
@@ -0,0 +1,141 @@
+"""Latency budget for one conversation turn.
+
+A turn can chain several tool rounds, and a slow n8n workflow or MCP server
+leaves the user in silence until it returns. TurnBudget bounds the turn:
+
+    - soft deadline: while tools are still running after filler_after
+      seconds, a short "still working" phrase is spoken, then another every
+      filler_interval seconds (at most one per phrase in the language)
+    - hard deadline: tool calls are cut off when the turn has run for
+      deadline seconds, and the model gets a timeout result so it can answer
+      with what it already has. No new tool round starts after it.
+
+Usage:
+    budget = TurnBudget(deadline=20.0, filler_after=3.0, language="fr")
+    timeout = budget.tool_timeout(30.0)   # min(per-tool timeout, time left)
+    phrase = budget.next_filler()         # "Un instant, je m'en occupe."
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["FILLER_PHRASES", "TurnBudget"]
+
+# Progressive "still working" phrases per language, spoken in order
+FILLER_PHRASES: dict[str, tuple[str, ...]] = {
+    "en": (
+        "One moment, I'm working on it.",
+        "Still working on it.",
+        "Almost there, thanks for waiting.",
+    ),
+    "fr": (
+        "Un instant, je m'en occupe.",
+        "Je travaille encore dessus.",
+        "J'y suis presque, merci de patienter.",
+    ),
+    "it": (
+        "Un attimo, ci sto lavorando.",
+        "Ci sto ancora lavorando.",
+        "Ci siamo quasi, grazie per l'attesa.",
+    ),
+}
+
+_TIMEOUT_RESULT = (
+    "Tool {tool} did not finish within this turn's time limit and was stopped. "
+    "Answer with the information you already have and tell the user this "
+    "result is not available right now."
+)
+
+
+class TurnBudget:
+    """Soft and hard deadlines of one turn, measured from its creation.
+
+    Args:
+        deadline: Seconds before tool calls are cut off (None = no limit)
+        filler_after: Seconds of tool execution before the first filler
+            phrase (None = never speak fillers)
+        filler_interval: Seconds between later filler phrases (defaults to
+            twice filler_after)
+        language: ISO 639-1 code selecting the filler phrases
+    """
+
+    def __init__(
+        self,
+        deadline: float | None = 20.0,
+        filler_after: float | None = 3.0,
+        filler_interval: float | None = None,
+        language: str = "en",
+    ) -> None:
+        self._start = time.monotonic()
+        self.deadline = deadline if deadline and deadline > 0 else None
+        self.filler_after = filler_after if filler_after and filler_after > 0 else None
+        self.filler_interval = filler_interval or (
+            self.filler_after * 2 if self.filler_after else None
+        )
+        self._phrases = FILLER_PHRASES.get(language, FILLER_PHRASES["en"])
+        self._fillers_spoken = 0
+        self._next_filler_at: float | None = None
+
+    def elapsed(self) -> float:
+        """Seconds since the turn started."""
+        return time.monotonic() - self._start
+
+    def remaining(self) -> float | None:
+        """Seconds left before the hard deadline (None = no limit)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.elapsed())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def tool_timeout(self, tool_timeout: float | None) -> float | None:
+        """Timeout for a tool call started now: the per-tool timeout or the
+        time left in the turn, whichever is shorter."""
+        remaining = self.remaining()
+        if remaining is None:
+            return tool_timeout
+        if tool_timeout is None:
+            return remaining
+        return min(tool_timeout, remaining)
+
+    def is_deadline_bound(self, tool_timeout: float | None) -> bool:
+        """Whether a call started now is cut off by the turn deadline rather
+        than by its own timeout."""
+        remaining = self.remaining()
+        return remaining is not None and (tool_timeout is None or remaining < tool_timeout)
+
+    def timeout_result(self, tool_name: str) -> str:
+        """Tool result telling the model to answer without this tool."""
+        return _TIMEOUT_RESULT.format(tool=tool_name)
+
+    def start_waiting(self) -> None:
+        """Tools started running: schedule the next filler phrase."""
+        if self.filler_after is None or self._fillers_spoken >= len(self._phrases):
+            self._next_filler_at = None
+            return
+        delay = self.filler_after if not self._fillers_spoken else self.filler_interval
+        self._next_filler_at = time.monotonic() + delay
+
+    def until_filler(self) -> float | None:
+        """Seconds until the next filler phrase is due (None = no more)."""
+        if self._next_filler_at is None:
+            return None
+        return max(0.0, self._next_filler_at - time.monotonic())
+
+    def next_filler(self) -> str | None:
+        """Take the next filler phrase and schedule the one after it."""
+        if self._fillers_spoken >= len(self._phrases):
+            self._next_filler_at = None
+            return None
+        phrase = self._phrases[self._fillers_spoken]
+        self._fillers_spoken += 1
+        self.start_waiting()
+        logger.info(f"Tools still running after {self.elapsed():.1f}s: filler {phrase!r}")
+        return phrase
@@ -207,3 +207,36 @@ def parse_sticky_note_registry_info(workflow_nodes: list[dict]) -> CacheEntry:
 
     # No sticky note found = custom workflow
     return {"registry_id": None, "version": None}
+
+
+def parse_sticky_note_annotations(workflow_nodes: list[dict]) -> dict[str, str]:
+    """Parse CAAL tool annotations from workflow sticky notes.
+
+    Annotations are "**key:** value" lines in any sticky note, e.g.:
+
+        **cache_ttl:** 60
+
+    Keys are lowercased. If a key appears in several notes, the first wins.
+
+    Args:
+        workflow_nodes: List of workflow nodes from n8n
+
+    Returns:
+        Dict of annotation key -> raw string value (empty if none found)
+    """
+    annotations: dict[str, str] = {}
+    for node in workflow_nodes:
+        if node.get("type") != "n8n-nodes-base.stickyNote":
+            continue
+
+        content = node.get("parameters", {}).get("content", "")
+        for line in content.split("\n"):
+            line = line.strip()
+            if not line.startswith("**") or ":**" not in line:
+                continue
+            key, _, value = line[2:].partition(":**")
+            key = key.strip().lower()
+            if key and key not in annotations:
+                annotations[key] = value.strip()
+
+    return annotations
@@ -76,6 +76,8 @@ DEFAULT_SETTINGS = {
     # TTS settings - voice selection (Kokoro uses voice param, Piper bakes voice into model)
     "tts_voice_kokoro": "am_puck",
     "tts_voice_piper": "speaches-ai/piper-en_US-ryan-high",
+    # Group streamed text into clause/sentence segments before TTS (one request each)
+    "tts_aggregation": True,
     "temperature": 0.15,
     # Ollama settings
     "ollama_host": "http://localhost:11434",
@@ -96,6 +98,57 @@ DEFAULT_SETTINGS = {
     # Shared settings
     "max_turns": 20,
     "tool_cache_size": 3,
+    "tool_cache_max_chars": 4000,  # Budget for the injected tool data block (~1k tokens)
+    "tool_concurrency": 4,  # Max tool calls executed in parallel per round
+    "tool_timeout": 30.0,  # Seconds before a single tool call is abandoned
+    # Tools (names or fnmatch patterns) aborted mid-call on barge-in; other
+    # tools finish in the background so actions are never left half-done
+    "cancel_safe_tools": ["hass_get_state", "web_search"],
+    # Turn latency budget (seconds, 0 = off): a "still working" phrase is
+    # spoken once tools run past tool_filler_after, and tool calls are cut
+    # off at turn_deadline so the model answers with what it has
+    "turn_deadline": 20.0,
+    "tool_filler_after": 3.0,
+    # Tools (names or fnmatch patterns) run as background jobs and announced
+    # when done; n8n workflows can opt in with an "**async:** true" sticky note
+    "async_tools": [],
+    "tool_job_concurrency": 2,
+    "tool_job_timeout": 600.0,
+    # Match simple device commands ("turn off the kitchen lights") with a
+    # pattern table and call hass_control directly, skipping the LLM
+    "intent_fast_path": True,
+    # When every tool call of a round succeeds and has a response template,
+    # speak the templates instead of a follow-up LLM round. hass_control has
+    # built-in templates; add {"tool_name": "Template {field}."} here or a
+    # "**response_template:**" sticky note on an n8n workflow
+    "templated_responses": True,
+    "response_templates": {},
+    # Check tool call arguments against the tool schemas before execution:
+    # unambiguous mistakes ("5" for an integer) are fixed, others are answered
+    # with a precise error without calling n8n, MCP or Home Assistant
+    "validate_tool_arguments": True,
+    # Result cache for idempotent tools: tool name or fnmatch pattern -> TTL seconds.
+    # n8n workflows can also opt in with a "**cache_ttl:** 60" sticky note line.
+    "tool_result_cache_ttls": {"hass_get_state": 5, "web_search": 300},
+    "tool_result_cache_size": 128,
+    # Tool result reduction before results enter the prompt. Per-tool policies
+    # (name or fnmatch pattern) accept max_chars, fields, max_items, summarize.
+    "tool_result_max_chars": 4000,
+    "tool_result_policies": {"hass_get_state": {"max_chars": 6000}},
+    "tool_result_summarize": False,  # LLM-summarize oversized results instead of truncating
+    # Tool subsetting: advertise the top-k tools relevant to the request (0 = all)
+    # plus the always-on tools and tools used recently
+    "tool_top_k": 8,
+    "tool_always_on": ["hass_control", "hass_get_state", "web_search"],
+    # Context window budget (tokens). 0 = derive from provider (Ollama num_ctx);
+    # history is filled newest-first until the budget is used up
+    "context_budget_tokens": 0,
+    "response_token_reserve": 512,  # Tokens kept free for the reply
+    # Message layout: "default", or "stable_prefix" to keep the prompt prefix
+    # identical across turns so local LLM servers can reuse their KV cache
+    "prompt_layout": "default",
+    # Per-turn latency traces (latency_traces.jsonl, GET /latency)
+    "latency_tracing": True,
     # Wake word detection (server-side OpenWakeWord)
     "wake_word_enabled": True,
     "wake_word_model": "models/hey_jarvis.onnx",
@@ -111,6 +164,13 @@ DEFAULT_SETTINGS = {
     # OpenRouter settings (cloud API)
     "openrouter_api_key": "",     # OpenRouter API key (required for openrouter provider)
     "openrouter_model": "",       # Model name (empty = use default)
+    # LLM failover: providers tried in order when llm_provider is down or slow
+    "llm_fallback_providers": [],  # e.g. ["groq", "openrouter"]
+    "llm_ttft_deadline": 5.0,     # Seconds to first token before failing over
+    "llm_hedge": False,           # Race the next provider instead of cancelling
+    # Parallel requests per local LLM server (0 = OLLAMA_NUM_PARALLEL, or 4);
+    # queued requests are served user turns first, background summaries last
+    "llm_max_concurrency": 0,
 }
 
 # Per-language Piper TTS voice mapping
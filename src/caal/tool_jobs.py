@@ -0,0 +1,293 @@
+"""Background execution of long-running tools.
+
+Some n8n workflows take minutes (reports, downloads). Run inline, they hold
+the conversation turn until they finish. Tools marked async run as jobs
+instead: the tool call returns an acknowledgement right away, the workflow
+runs in the background, and the agent announces the result when it is done.
+
+A tool runs as a job when it matches the async_tools setting (names or
+fnmatch patterns) or its n8n workflow has an "**async:** true" sticky note
+annotation.
+
+Job state changes are appended as JSON lines to the jobs file
+(CAAL_JOBS_PATH). Agent sessions run in LiveKit worker subprocesses, so the
+webhook API (GET /jobs) reads job status from that file with load_jobs().
+
+Usage:
+    jobs = ToolJobManager(max_concurrent=2, on_complete=announce)
+    job = jobs.submit("n8n_monthly_report", {}, lambda: run_workflow(...))
+    ack = job.acknowledgement()   # tool result for the model
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["JOBS_PATH", "ToolJob", "ToolJobManager", "load_jobs"]
+
+# Path - same directory as settings.json
+_SCRIPT_DIR = Path(__file__).parent.parent.parent  # src/caal -> project root
+JOBS_PATH = Path(os.getenv("CAAL_JOBS_PATH", _SCRIPT_DIR / "tool_jobs.jsonl"))
+
+# Jobs file is rotated to <name>.1 beyond this size
+MAX_JOBS_BYTES = 1024 * 1024
+
+# Max characters of a job result kept in the jobs file
+_MAX_RESULT_CHARS = 2000
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+# Job states change on the session's event loop: they are written (and the
+# file rotated) by one thread, which keeps each job's states in order
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="caal-jobs")
+
+# Spoken when a finished job has no "message" of its own (n8n convention)
+_ANNOUNCEMENTS: dict[str, dict[str, str]] = {
+    "en": {"succeeded": "{tool} is done.", "failed": "Sorry, {tool} failed."},
+    "fr": {"succeeded": "{tool} est terminé.", "failed": "Désolé, {tool} a échoué."},
+    "it": {"succeeded": "{tool} è terminato.", "failed": "Mi dispiace, {tool} non è riuscito."},
+}
+
+
+class ToolJob:
+    """One background tool execution."""
+
+    def __init__(self, tool_name: str, arguments: dict) -> None:
+        self.job_id = uuid.uuid4().hex[:12]
+        self.tool_name = tool_name
+        self.arguments = arguments
+        self.status = "queued"  # queued | running | succeeded | failed
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.result: Any = None
+        self.error: str | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def acknowledgement(self) -> str:
+        """Tool result given to the model when the job is started."""
+        return (
+            f"Started {self.tool_name} as background job {self.job_id}. It may take "
+            "a few minutes. Tell the user it is running and that you will let "
+            "them know when it is done."
+        )
+
+    def announcement(self, language: str = "en") -> str:
+        """What to say when the job is done: the workflow's own "message",
+        or a short localized status line."""
+        if self.status == "succeeded" and isinstance(self.result, dict):
+            message = self.result.get("message")
+            if isinstance(message, str) and message.strip():
+                return message
+        templates = _ANNOUNCEMENTS.get(language, _ANNOUNCEMENTS["en"])
+        template = templates["succeeded" if self.status == "succeeded" else "failed"]
+        return template.format(tool=self.tool_name.replace("_", " "))
+
+    def to_dict(self) -> dict[str, Any]:
+        result = self.result
+        if result is not None:
+            text = result if isinstance(result, str) else json.dumps(
+                result, ensure_ascii=False, default=str
+            )
+            if len(text) > _MAX_RESULT_CHARS:
+                result = text[: _MAX_RESULT_CHARS - 3] + "..."
+        return {
+            "job_id": self.job_id,
+            "tool": self.tool_name,
+            "arguments": self.arguments,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": result,
+            "error": self.error,
+        }
+
+
+class ToolJobManager:
+    """Runs async tools in the background with bounded concurrency.
+
+    Args:
+        async_tools: Tool names (or fnmatch patterns) always run as jobs
+        annotation_resolver: Optional lookup of a tool's annotations (e.g.
+            n8n sticky notes); tools annotated "async: true" run as jobs
+        max_concurrent: Jobs running at once (others wait in the queue)
+        timeout: Seconds before a running job is abandoned (None = no limit)
+        on_complete: Coroutine called with each finished job (announcement)
+        path: JSONL jobs file (None = don't persist job state)
+        history: Finished jobs kept in memory
+    """
+
+    def __init__(
+        self,
+        async_tools: Collection[str] = (),
+        annotation_resolver: Callable[[str], dict[str, str]] | None = None,
+        max_concurrent: int = 2,
+        timeout: float | None = 600.0,
+        on_complete: Callable[[ToolJob], Awaitable[None]] | None = None,
+        path: Path | None = JOBS_PATH,
+        history: int = 50,
+    ) -> None:
+        self._async_tools = tuple(async_tools)
+        self._annotation_resolver = annotation_resolver
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._timeout = timeout
+        self._on_complete = on_complete
+        self._path = path
+        self._jobs: dict[str, ToolJob] = {}
+        self._finished: deque[str] = deque(maxlen=history)
+        self._tasks: set[asyncio.Task] = set()
+
+    def is_async(self, tool_name: str) -> bool:
+        """Whether calls to a tool run as background jobs."""
+        if any(fnmatch.fnmatchcase(tool_name, pattern) for pattern in self._async_tools):
+            return True
+        if self._annotation_resolver is not None:
+            value = self._annotation_resolver(tool_name).get("async", "")
+            return value.strip().lower() in _TRUE_VALUES
+        return False
+
+    def submit(
+        self, tool_name: str, arguments: dict, call: Callable[[], Awaitable[Any]]
+    ) -> ToolJob:
+        """Start a tool call in the background.
+
+        Args:
+            tool_name: Tool being called
+            arguments: Tool arguments
+            call: Zero-argument coroutine function executing the tool
+
+        Returns:
+            The queued job
+        """
+        job = ToolJob(tool_name, arguments)
+        self._jobs[job.job_id] = job
+        self._record(job)
+        logger.info(f"Job {job.job_id}: queued {tool_name} with args: {arguments}")
+
+        task = asyncio.create_task(self._run(job, call))
+        # Keep a reference so the task is not garbage collected mid-run
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> ToolJob | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ToolJob]:
+        """Jobs of this session, oldest first."""
+        return list(self._jobs.values())
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running."""
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    async def aclose(self) -> None:
+        """Cancel jobs still queued or running (e.g. the session ended)."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, job: ToolJob, call: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                self._record(job)
+                try:
+                    job.result = await asyncio.wait_for(call(), timeout=self._timeout)
+                    job.status = "succeeded"
+                except asyncio.TimeoutError:
+                    job.error = f"timed out after {self._timeout:g}s"
+                    job.status = "failed"
+                except Exception as e:
+                    job.error = str(e) or type(e).__name__
+                    job.status = "failed"
+        except asyncio.CancelledError:
+            job.error = "cancelled"
+            job.status = "failed"
+            job.finished_at = time.time()
+            self._record(job)
+            raise
+
+        job.finished_at = time.time()
+        self._record(job)
+        self._forget_old(job)
+        elapsed = job.finished_at - (job.started_at or job.created_at)
+        if job.error is None:
+            logger.info(f"Job {job.job_id}: {job.tool_name} succeeded in {elapsed:.1f}s")
+        else:
+            logger.warning(f"Job {job.job_id}: {job.tool_name} failed: {job.error}")
+
+        if self._on_complete is not None:
+            try:
+                await self._on_complete(job)
+            except Exception as e:
+                logger.error(f"Job {job.job_id}: completion callback failed: {e}")
+
+    def _forget_old(self, job: ToolJob) -> None:
+        if len(self._finished) == self._finished.maxlen:
+            self._jobs.pop(self._finished[0], None)
+        self._finished.append(job.job_id)
+
+    def _record(self, job: ToolJob) -> None:
+        if self._path is not None:
+            _writer.submit(_append_job, self._path, job.to_dict())
+
+
+def _append_job(path: Path, data: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > MAX_JOBS_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+        with open(path, "a") as f:
+            f.write(json.dumps(data, default=str) + "\n")
+    except Exception as e:
+        logger.warning(f"Failed to write job state: {e}")
+
+
+def load_jobs(path: Path = JOBS_PATH, limit: int | None = 50) -> list[dict[str, Any]]:
+    """Latest state of the most recent jobs in a jobs file.
+
+    Args:
+        path: JSONL jobs file
+        limit: Max jobs returned (None = every job in the file)
+
+    Returns:
+        Job dicts (ToolJob.to_dict() format), most recently updated first
+    """
+    if not path.exists():
+        return []
+
+    latest: dict[str, dict[str, Any]] = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+                job_id = data["job_id"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            # Later lines are later states: move the job to the end
+            latest.pop(job_id, None)
+            latest[job_id] = data
+
+    jobs = list(reversed(latest.values()))
+    return jobs if limit is None else jobs[:limit]
@@ -0,0 +1,254 @@
+"""Per-turn latency tracing.
+
+Each user turn gets a TurnTrace. Pipeline stages record timed spans
+(message build, tool discovery, each LLM round, each tool call) and
+one-off marks measured from the start of the turn (first streamed text,
+first TTS audio frame). Finished turns are:
+
+- added to rolling per-stage histograms (p50/p95/p99) in this process
+- appended as one JSON line to the trace file (CAAL_TRACE_PATH)
+
+Agent jobs run in LiveKit worker subprocesses, while the webhook API runs
+in the main process. The API therefore computes its histograms from the
+trace file with load_latency_stats().
+
+Histogram stages:
+    stt                  - STT transcription delay (from LiveKit EOU metrics)
+    message_build        - chat_ctx -> provider messages
+    tool_discovery       - tool list discovery and subsetting
+    llm_ttft / llm_total - per provider round: first chunk / whole round
+    tool                 - each tool execution
+    first_text           - turn start -> first text streamed to TTS
+    first_audio          - turn start -> first TTS audio frame
+    turn_total           - turn start -> turn finished
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_WINDOW",
+    "LatencyHistograms",
+    "TRACE_PATH",
+    "TurnTrace",
+    "TurnTracer",
+    "load_latency_stats",
+]
+
+# Path - same directory as settings.json
+_SCRIPT_DIR = Path(__file__).parent.parent.parent  # src/caal -> project root
+TRACE_PATH = Path(os.getenv("CAAL_TRACE_PATH", _SCRIPT_DIR / "latency_traces.jsonl"))
+
+# Trace file is rotated to <name>.1 beyond this size
+MAX_TRACE_BYTES = 5 * 1024 * 1024
+
+# Samples kept per stage for percentiles
+DEFAULT_WINDOW = 500
+
+PERCENTILES = (50, 95, 99)
+
+# Turns finish on a session's event loop: trace lines are written (and the
+# file rotated) by one thread, which also keeps them in order
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="caal-trace")
+
+
+class TurnTrace:
+    """Spans and marks for one user turn.
+
+    Times are milliseconds relative to the start of the turn.
+    """
+
+    def __init__(self, source: str = "user") -> None:
+        self.turn_id = uuid.uuid4().hex[:12]
+        self.source = source
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self.marks: dict[str, float] = {}
+        self.durations: dict[str, float] = {}
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the turn started."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def mark(self, name: str) -> None:
+        """Record the first time a point in the turn is reached."""
+        if name not in self.marks:
+            self.marks[name] = round(self.elapsed_ms(), 1)
+
+    def add_span(
+        self, name: str, start: float, end: float | None = None, **attrs: Any
+    ) -> None:
+        """Record a span from perf_counter() timestamps.
+
+        Args:
+            name: Stage name
+            start: time.perf_counter() at span start
+            end: time.perf_counter() at span end (default: now)
+            **attrs: Extra fields (tool name, ttft_ms, ...)
+        """
+        end = time.perf_counter() if end is None else end
+        self.spans.append({
+            "name": name,
+            "start_ms": round((start - self._start) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+            **attrs,
+        })
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+        """Time a block as a span. The yielded dict adds attributes."""
+        start = time.perf_counter()
+        extra: dict[str, Any] = {}
+        try:
+            yield extra
+        finally:
+            self.add_span(name, start, **attrs, **extra)
+
+    def set_duration(self, name: str, duration_ms: float) -> None:
+        """Record a stage duration measured elsewhere (e.g. STT metrics)."""
+        self.durations[name] = round(duration_ms, 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "turn_id": self.turn_id,
+            "source": self.source,
+            "timestamp": self.started_at,
+            "total_ms": round(self.elapsed_ms(), 1),
+            "durations": self.durations,
+            "marks": self.marks,
+            "spans": self.spans,
+        }
+
+
+class LatencyHistograms:
+    """Rolling per-stage latency samples with percentile summaries."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, stage: str, ms: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self._window)
+        samples.append(ms)
+
+    def record_trace(self, data: dict[str, Any]) -> None:
+        """Add every stage of a finished turn (TurnTrace.to_dict() format)."""
+        for name, ms in data.get("durations", {}).items():
+            self.record(name, ms)
+        for span in data.get("spans", []):
+            self.record(span["name"], span["duration_ms"])
+            if "ttft_ms" in span:
+                self.record("llm_ttft", span["ttft_ms"])
+        for name, ms in data.get("marks", {}).items():
+            self.record(name, ms)
+        self.record("turn_total", data.get("total_ms", 0.0))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-stage count and p50/p95/p99 in milliseconds."""
+        result = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            stats: dict[str, float] = {"count": len(ordered)}
+            for p in PERCENTILES:
+                stats[f"p{p}"] = _percentile(ordered, p)
+            result[stage] = stats
+        return result
+
+
+class TurnTracer:
+    """Tracks the current turn of one session and records finished turns.
+
+    Args:
+        path: JSONL trace file (None = don't write traces)
+        window: Samples kept per stage for the in-process histograms
+    """
+
+    def __init__(self, path: Path | None = TRACE_PATH, window: int = DEFAULT_WINDOW) -> None:
+        self._path = path
+        self.current: TurnTrace | None = None
+        self.histograms = LatencyHistograms(window)
+
+    def start_turn(self, source: str = "user") -> TurnTrace:
+        """Finish the current turn (if any) and start a new one.
+
+        A turn with no spans or marks yet (e.g. a transcript that arrived in
+        several final segments) is replaced without being recorded.
+        """
+        if self.current is not None and not (self.current.spans or self.current.marks):
+            self.current = None
+        self.finish_turn()
+        self.current = TurnTrace(source)
+        return self.current
+
+    def finish_turn(self) -> None:
+        """Record the current turn and clear it."""
+        trace, self.current = self.current, None
+        if trace is None:
+            return
+        data = trace.to_dict()
+        self.histograms.record_trace(data)
+        logger.debug(f"Turn {trace.turn_id}: {data['marks']} in {data['total_ms']:.0f}ms")
+        if self._path is not None:
+            _writer.submit(_append_trace, self._path, data)
+
+
+def _append_trace(path: Path, data: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > MAX_TRACE_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+        with open(path, "a") as f:
+            f.write(json.dumps(data) + "\n")
+    except Exception as e:
+        logger.warning(f"Failed to write latency trace: {e}")
+
+
+def load_latency_stats(
+    path: Path = TRACE_PATH, window: int = DEFAULT_WINDOW
+) -> dict[str, dict[str, float]]:
+    """Compute per-stage percentiles from the last turns in a trace file.
+
+    Args:
+        path: JSONL trace file
+        window: Number of most recent turns to include
+
+    Returns:
+        Per-stage count and p50/p95/p99 in milliseconds
+    """
+    histograms = LatencyHistograms(window=window * 8)
+    if not path.exists():
+        return {}
+
+    with open(path) as f:
+        lines = deque(f, maxlen=window)
+
+    for line in lines:
+        try:
+            histograms.record_trace(json.loads(line))
+        except (ValueError, KeyError, TypeError):
+            continue
+    return histograms.summary()
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
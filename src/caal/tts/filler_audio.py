@@ -0,0 +1,127 @@
+"""Filler phrases spoken outside the agent's reply.
+
+"Still working on it" phrases are due while tools run, in the middle of a
+reply's generation. As part of the reply text they would be stored in the
+chat history and sent back to the model on later turns, and session.say()
+would queue them behind the very reply they are meant to cover. FillerAudio
+synthesizes them with the session's TTS and plays them on a separate
+background audio track, so they are heard right away and never reach the
+chat context.
+
+Usage:
+    fillers = FillerAudio()
+    await fillers.start(ctx.room, session.tts)
+    fillers.say("One moment, I'm working on it.")
+    await fillers.wait()  # Before the reply is heard
+    fillers.stop()        # On interruption
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from livekit import rtc
+from livekit.agents import APIConnectOptions, BackgroundAudioPlayer, tts
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+from livekit.agents.voice.background_audio import PlayHandle
+
+from .segmented import synthesize_segments
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["FillerAudio"]
+
+# BackgroundAudioPlayer mixes 48kHz mono audio
+_SAMPLE_RATE = 48000
+
+# Longest wait for a filler to finish before the reply is heard
+_MAX_WAIT = 5.0
+
+
+class FillerAudio:
+    """Speaks filler phrases on a background track of the room."""
+
+    def __init__(self) -> None:
+        self._player: BackgroundAudioPlayer | None = None
+        self._tts: tts.TTS | None = None
+        self._conn_options = DEFAULT_API_CONNECT_OPTIONS
+        self._handles: list[PlayHandle] = []
+
+    @property
+    def active(self) -> bool:
+        """Whether phrases can be spoken (started, with a TTS)."""
+        return self._player is not None and self._tts is not None
+
+    async def start(
+        self,
+        room: rtc.Room,
+        tts_instance: tts.TTS | None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+    ) -> None:
+        """Publish the background track and use tts_instance for phrases."""
+        if tts_instance is None:
+            return
+        player = BackgroundAudioPlayer()
+        await player.start(room=room)
+        self._player = player
+        self._tts = tts_instance
+        self._conn_options = conn_options
+
+    def say(self, phrase: str) -> None:
+        """Start speaking a phrase (returns immediately)."""
+        if self._player is None or self._tts is None:
+            logger.debug(f"Filler audio not started, skipping {phrase!r}")
+            return
+        self._handles = [h for h in self._handles if not h.done()]
+        self._handles.append(self._player.play(self._frames(phrase)))
+
+    async def wait(self, timeout: float = _MAX_WAIT) -> None:
+        """Wait for phrases being spoken to finish (stopped after timeout)."""
+        pending = [h.wait_for_playout() for h in self._handles if not h.done()]
+        if not pending:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop phrases being spoken."""
+        for handle in self._handles:
+            handle.stop()
+        self._handles.clear()
+
+    async def aclose(self) -> None:
+        """Stop speaking and unpublish the background track."""
+        self.stop()
+        player, self._player = self._player, None
+        if player is not None:
+            await player.aclose()
+
+    async def _frames(self, phrase: str) -> AsyncIterator[rtc.AudioFrame]:
+        """Synthesized phrase, resampled for the background mixer."""
+
+        async def segments() -> AsyncIterator[str]:
+            yield phrase
+
+        resampler: rtc.AudioResampler | None = None
+        try:
+            async for frame in synthesize_segments(
+                self._tts, segments(), conn_options=self._conn_options
+            ):
+                if frame.sample_rate == _SAMPLE_RATE:
+                    yield frame
+                    continue
+                if resampler is None:
+                    resampler = rtc.AudioResampler(
+                        frame.sample_rate, _SAMPLE_RATE, num_channels=frame.num_channels
+                    )
+                for resampled in resampler.push(frame):
+                    yield resampled
+            if resampler is not None:
+                for resampled in resampler.flush():
+                    yield resampled
+        except Exception as e:
+            logger.warning(f"Filler phrase synthesis failed: {e}")
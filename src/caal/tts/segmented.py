@@ -0,0 +1,72 @@
+"""Per-segment synthesis for non-streaming TTS.
+
+Each text segment becomes one `synthesize()` request. The next segment's
+request is started while the current one is playing, so audio for a reply
+arrives back-to-back instead of paying a full round-trip between segments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+
+from livekit import rtc
+from livekit.agents import APIConnectOptions, tts
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["synthesize_segments"]
+
+
+async def synthesize_segments(
+    tts_instance: tts.TTS,
+    segments: AsyncIterable[str],
+    conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+    prefetch: int = 1,
+) -> AsyncIterator[rtc.AudioFrame]:
+    """Synthesize text segments in order, one TTS request per segment.
+
+    Args:
+        tts_instance: TTS to synthesize with
+        segments: Speakable text segments (e.g. from aggregate_speech)
+        conn_options: Connection options for each request
+        prefetch: Requests started ahead of the one being played
+
+    Yields:
+        Audio frames, in segment order
+    """
+    streams: asyncio.Queue[tts.ChunkedStream | None] = asyncio.Queue()
+    in_flight = asyncio.Semaphore(prefetch + 1)
+    request_count = 0
+
+    async def _produce() -> None:
+        nonlocal request_count
+        try:
+            async for segment in segments:
+                await in_flight.acquire()
+                streams.put_nowait(
+                    tts_instance.synthesize(segment, conn_options=conn_options)
+                )
+                request_count += 1
+        finally:
+            streams.put_nowait(None)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while (stream := await streams.get()) is not None:
+            async with stream:
+                async for audio in stream:
+                    yield audio.frame
+            in_flight.release()
+        await producer  # Surface errors from the text stream
+        logger.debug(f"Segmented TTS: {request_count} request(s)")
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await producer
+        while not streams.empty():
+            if (stream := streams.get_nowait()) is not None:
+                await stream.aclose()
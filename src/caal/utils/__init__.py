@@ -3,6 +3,7 @@ Utility functions for voice assistant.
 """
 
 from .formatting import (
+    StreamingTTSSanitizer,
     format_date_speech_friendly,
     format_time_speech_friendly,
     strip_markdown_for_tts,
@@ -10,6 +11,7 @@ from .formatting import (
 
 __all__ = [
     "strip_markdown_for_tts",
+    "StreamingTTSSanitizer",
     "format_date_speech_friendly",
     "format_time_speech_friendly",
 ]
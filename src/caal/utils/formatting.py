@@ -3,38 +3,187 @@
 import re
 from datetime import datetime
 
+# Precompiled markdown patterns (applied in order by strip_markdown_for_tts)
+_MARKDOWN_SUBS = [
+    # Remove bold/italic markers: **text**, *text*, __text__, _text_
+    # Handle bold first (** or __), then italic (* or _)
+    (re.compile(r'\*\*(.+?)\*\*'), r'\1'),  # **bold**
+    (re.compile(r'__(.+?)__'), r'\1'),        # __bold__
+    (re.compile(r'\*(.+?)\*'), r'\1'),        # *italic*
+    (re.compile(r'_(.+?)_'), r'\1'),          # _italic_
+    # Remove inline code backticks
+    (re.compile(r'`(.+?)`'), r'\1'),
+    # Remove markdown links [text](url) -> text
+    (re.compile(r'\[([^\]]+)\]\([^)]+\)'), r'\1'),
+    # Remove any remaining standalone asterisks or underscores used as emphasis
+    # (in case of unclosed markdown)
+    (re.compile(r'(?<!\w)\*(?!\w)'), ''),  # standalone *
+    (re.compile(r'(?<!\w)_(?!\w)'), ''),   # standalone _
+    # Convert score patterns (30-23) to "30 to 23" so TTS doesn't say "minus"
+    (re.compile(r'(\d+)-(\d+)'), r'\1 to \2'),
+]
+
 
 def strip_markdown_for_tts(text: str) -> str:
     """Strip markdown formatting that TTS would read aloud.
 
     Removes asterisks, underscores, and other markdown syntax while preserving
-    the actual content for clean TTS output.
+    the actual content for clean TTS output. For streamed text use
+    StreamingTTSSanitizer, which also handles markers split across chunks.
     """
     if not text:
         return text
 
-    # Remove bold/italic markers: **text**, *text*, __text__, _text_
-    # Handle bold first (** or __), then italic (* or _)
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # **bold**
-    text = re.sub(r'__(.+?)__', r'\1', text)       # __bold__
-    text = re.sub(r'\*(.+?)\*', r'\1', text)       # *italic*
-    text = re.sub(r'_(.+?)_', r'\1', text)         # _italic_
+    for pattern, replacement in _MARKDOWN_SUBS:
+        text = pattern.sub(replacement, text)
 
-    # Remove inline code backticks
-    text = re.sub(r'`(.+?)`', r'\1', text)
+    return text
 
-    # Remove markdown links [text](url) -> text
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
 
-    # Remove any remaining standalone asterisks or underscores used as emphasis
-    # (in case of unclosed markdown)
-    text = re.sub(r'(?<!\w)\*(?!\w)', '', text)  # standalone *
-    text = re.sub(r'(?<!\w)_(?!\w)', '', text)   # standalone _
+# Characters that may start markdown the streaming sanitizer has to handle
+_STREAM_SPECIAL = re.compile(r'[*_`\[\-]')
 
-    # Convert score patterns (30-23) to "30 to 23" so TTS doesn't say "minus"
-    text = re.sub(r'(\d+)-(\d+)', r'\1 to \2', text)
+# Longest "[link text]" held back while waiting for a possible "(url)"
+_MAX_LINK_TEXT = 200
 
-    return text
+# Longest "(url" skipped; an unclosed link stops being skipped here or at
+# the first whitespace, so the rest of the reply is still spoken
+_MAX_LINK_URL = 300
+
+
+class StreamingTTSSanitizer:
+    """Incremental markdown stripper for streamed LLM output.
+
+    Unlike running strip_markdown_for_tts on each chunk, this keeps state
+    between chunks, so markers split across chunk boundaries (``**bo`` +
+    ``ld**``, ``30-`` + ``23``) are handled. Only the minimal ambiguous tail
+    is held back; everything else is emitted immediately, and each chunk is
+    processed in a single pass.
+
+    Rules (same intent as strip_markdown_for_tts):
+    - ``*`` / ``_`` runs are dropped unless between two word characters
+      (keeps ``snake_case`` and ``5*3``)
+    - backticks are dropped
+    - ``[text](url)`` becomes ``text`` (the URL skip ends at ``)``, at
+      whitespace, or after _MAX_LINK_URL characters)
+    - ``30-23`` becomes ``30 to 23``
+
+    Usage:
+        sanitizer = StreamingTTSSanitizer()
+        for chunk in stream:
+            yield sanitizer.push(chunk)
+        yield sanitizer.flush()
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._prev = ""  # Last emitted character
+        self._in_url = False  # Skipping the (url) part of a link
+        self._url_skipped = 0  # URL characters skipped so far
+
+    def push(self, chunk: str) -> str:
+        """Feed a chunk and return the text that is safe to speak now."""
+        return self._process(chunk, final=False)
+
+    def flush(self) -> str:
+        """Return any held-back text at the end of the stream and reset."""
+        text = self._process("", final=True)
+        self._pending = ""
+        self._prev = ""
+        self._in_url = False
+        self._url_skipped = 0
+        return text
+
+    def _emit(self, out: list[str], text: str) -> None:
+        if text:
+            out.append(text)
+            self._prev = text[-1]
+
+    def _process(self, chunk: str, final: bool) -> str:
+        text = self._pending + chunk
+        self._pending = ""
+        out: list[str] = []
+        n = len(text)
+        i = 0
+
+        while i < n:
+            if self._in_url:
+                limit = min(n, i + _MAX_LINK_URL - self._url_skipped)
+                stop = i
+                while stop < limit and text[stop] != ")" and not text[stop].isspace():
+                    stop += 1
+                self._url_skipped += stop - i
+                if stop == n:
+                    i = n  # Still inside the URL, drop it
+                    break
+                self._in_url = False
+                self._url_skipped = 0
+                # ")" closes the link; whitespace or the length cap means it
+                # was never closed, so the text from here on is spoken
+                i = stop + 1 if stop < limit and text[stop] == ")" else stop
+                continue
+
+            match = _STREAM_SPECIAL.search(text, i)
+            if match is None:
+                self._emit(out, text[i:])
+                break
+
+            j = match.start()
+            self._emit(out, text[i:j])
+            char = text[j]
+
+            if char == "`":
+                i = j + 1
+
+            elif char in "*_":
+                end = j
+                while end < n and text[end] == char:
+                    end += 1
+                if end == n and not final:
+                    self._pending = text[j:]  # Need the next character
+                    break
+                next_char = text[end] if end < n else ""
+                if self._prev.isalnum() and next_char.isalnum():
+                    self._emit(out, text[j:end])  # Intra-word, e.g. snake_case
+                i = end
+
+            elif char == "-":
+                if self._prev.isdigit():
+                    if j + 1 == n and not final:
+                        self._pending = text[j:]  # Could be a score: 30-23
+                        break
+                    if j + 1 < n and text[j + 1].isdigit():
+                        self._emit(out, " to ")
+                        i = j + 1
+                        continue
+                self._emit(out, "-")
+                i = j + 1
+
+            else:  # "["
+                close = text.find("]", j + 1)
+                if close == -1 or close + 1 == n:
+                    if not final and n - j <= _MAX_LINK_TEXT:
+                        self._pending = text[j:]  # Might be a link
+                        break
+                    self._emit(out, "[")
+                    i = j + 1
+                elif text[close + 1] == "(" and close > j + 1:
+                    # Link: speak the text, skip the URL
+                    self._emit(out, self._process_inline(text[j + 1:close]))
+                    self._in_url = True
+                    i = close + 2
+                else:
+                    self._emit(out, "[")
+                    i = j + 1
+
+        if final:
+            self._in_url = False
+            self._url_skipped = 0
+        return "".join(out)
+
+    def _process_inline(self, text: str) -> str:
+        """Sanitize link text (complete, so no state is carried)."""
+        return StreamingTTSSanitizer()._process(text, final=True)
 
 
 def number_to_ordinal_word(n: int) -> str:
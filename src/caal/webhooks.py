@@ -8,6 +8,9 @@ Endpoints:
     POST /reload-tools       - Refresh MCP tool cache and optionally announce
     POST /wake               - Handle wake word detection (greet user)
     GET  /health             - Health check
+    GET  /latency            - Per-stage latency percentiles of recent turns
+    GET  /jobs               - Status of recent background tool jobs
+    GET  /jobs/{job_id}      - Status and result of one background tool job
     GET  /settings           - Get current settings
     POST /settings           - Update settings
     GET  /prompt             - Get current prompt content
@@ -37,6 +40,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+from typing import Any
 
 import httpx
 from fastapi import FastAPI, HTTPException
@@ -49,6 +53,8 @@ from pydantic import BaseModel
 from . import registry_cache
 from . import settings as settings_module
 from .settings import validate_url
+from .tool_jobs import load_jobs
+from .tracing import DEFAULT_WINDOW, load_latency_stats
 
 logger = logging.getLogger(__name__)
 
@@ -340,6 +346,91 @@ async def health() -> HealthResponse:
     )
 
 
+class LatencyResponse(BaseModel):
+    """Response body for /latency endpoint."""
+
+    turns: int
+    stages: dict[str, dict[str, float]]
+
+
+@app.get("/latency", response_model=LatencyResponse)
+def latency(window: int = DEFAULT_WINDOW) -> LatencyResponse:
+    """Per-stage latency percentiles (ms) over the most recent turns.
+
+    Agent sessions run in worker processes, so stats are computed from the
+    trace file they append to rather than from in-memory histograms. A sync
+    endpoint, so FastAPI reads the file in its thread pool rather than on
+    the event loop.
+
+    Args:
+        window: Number of most recent turns to include
+
+    Returns:
+        LatencyResponse with count/p50/p95/p99 per stage
+    """
+    if window < 1:
+        raise HTTPException(status_code=400, detail="window must be at least 1")
+    stages = load_latency_stats(window=window)
+    turns = int(stages.get("turn_total", {}).get("count", 0))
+    return LatencyResponse(turns=turns, stages=stages)
+
+
+class JobResponse(BaseModel):
+    """One background tool job (body of /jobs/{job_id})."""
+
+    job_id: str
+    tool: str
+    arguments: dict
+    status: str
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+
+
+class JobsResponse(BaseModel):
+    """Response body for /jobs endpoint."""
+
+    jobs: list[JobResponse]
+
+
+@app.get("/jobs", response_model=JobsResponse)
+def list_jobs(limit: int = 50, status: str | None = None) -> JobsResponse:
+    """Status of recent background tool jobs, most recently updated first.
+
+    Jobs run in agent worker processes, which append their state changes to
+    the jobs file read here. Like /latency, a sync endpoint so the file is
+    read in FastAPI's thread pool.
+
+    Args:
+        limit: Max jobs returned
+        status: Only jobs in this state (queued, running, succeeded, failed)
+
+    Returns:
+        JobsResponse with one entry per job
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    jobs = load_jobs(limit=None if status else limit)
+    if status:
+        jobs = [job for job in jobs if job.get("status") == status][:limit]
+    return JobsResponse(jobs=[JobResponse(**job) for job in jobs])
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str) -> JobResponse:
+    """Status and result of one background tool job.
+
+    Raises:
+        HTTPException: 404 if the job is unknown
+    """
+    for job in load_jobs(limit=None):
+        if job.get("job_id") == job_id:
+            return JobResponse(**job)
+    raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+
 # =============================================================================
 # Settings Endpoints
 # =============================================================================
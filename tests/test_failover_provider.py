@@ -0,0 +1,80 @@
+"""FailoverProvider TTFT deadlines, with and without an admission queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+from caal.llm.providers import FailoverProvider, LLMProvider, ScheduledProvider
+from caal.llm.providers.base import LLMResponse
+from caal.llm.providers.scheduler import RequestScheduler
+
+TTFT_DEADLINE = 0.1
+
+
+class _Provider(LLMProvider):
+    """Streams one chunk after a fixed time to first token."""
+
+    model = "stub"
+
+    def __init__(self, name: str, ttft: float) -> None:
+        self._name = name
+        self._ttft = ttft
+
+    @property
+    def provider_name(self) -> str:
+        return self._name
+
+    async def chat(self, messages, tools=None, **kwargs) -> LLMResponse:
+        return LLMResponse(content=self._name, tool_calls=[])
+
+    async def chat_stream(self, messages, tools=None, **kwargs):
+        await asyncio.sleep(self._ttft)
+        yield self._name
+
+
+async def _reply(provider: FailoverProvider) -> str:
+    return "".join([chunk async for chunk in provider.chat_stream(messages=[])])
+
+
+async def test_slow_provider_fails_over():
+    provider = FailoverProvider(
+        [_Provider("slow", ttft=1.0), _Provider("fallback", ttft=0.0)],
+        ttft_deadline=TTFT_DEADLINE,
+    )
+
+    assert await _reply(provider) == "fallback"
+    stats = provider.stats()
+    assert stats["slow/stub"]["deadline_misses"] == 1
+    assert stats["fallback/stub"]["served"] == 1
+
+
+async def test_queue_wait_does_not_count_against_the_deadline():
+    scheduler = RequestScheduler("test", max_concurrent=1)
+    local = ScheduledProvider(_Provider("local", ttft=TTFT_DEADLINE / 2), scheduler)
+    provider = FailoverProvider(
+        [local, _Provider("cloud", ttft=0.0)], ttft_deadline=TTFT_DEADLINE
+    )
+
+    async def busy_backend() -> None:
+        async with scheduler.slot():
+            await asyncio.sleep(TTFT_DEADLINE * 3)
+
+    busy = asyncio.create_task(busy_backend())
+    await asyncio.sleep(0)
+
+    assert await _reply(provider) == "local"
+    await busy
+    stats = provider.stats()
+    assert stats["local/stub"]["deadline_misses"] == 0
+    assert stats["cloud/stub"]["served"] == 0
+
+
+async def test_deadline_still_applies_after_admission():
+    scheduler = RequestScheduler("test", max_concurrent=1)
+    local = ScheduledProvider(_Provider("local", ttft=1.0), scheduler)
+    provider = FailoverProvider(
+        [local, _Provider("cloud", ttft=0.0)], ttft_deadline=TTFT_DEADLINE
+    )
+
+    assert await _reply(provider) == "cloud"
+    assert provider.stats()["local/stub"]["deadline_misses"] == 1
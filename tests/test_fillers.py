@@ -0,0 +1,96 @@
+"""Filler phrases while slow tools run, kept out of the reply text."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+
+from livekit.agents import llm
+
+from caal.llm.providers import LLMProvider
+from caal.llm.providers.base import LLMResponse, StreamChunk, ToolCall
+from caal.llm.turn_budget import TurnBudget
+from caal.tts.filler_audio import FillerAudio
+
+# The module, not the llm_node function re-exported by caal.llm
+llm_node = importlib.import_module("caal.llm.llm_node")
+
+# How long the tool runs, against the soft deadline of the turn
+TOOL_SECONDS = 0.3
+FILLER_AFTER = 0.05
+
+
+class _Provider(LLMProvider):
+    """Calls a tool in the first round and answers in the second."""
+
+    provider_name = "stub"
+    model = "stub"
+
+    def __init__(self) -> None:
+        self.rounds = 0
+
+    async def chat(self, messages, tools=None, **kwargs) -> LLMResponse:
+        return LLMResponse(content="The fan is on.", tool_calls=[])
+
+    async def chat_stream(self, messages, tools=None, **kwargs):
+        yield "The fan is on."
+
+    async def chat_stream_with_tools(self, messages, tools=None, **kwargs):
+        self.rounds += 1
+        if self.rounds == 1:
+            yield StreamChunk(tool_calls=[ToolCall(id="c1", name="slow_tool", arguments={})])
+        else:
+            yield StreamChunk(content="The fan is on.")
+
+
+class _Agent:
+    def __init__(self) -> None:
+        self._llm_tools_cache = None
+        self._tool_dispatch = None
+        self._hass_tool_definitions = [
+            {"type": "function", "function": {"name": "slow_tool", "parameters": {}}}
+        ]
+        self._hass_tool_callables = {"slow_tool": self._slow_tool}
+
+    async def _slow_tool(self, **arguments):
+        await asyncio.sleep(TOOL_SECONDS)
+        return {"success": True}
+
+
+async def _reply(speak_filler) -> str:
+    chat_ctx = llm.ChatContext.empty()
+    chat_ctx.add_message(role="user", content="Turn on the fan.")
+    chunks = [
+        chunk
+        async for chunk in llm_node.llm_node(
+            _Agent(),
+            chat_ctx,
+            provider=_Provider(),
+            turn_budget=TurnBudget(deadline=None, filler_after=FILLER_AFTER),
+            speak_filler=speak_filler,
+        )
+    ]
+    return "".join(chunks)
+
+
+async def test_fillers_are_spoken_outside_the_reply():
+    spoken: list[str] = []
+
+    reply = await _reply(spoken.append)
+
+    assert spoken
+    assert reply == "The fan is on."
+
+
+async def test_no_fillers_without_a_speaker():
+    assert await _reply(None) == "The fan is on."
+
+
+async def test_filler_audio_is_a_no_op_until_started():
+    fillers = FillerAudio()
+
+    fillers.say("One moment.")
+    await fillers.wait()
+    await fillers.aclose()
+
+    assert not fillers.active
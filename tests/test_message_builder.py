@@ -0,0 +1,161 @@
+"""MessageBuilder against the full per-call conversion it replaced."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+import uuid
+
+import pytest
+from livekit.agents import llm
+
+from caal.llm.message_builder import MessageBuilder
+
+# Context sizes of the benchmark
+BENCH_SIZES = (1_000, 10_000)
+
+
+def _baseline_convert(items) -> tuple[dict | None, list[dict]]:
+    """Conversion loop of _build_messages_from_context before MessageBuilder."""
+    system_prompt = None
+    chat_messages = []
+
+    for item in items:
+        item_type = type(item).__name__
+
+        if item_type == "ChatMessage":
+            msg = {"role": item.role, "content": item.text_content}
+            if item.role == "system":
+                system_prompt = msg
+            else:
+                chat_messages.append(msg)
+        elif item_type == "FunctionCall":
+            try:
+                args = getattr(item, "arguments", {}) or {}
+                args_str = json.dumps(args) if isinstance(args, dict) else str(args)
+                chat_messages.append(
+                    {
+                        "role": "assistant",
+                        "content": "",
+                        "tool_calls": [
+                            {
+                                "id": item.id,
+                                "type": "function",
+                                "function": {
+                                    "name": item.name,
+                                    "arguments": args_str,
+                                },
+                            }
+                        ],
+                    }
+                )
+            except AttributeError:
+                pass
+        elif item_type == "FunctionCallOutput":
+            try:
+                chat_messages.append(
+                    {
+                        "role": "tool",
+                        "content": str(item.content),
+                        "tool_call_id": item.tool_call_id,
+                    }
+                )
+            except AttributeError:
+                pass
+
+    return system_prompt, chat_messages
+
+
+class FunctionCall:
+    """Tool call item with dict arguments (older LiveKit shape)."""
+
+    def __init__(self, name: str, arguments: dict) -> None:
+        self.id = f"item_{uuid.uuid4().hex[:12]}"
+        self.name = name
+        self.arguments = arguments
+
+
+class FunctionCallOutput:
+    """Tool result item with content/tool_call_id (older LiveKit shape)."""
+
+    def __init__(self, content: object, tool_call_id: str) -> None:
+        self.id = f"item_{uuid.uuid4().hex[:12]}"
+        self.content = content
+        self.tool_call_id = tool_call_id
+
+
+def _random_item(rng: random.Random):
+    kind = rng.choice(["user", "assistant", "system", "lk_call", "lk_output", "call", "output"])
+    text = " ".join(rng.choice(["lights", "on", "é", "🌧", '"q"', "\n", "42"]) for _ in range(5))
+    if kind in ("user", "assistant", "system"):
+        return llm.ChatMessage(role=kind, content=[text])
+    if kind == "lk_call":
+        return llm.FunctionCall(call_id="c1", name="web_search", arguments=json.dumps({"q": text}))
+    if kind == "lk_output":
+        return llm.FunctionCallOutput(call_id="c1", name="web_search", output=text, is_error=False)
+    if kind == "call":
+        return FunctionCall("hass_control", {"action": text, "n": rng.randint(0, 9)})
+    return FunctionCallOutput(rng.choice([text, {"result": text}, 7]), "c1")
+
+
+def _assert_identical(built, items) -> None:
+    expected = _baseline_convert(items)
+    assert built == expected
+    assert json.dumps(built).encode() == json.dumps(expected).encode()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_baseline_on_random_contexts(seed):
+    # Edits LiveKit makes between calls: appends, truncation, new
+    # instructions and insertions (items are never replaced in place)
+    rng = random.Random(seed)
+    builder = MessageBuilder()
+    items: list = []
+
+    for _ in range(60):
+        action = rng.random()
+        if action < 0.6:
+            items.extend(_random_item(rng) for _ in range(rng.randint(1, 4)))
+        elif action < 0.7 and items:
+            del items[: rng.randint(1, len(items))]  # History truncated
+        elif action < 0.8:
+            items.insert(0, llm.ChatMessage(role="system", content=["new instructions"]))
+        elif action < 0.9 and items:
+            items.insert(rng.randrange(len(items)), _random_item(rng))
+        elif len(items) > 2:
+            del items[1 : rng.randint(2, len(items))]  # Truncated, first item kept
+
+        _assert_identical(builder.build(list(items)), items)
+
+
+def test_matches_baseline_on_empty_context():
+    _assert_identical(MessageBuilder().build([]), [])
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_incremental_build_benchmark(size):
+    rng = random.Random(size)
+    items = [_random_item(rng) for _ in range(size)]
+    appended = [_random_item(rng) for _ in range(20)]
+
+    builder = MessageBuilder()
+    builder.build(items)
+    start = time.perf_counter()
+    for item in appended:
+        items.append(item)
+        builder.build(items)
+    incremental = (time.perf_counter() - start) / len(appended)
+
+    start = time.perf_counter()
+    for _ in appended:
+        _baseline_convert(items)
+    full = (time.perf_counter() - start) / len(appended)
+
+    print(
+        f"\nmessage build, {size} items: incremental {incremental * 1e6:.0f}us, "
+        f"full conversion {full * 1e6:.0f}us per call ({full / incremental:.0f}x)"
+    )
+    _assert_identical(builder.build(items), items)
+    assert incremental < full
@@ -0,0 +1,116 @@
+"""OllamaProvider streaming against a stub NDJSON server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from caal.llm.providers import OllamaProvider
+
+# Delay between streamed lines: long enough that a client blocking the
+# event loop while it waits for the next line shows up as loop lag
+LINE_DELAY = 0.15
+WORDS = ["The ", "lights ", "are ", "on."]
+
+# Worst event-loop lag tolerated while a reply streams in
+MAX_LOOP_LAG = 0.05
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        lines = [{"message": {"role": "assistant", "content": word}} for word in WORDS]
+        if body.get("tools"):
+            lines.append({
+                "message": {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {"function": {"name": "hass_control", "arguments": {"action": "on"}}}
+                    ],
+                }
+            })
+        lines.append({
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "prompt_eval_count": 42,
+            "prompt_eval_duration": 1_000_000,
+        })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            time.sleep(LINE_DELAY)
+            data = json.dumps({"model": body["model"], **line}).encode() + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def ollama_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+async def _max_loop_lag(stream) -> tuple[list, float]:
+    """Consume stream while a ticker measures how late the loop wakes it up."""
+    interval = 0.005
+    ticks = [time.perf_counter()]
+
+    async def ticker() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            ticks.append(time.perf_counter())
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        chunks = [chunk async for chunk in stream]
+    finally:
+        ticks.append(time.perf_counter())
+        task.cancel()
+    gaps = [end - start for start, end in zip(ticks, ticks[1:])]
+    return chunks, max(gaps) - interval
+
+
+async def test_chat_stream_does_not_block_event_loop(ollama_url):
+    provider = OllamaProvider(model="stub", base_url=ollama_url)
+
+    chunks, lag = await _max_loop_lag(
+        provider.chat_stream([{"role": "user", "content": "lights?"}])
+    )
+
+    assert "".join(chunks) == "".join(WORDS)
+    assert lag < MAX_LOOP_LAG
+    assert provider.last_prompt_eval_count == 42
+
+
+async def test_chat_stream_with_tools_does_not_block_event_loop(ollama_url):
+    provider = OllamaProvider(model="stub", base_url=ollama_url)
+    tools = [{"type": "function", "function": {"name": "hass_control", "parameters": {}}}]
+
+    chunks, lag = await _max_loop_lag(
+        provider.chat_stream_with_tools([{"role": "user", "content": "lights on"}], tools=tools)
+    )
+
+    assert "".join(c.content for c in chunks if c.content) == "".join(WORDS)
+    calls = [call for c in chunks for call in c.tool_calls or []]
+    assert [(c.name, c.arguments) for c in calls] == [("hass_control", {"action": "on"})]
+    assert lag < MAX_LOOP_LAG
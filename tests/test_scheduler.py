@@ -0,0 +1,73 @@
+"""RequestScheduler admission order and stats across session threads."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from caal.llm.providers import Priority
+from caal.llm.providers.scheduler import RequestScheduler
+
+# Session threads (one event loop each) sharing a scheduler
+THREADS = 8
+REQUESTS_PER_THREAD = 300
+
+
+async def test_admits_waiters_by_priority():
+    scheduler = RequestScheduler("test", max_concurrent=1)
+    order: list[str] = []
+
+    async def request(priority: Priority, label: str) -> None:
+        async with scheduler.slot(priority):
+            order.append(label)
+            await asyncio.sleep(0.01)
+
+    async with scheduler.slot():
+        tasks = [
+            asyncio.create_task(request(Priority.TOOL_FOLLOWUP, "followup")),
+            asyncio.create_task(request(Priority.INTERACTIVE, "interactive")),
+        ]
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "followup"]
+
+
+def test_stats_are_consistent_across_threads():
+    scheduler = RequestScheduler("test", max_concurrent=2)
+    done = threading.Event()
+    errors: list[BaseException] = []
+
+    async def requests() -> None:
+        for i in range(REQUESTS_PER_THREAD):
+            priority = Priority.INTERACTIVE if i % 2 else Priority.TOOL_FOLLOWUP
+            async with scheduler.slot(priority):
+                await asyncio.sleep(0)
+
+    def session() -> None:
+        try:
+            asyncio.run(requests())
+        except BaseException as e:  # Reported by the main thread
+            errors.append(e)
+
+    def reader() -> None:
+        try:
+            while not done.is_set():
+                scheduler.stats()
+        except BaseException as e:
+            errors.append(e)
+
+    stats_thread = threading.Thread(target=reader)
+    stats_thread.start()
+    sessions = [threading.Thread(target=session) for _ in range(THREADS)]
+    for thread in sessions:
+        thread.start()
+    for thread in sessions:
+        thread.join()
+    done.set()
+    stats_thread.join()
+
+    stats = scheduler.stats()
+    assert errors == []
+    assert sum(stats["admitted"].values()) == THREADS * REQUESTS_PER_THREAD
+    assert stats["active"] == 0
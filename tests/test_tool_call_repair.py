@@ -0,0 +1,230 @@
+"""Recovery of tool calls that models wrote as text."""
+
+from __future__ import annotations
+
+import pytest
+
+from caal.llm.tool_call_repair import failed_generation, repair_tool_calls
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "parameters": {
+                "type": "object",
+                "properties": {"query": {"type": "string"}},
+                "required": ["query"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "hass_control",
+            "parameters": {
+                "type": "object",
+                "properties": {"action": {"type": "string"}, "target": {"type": "string"}},
+                "required": ["action", "target"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_time",
+            "parameters": {"type": "object", "properties": {}},
+        },
+    },
+]
+
+# (model output, expected [(name, arguments)])
+CORPUS = [
+    pytest.param(
+        '[TOOL_CALLS]web_search[ARGS]{"query": "weather in Sydney"}',
+        [("web_search", {"query": "weather in Sydney"})],
+        id="mistral-args",
+    ),
+    pytest.param(
+        '[TOOL_CALLS]hass_control[CALL_ID]a1b2c3d4e[ARGS]{"action": "turn_on", "target": "lamp"}',
+        [("hass_control", {"action": "turn_on", "target": "lamp"})],
+        id="mistral-call-id",
+    ),
+    pytest.param(
+        '[TOOL_CALLS][{"name": "web_search", "arguments": {"query": "nhl scores"}}, '
+        '{"name": "get_time", "arguments": {}}]',
+        [("web_search", {"query": "nhl scores"}), ("get_time", {})],
+        id="mistral-list",
+    ),
+    pytest.param(
+        '<function=web_search>{"query": "bitcoin price"}</function>',
+        [("web_search", {"query": "bitcoin price"})],
+        id="llama-function",
+    ),
+    pytest.param(
+        '<function=hass_control{"action": "turn_off", "target": "kitchen light"}</function>',
+        [("hass_control", {"action": "turn_off", "target": "kitchen light"})],
+        id="llama-function-no-bracket",
+    ),
+    pytest.param(
+        '<|python_tag|>{"name": "web_search", "parameters": {"query": "news"}}',
+        [("web_search", {"query": "news"})],
+        id="llama-python-tag",
+    ),
+    pytest.param(
+        '[web_search(query="local events"), get_time()]',
+        [("web_search", {"query": "local events"}), ("get_time", {})],
+        id="llama-pythonic",
+    ),
+    pytest.param(
+        '<tool_call>\n{"name": "hass_control", "arguments": {"action": "turn_on", '
+        '"target": "fan"}}\n</tool_call>',
+        [("hass_control", {"action": "turn_on", "target": "fan"})],
+        id="hermes-tool-call",
+    ),
+    pytest.param(
+        "<tool_call>{'name': 'hass_control', 'arguments': {'action': 'turn_on', "
+        "'target': 'tv'}}</tool_call>",
+        [("hass_control", {"action": "turn_on", "target": "tv"})],
+        id="hermes-python-literal",
+    ),
+    pytest.param(
+        'Sure. {"name": "web_search", "arguments": {"query": "tides today"}}',
+        [("web_search", {"query": "tides today"})],
+        id="bare-json",
+    ),
+    pytest.param(
+        '{"type": "function", "function": {"name": "web_search", '
+        '"arguments": "{\\"query\\": \\"stocks\\"}"}}',
+        [("web_search", {"query": "stocks"})],
+        id="openai-shaped-string-arguments",
+    ),
+    pytest.param(
+        'The user wants a search, use web_search.[/THINK][TOOL_CALLS]web_search[ARGS]'
+        '{"query": "mars rover"}',
+        [("web_search", {"query": "mars rover"})],
+        id="mistral-think-residue",
+    ),
+    pytest.param(
+        '<think>Maybe [TOOL_CALLS]get_time[ARGS]{} first?</think>'
+        '<tool_call>{"name": "web_search", "arguments": {"query": "eclipse"}}</tool_call>',
+        [("web_search", {"query": "eclipse"})],
+        id="think-block-residue",
+    ),
+    pytest.param(
+        '[TOOL_CALLS]functions.WEB_SEARCH[ARGS]{"query": "ev range"}',
+        [("web_search", {"query": "ev range"})],
+        id="prefixed-name",
+    ),
+]
+
+
+@pytest.mark.parametrize(("text", "expected"), CORPUS)
+def test_recovers_calls(text, expected):
+    calls = repair_tool_calls(text, TOOLS)
+
+    assert [(c.name, c.arguments) for c in calls] == expected
+    assert all(c.id.startswith("call_") for c in calls)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param('[TOOL_CALLS]send_email[ARGS]{"to": "bob"}', id="mistral"),
+        pytest.param('<function=delete_files>{"path": "/"}</function>', id="llama"),
+        pytest.param('<tool_call>{"name": "shell", "arguments": {}}</tool_call>', id="hermes"),
+        pytest.param('[rm_rf(path="/")]', id="pythonic"),
+    ],
+)
+def test_rejects_unknown_tools(text):
+    assert repair_tool_calls(text, TOOLS) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("[TOOL_CALLS]web_search[ARGS]{}", id="mistral"),
+        pytest.param('<function=hass_control>{"action": "turn_on"}</function>', id="llama"),
+        pytest.param('<tool_call>{"name": "web_search", "arguments": {}}</tool_call>', id="hermes"),
+        pytest.param("[web_search()]", id="pythonic"),
+        pytest.param('<function=web_search>{"query": "truncat', id="truncated"),
+        pytest.param('<function=web_search>["not", "an", "object"]</function>', id="non-object"),
+    ],
+)
+def test_rejects_missing_or_invalid_arguments(text):
+    assert repair_tool_calls(text, TOOLS) == []
+
+
+def test_keeps_valid_calls_next_to_rejected_ones():
+    text = (
+        '[TOOL_CALLS][{"name": "web_search", "arguments": {"query": "rain"}}, '
+        '{"name": "hass_control", "arguments": {"action": "turn_on"}}]'
+    )
+
+    calls = repair_tool_calls(text, TOOLS)
+
+    assert [(c.name, c.arguments) for c in calls] == [("web_search", {"query": "rain"})]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "The weather in Sydney is 24 degrees and sunny.", "Scores: [3, 2] {home}"],
+)
+def test_ignores_plain_text(text):
+    assert repair_tool_calls(text, TOOLS) == []
+
+
+def test_no_tools_advertised():
+    assert repair_tool_calls('<function=web_search>{"query": "x"}</function>', []) == []
+
+
+class _GroqError(Exception):
+    """Shape of groq.BadRequestError: message text plus the parsed body."""
+
+    def __init__(self, message: str, body: object = None) -> None:
+        super().__init__(message)
+        self.body = body
+
+
+GROQ_GENERATION = '<function=web_search{"query": "weather in Paris"}</function>'
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        pytest.param(
+            _GroqError(
+                "Error code: 400",
+                body={
+                    "error": {
+                        "message": "Failed to call a function. Please adjust your prompt.",
+                        "type": "invalid_request_error",
+                        "code": "tool_use_failed",
+                        "failed_generation": GROQ_GENERATION,
+                    }
+                },
+            ),
+            id="body",
+        ),
+        pytest.param(
+            _GroqError(
+                "Error code: 400 - {'error': {'message': 'Failed to call a function. "
+                "Please adjust your prompt.', 'type': 'invalid_request_error', "
+                f"'code': 'tool_use_failed', 'failed_generation': '{GROQ_GENERATION}'}}}}"
+            ),
+            id="message",
+        ),
+    ],
+)
+def test_groq_failed_generation(error):
+    generation = failed_generation(error)
+    calls = repair_tool_calls(generation, TOOLS)
+
+    assert generation == GROQ_GENERATION
+    assert [(c.name, c.arguments) for c in calls] == [
+        ("web_search", {"query": "weather in Paris"})
+    ]
+
+
+def test_failed_generation_falls_back_to_error_text():
+    assert failed_generation(RuntimeError("connection reset")) == "connection reset"
@@ -0,0 +1,133 @@
+"""Tool routing through the dispatch table built by _discover_tools."""
+
+from __future__ import annotations
+
+import importlib
+import time
+
+import pytest
+
+# The module, not the llm_node function re-exported by caal.llm
+llm_node = importlib.import_module("caal.llm.llm_node")
+
+# Advertised tools per backend in the benchmark
+BENCH_TOOLS_PER_KIND = 100
+BENCH_CALLS = 20_000
+
+# Mean dispatch overhead tolerated per call (lookup + executor, no tool work)
+MAX_OVERHEAD_US = 50.0
+
+
+def _tool(name: str) -> dict:
+    return {"type": "function", "function": {"name": name, "parameters": {}}}
+
+
+class _MCPClient:
+    def __init__(self, calls: list) -> None:
+        self.calls = calls
+
+    async def call_tool(self, name: str, arguments: dict):
+        self.calls.append(("mcp", name, arguments))
+        raise AssertionError("MCP call not expected")
+
+
+class _MCPServer:
+    def __init__(self, calls: list) -> None:
+        self._client = _MCPClient(calls)
+
+
+class _Agent:
+    """Agent with HASS, n8n and MCP tools (no @function_tool methods)."""
+
+    def __init__(self, tools_per_kind: int = 1) -> None:
+        self.calls: list[tuple] = []
+        self._llm_tools_cache = None
+        self._tool_dispatch = None
+        self._hass_tool_definitions = [_tool(f"hass_{i}") for i in range(tools_per_kind)]
+        self._hass_tool_callables = {
+            f"hass_{i}": self._hass_tool for i in range(tools_per_kind)
+        }
+        self._n8n_workflow_tools = [_tool(f"workflow_{i}") for i in range(tools_per_kind)]
+        self._n8n_workflow_name_map = {
+            f"workflow_{i}": f"Workflow {i}" for i in range(tools_per_kind)
+        }
+        self._n8n_base_url = "http://n8n:5678"
+        self._caal_mcp_servers = {"files": _MCPServer(self.calls)}
+
+    async def _hass_tool(self, **arguments):
+        self.calls.append(("hass", arguments))
+        return {"success": True}
+
+
+@pytest.fixture
+def n8n_calls(monkeypatch):
+    calls: list[tuple] = []
+
+    async def execute_n8n_workflow(base_url, workflow_name, arguments):
+        calls.append(("n8n", workflow_name, arguments))
+        return {"message": "done"}
+
+    monkeypatch.setattr(llm_node, "execute_n8n_workflow", execute_n8n_workflow)
+    return calls
+
+
+async def test_routes_advertised_tools(n8n_calls):
+    agent = _Agent()
+    await llm_node._discover_tools(agent)
+
+    assert await llm_node._execute_single_tool(agent, "hass_0", {"entity": "fan"}) == {
+        "success": True
+    }
+    assert await llm_node._execute_single_tool(agent, "workflow_0", {"q": "x"}) == {
+        "message": "done"
+    }
+    assert agent.calls == [("hass", {"entity": "fan"})]
+    assert n8n_calls == [("n8n", "Workflow 0", {"q": "x"})]
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "delete_everything",
+        "workflow_99",  # n8n naming, but not advertised
+        "files__read_file",  # MCP server exists, tool not advertised
+        "unknown__tool",
+    ],
+)
+async def test_rejects_unknown_tool_without_calling_clients(n8n_calls, name):
+    agent = _Agent()
+    await llm_node._discover_tools(agent)
+
+    with pytest.raises(ValueError, match="not found"):
+        await llm_node._execute_single_tool(agent, name, {})
+
+    assert agent.calls == []
+    assert n8n_calls == []
+
+
+async def test_builds_dispatch_table_on_first_call(n8n_calls):
+    agent = _Agent()
+
+    await llm_node._execute_single_tool(agent, "hass_0", {})
+
+    assert agent._tool_dispatch is not None
+    assert agent.calls == [("hass", {})]
+
+
+@pytest.mark.benchmark
+async def test_dispatch_overhead_benchmark(n8n_calls):
+    agent = _Agent(BENCH_TOOLS_PER_KIND)
+    tools = await llm_node._discover_tools(agent)
+    names = [t["function"]["name"] for t in tools]
+
+    start = time.perf_counter()
+    for i in range(BENCH_CALLS):
+        await llm_node._execute_single_tool(agent, names[i % len(names)], {})
+    per_call_us = (time.perf_counter() - start) / BENCH_CALLS * 1e6
+
+    print(
+        f"\ntool dispatch: {len(names)} advertised tools, "
+        f"{per_call_us:.1f}us per call over {BENCH_CALLS} calls"
+    )
+    assert len(agent.calls) + len(n8n_calls) == BENCH_CALLS
+    assert per_call_us < MAX_OVERHEAD_US
@@ -0,0 +1,80 @@
+"""Job state written off the event loop and read back by /jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from caal import tool_jobs, webhooks
+from caal.tool_jobs import ToolJobManager, load_jobs
+
+# Time a job state write takes on a slow disk
+SLOW_WRITE = 0.2
+
+
+def _flush() -> None:
+    """Wait for job states already submitted to be written."""
+    tool_jobs._writer.submit(lambda: None).result()
+
+
+async def _report():
+    return {"message": "Report ready."}
+
+
+async def test_submit_does_not_wait_for_the_write(tmp_path, monkeypatch):
+    append_job = tool_jobs._append_job
+    writers: list[str] = []
+
+    def slow_append(path, data):
+        writers.append(threading.current_thread().name)
+        time.sleep(SLOW_WRITE)
+        append_job(path, data)
+
+    monkeypatch.setattr(tool_jobs, "_append_job", slow_append)
+    jobs = ToolJobManager(path=tmp_path / "jobs.jsonl")
+
+    start = time.perf_counter()
+    job = jobs.submit("monthly_report", {}, _report)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+    _flush()
+
+    assert elapsed < SLOW_WRITE
+    assert job.status == "succeeded"
+    assert threading.current_thread().name not in writers
+
+
+async def test_job_states_are_written_in_order(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    jobs = ToolJobManager(path=path)
+
+    job = jobs.submit("monthly_report", {"month": 3}, _report)
+    while not job.done:
+        await asyncio.sleep(0.01)
+    _flush()
+
+    states = [json.loads(line)["status"] for line in path.read_text().splitlines()]
+    assert states == ["queued", "running", "succeeded"]
+    assert load_jobs(path)[0]["result"] == {"message": "Report ready."}
+
+
+async def test_jobs_endpoints_read_jobs_file(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.jsonl"
+    jobs = ToolJobManager(path=path)
+    job = jobs.submit("monthly_report", {}, _report)
+    while not job.done:
+        await asyncio.sleep(0.01)
+    _flush()
+    monkeypatch.setattr(webhooks, "load_jobs", lambda limit: load_jobs(path, limit))
+    client = TestClient(webhooks.app)
+
+    listed = client.get("/jobs", params={"status": "succeeded"})
+    single = client.get(f"/jobs/{job.job_id}")
+
+    assert [j["job_id"] for j in listed.json()["jobs"]] == [job.job_id]
+    assert single.json()["status"] == "succeeded"
+    assert client.get("/jobs/missing").status_code == 404
@@ -0,0 +1,50 @@
+"""Schemas of agent @function_tool methods, per instance and per session."""
+
+from __future__ import annotations
+
+from caal.llm.tool_registry import agent_tool_schemas
+
+
+class _Agent:
+    """Agent whose tool list depends on the instance, not the class."""
+
+    def __init__(self, *tool_names: str) -> None:
+        self._tools = [getattr(self, name) for name in tool_names]
+
+    async def get_time(self) -> str:
+        """Current time."""
+        return "noon"
+
+    async def set_timer(self, minutes: int, label: str = "") -> str:
+        """Start a timer."""
+        return "ok"
+
+
+def _names(tools: list[dict]) -> list[str]:
+    return [t["function"]["name"] for t in tools]
+
+
+def test_schemas_follow_the_instance_tools():
+    assert _names(agent_tool_schemas(_Agent("get_time"))) == ["get_time"]
+    assert _names(agent_tool_schemas(_Agent("get_time", "set_timer"))) == [
+        "get_time",
+        "set_timer",
+    ]
+
+
+def test_schema_from_signature():
+    (tool,) = agent_tool_schemas(_Agent("set_timer"))
+
+    assert tool["function"]["description"] == "Start a timer."
+    assert list(tool["function"]["parameters"]["properties"]) == ["minutes", "label"]
+    assert tool["function"]["parameters"]["required"] == ["minutes"]
+
+
+def test_sessions_get_independent_copies():
+    first = agent_tool_schemas(_Agent("set_timer"))
+    first[0]["function"]["parameters"]["properties"].clear()
+    first[0]["function"]["description"] = "changed"
+
+    (second,) = agent_tool_schemas(_Agent("set_timer"))
+    assert second["function"]["description"] == "Start a timer."
+    assert "minutes" in second["function"]["parameters"]["properties"]
@@ -0,0 +1,74 @@
+"""Turn traces written off the event loop and read back by /latency."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from caal import tracing, webhooks
+from caal.tracing import TurnTracer, load_latency_stats
+
+# Time a trace write takes on a slow disk
+SLOW_WRITE = 0.2
+
+
+def _flush() -> None:
+    """Wait for trace lines already submitted to be written."""
+    tracing._writer.submit(lambda: None).result()
+
+
+def _finish_turns(tracer: TurnTracer, turns: int) -> None:
+    for i in range(turns):
+        trace = tracer.start_turn()
+        trace.set_duration("stt", float(i))
+        trace.mark("first_audio")
+    tracer.finish_turn()
+
+
+def test_finish_turn_does_not_wait_for_the_write(tmp_path, monkeypatch):
+    append_trace = tracing._append_trace
+    writers: list[str] = []
+
+    def slow_append(path, data):
+        writers.append(threading.current_thread().name)
+        time.sleep(SLOW_WRITE)
+        append_trace(path, data)
+
+    monkeypatch.setattr(tracing, "_append_trace", slow_append)
+    tracer = TurnTracer(path=tmp_path / "traces.jsonl")
+
+    start = time.perf_counter()
+    _finish_turns(tracer, 3)
+    elapsed = time.perf_counter() - start
+    _flush()
+
+    assert elapsed < SLOW_WRITE
+    assert threading.current_thread().name not in writers
+    assert load_latency_stats(tmp_path / "traces.jsonl")["turn_total"]["count"] == 3
+
+
+def test_trace_lines_keep_turn_order(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    _finish_turns(TurnTracer(path=path), 50)
+    _flush()
+
+    stt = [json.loads(line)["durations"]["stt"] for line in path.read_text().splitlines()]
+    assert stt == [float(i) for i in range(50)]
+
+
+def test_latency_endpoint_reads_trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    _finish_turns(TurnTracer(path=path), 4)
+    _flush()
+    monkeypatch.setattr(
+        webhooks, "load_latency_stats", lambda window: load_latency_stats(path, window)
+    )
+
+    response = TestClient(webhooks.app).get("/latency", params={"window": 2})
+
+    assert response.status_code == 200
+    assert response.json()["turns"] == 2
+    assert response.json()["stages"]["stt"]["count"] == 2
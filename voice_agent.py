@@ -30,6 +30,7 @@ import os
 import random
 import sys
 import time
+from contextlib import aclosing
 
 import requests
 
@@ -44,18 +45,41 @@ load_dotenv(os.path.join(_script_dir, ".env"))
 
 from livekit import agents, rtc  # noqa: E402
 from livekit.agents import Agent, AgentSession, mcp  # noqa: E402
+from livekit.agents.metrics import EOUMetrics  # noqa: E402
 from livekit.plugins import groq as groq_plugin  # noqa: E402
 from livekit.plugins import openai, silero  # noqa: E402
 
 from caal import CAALLLM  # noqa: E402
 from caal.integrations import (  # noqa: E402
     WebSearchTools,
-    discover_n8n_workflows,
+    get_workflow_annotations,
+    get_workflow_cache_ttl,
     initialize_mcp_servers,
     load_mcp_config,
 )
-from caal.llm import ToolDataCache, llm_node  # noqa: E402
+from caal.llm import (  # noqa: E402
+    PROMPT_LAYOUTS,
+    GenerationStats,
+    MessageBuilder,
+    ReductionPolicy,
+    ToolDataCache,
+    ToolResultCache,
+    ToolResultReducer,
+    ToolSelector,
+    TurnBudget,
+    llm_node,
+)
+from caal.llm.intent_router import IntentRouter  # noqa: E402
+from caal.llm.providers import FailoverProvider  # noqa: E402
+from caal.llm.response_templates import ResponseTemplates  # noqa: E402
+from caal.llm.speech_aggregator import aggregate_speech, get_aggregator_config  # noqa: E402
+from caal.llm.tool_index import DEFAULT_ALWAYS_ON_TOOLS  # noqa: E402
+from caal.llm.tool_registry import ToolSnapshot, get_tool_registry  # noqa: E402
 from caal.stt import WakeWordGatedSTT  # noqa: E402
+from caal.tool_jobs import ToolJob, ToolJobManager  # noqa: E402
+from caal.tracing import TurnTracer  # noqa: E402
+from caal.tts.filler_audio import FillerAudio  # noqa: E402
+from caal.tts.segmented import synthesize_segments  # noqa: E402
 from caal.tts.sync_openai_tts import SyncOpenAITTS  # noqa: E402
 
 # Configure logging - LiveKit adds LogQueueHandler to root in worker processes,
@@ -130,6 +154,7 @@ def get_runtime_settings() -> dict:
         "tts_provider": user_settings.get("tts_provider") or os.getenv("TTS_PROVIDER", "kokoro"),
         "tts_voice_kokoro": settings.get("tts_voice_kokoro") or os.getenv("TTS_VOICE", "am_puck"),
         "tts_voice_piper": settings.get("tts_voice_piper") or "speaches-ai/piper-en_US-ryan-high",
+        "tts_aggregation": settings.get("tts_aggregation", True),
         # STT Provider settings
         "stt_provider": user_settings.get("stt_provider") or os.getenv("STT_PROVIDER", "speaches"),
         # LLM Provider settings - .env overrides default, user setting overrides .env
@@ -173,9 +198,46 @@ def get_runtime_settings() -> dict:
             user_settings.get("openrouter_model")
             or os.getenv("OPENROUTER_MODEL", "openai/gpt-4")
         ),
+        # LLM failover chain
+        "llm_fallback_providers": settings.get("llm_fallback_providers", []),
+        "llm_ttft_deadline": settings.get("llm_ttft_deadline", 5.0),
+        "llm_hedge": settings.get("llm_hedge", False),
+        "llm_max_concurrency": settings.get("llm_max_concurrency", 0),
         # Shared settings
         "max_turns": settings.get("max_turns", int(os.getenv("OLLAMA_MAX_TURNS", "20"))),
         "tool_cache_size": settings.get("tool_cache_size", int(os.getenv("TOOL_CACHE_SIZE", "3"))),
+        "tool_cache_max_chars": settings.get("tool_cache_max_chars", 4000),
+        "tool_concurrency": settings.get(
+            "tool_concurrency", int(os.getenv("TOOL_CONCURRENCY", "4"))
+        ),
+        "tool_timeout": settings.get("tool_timeout", float(os.getenv("TOOL_TIMEOUT", "30"))),
+        "cancel_safe_tools": settings.get("cancel_safe_tools", ["hass_get_state", "web_search"]),
+        "turn_deadline": settings.get("turn_deadline", 20.0),
+        "tool_filler_after": settings.get("tool_filler_after", 3.0),
+        "async_tools": settings.get("async_tools", []),
+        "tool_job_concurrency": settings.get("tool_job_concurrency", 2),
+        "tool_job_timeout": settings.get("tool_job_timeout", 600.0),
+        "intent_fast_path": settings.get("intent_fast_path", True),
+        "templated_responses": settings.get("templated_responses", True),
+        "response_templates": settings.get("response_templates", {}),
+        "validate_tool_arguments": settings.get("validate_tool_arguments", True),
+        "tool_result_cache_ttls": settings.get(
+            "tool_result_cache_ttls", {"hass_get_state": 5, "web_search": 300}
+        ),
+        "tool_result_cache_size": settings.get("tool_result_cache_size", 128),
+        "tool_result_max_chars": settings.get("tool_result_max_chars", 4000),
+        "tool_result_policies": settings.get(
+            "tool_result_policies", {"hass_get_state": {"max_chars": 6000}}
+        ),
+        "tool_result_summarize": settings.get("tool_result_summarize", False),
+        "tool_top_k": settings.get("tool_top_k", 8),
+        "tool_always_on": settings.get(
+            "tool_always_on", ["hass_control", "hass_get_state", "web_search"]
+        ),
+        "context_budget_tokens": settings.get("context_budget_tokens", 0),
+        "response_token_reserve": settings.get("response_token_reserve", 512),
+        "prompt_layout": settings.get("prompt_layout", "default"),
+        "latency_tracing": settings.get("latency_tracing", True),
         # Turn detection settings
         "allow_interruptions": settings.get("allow_interruptions", True),
         "min_endpointing_delay": settings.get("min_endpointing_delay", 0.5),
@@ -322,9 +384,16 @@ def create_hass_tools(hass_server: mcp.MCPServerHTTP) -> tuple[list[dict], dict]
                 "parameters": {
                     "type": "object",
                     "properties": {
-                        "action": {"type": "string"},
+                        "action": {
+                            "type": "string",
+                            "enum": [
+                                "turn_on", "turn_off", "volume_up", "volume_down",
+                                "set_volume", "mute", "unmute", "pause", "play",
+                                "next", "previous",
+                            ],
+                        },
                         "target": {"type": "string"},
-                        "value": {"type": "integer"},
+                        "value": {"type": "integer", "minimum": 0, "maximum": 100},
                     },
                     "required": ["action", "target"],
                 },
@@ -370,9 +439,35 @@ class VoiceAssistant(WebSearchTools, Agent):
         n8n_workflow_tools: list[dict] | None = None,
         n8n_workflow_name_map: dict[str, str] | None = None,
         n8n_base_url: str | None = None,
+        tool_snapshot: ToolSnapshot | None = None,
         on_tool_status: ToolStatusCallback | None = None,
         tool_cache_size: int = 3,
+        tool_cache_max_chars: int = 4000,
         max_turns: int = 20,
+        tool_concurrency: int = 4,
+        tool_timeout: float = 30.0,
+        cancel_safe_tools: list[str] | None = None,
+        turn_deadline: float = 20.0,
+        tool_filler_after: float = 3.0,
+        async_tools: list[str] | None = None,
+        tool_job_concurrency: int = 2,
+        tool_job_timeout: float = 600.0,
+        intent_fast_path: bool = True,
+        templated_responses: bool = True,
+        response_templates: dict[str, str] | None = None,
+        validate_tool_arguments: bool = True,
+        tool_result_cache_ttls: dict[str, float] | None = None,
+        tool_result_cache_size: int = 128,
+        tool_result_max_chars: int = 4000,
+        tool_result_policies: dict[str, dict] | None = None,
+        tool_result_summarize: bool = False,
+        tool_top_k: int = 8,
+        tool_always_on: list[str] | None = None,
+        context_budget_tokens: int = 0,
+        response_token_reserve: int = 512,
+        prompt_layout: str = "default",
+        tts_aggregation: bool = True,
+        tracer: TurnTracer | None = None,
         hass_tool_definitions: list[dict] | None = None,
         hass_tool_callables: dict | None = None,
     ) -> None:
@@ -393,27 +488,313 @@ class VoiceAssistant(WebSearchTools, Agent):
         self._n8n_workflow_name_map = n8n_workflow_name_map or {}
         self._n8n_base_url = n8n_base_url
 
+        # Shared MCP/n8n tool schemas from the process-wide registry
+        self._tool_snapshot: ToolSnapshot | None = None
+        self._llm_tools_cache: list[dict] | None = None
+        if tool_snapshot is not None:
+            self.set_tool_snapshot(tool_snapshot)
+
         # Home Assistant tools (only if HASS is connected)
         self._hass_tool_definitions = hass_tool_definitions or []
         self._hass_tool_callables = hass_tool_callables or {}
 
+        # Replies built from templates instead of a follow-up LLM round
+        self._response_templates = ResponseTemplates(
+            language, templates=response_templates, annotation_resolver=get_workflow_annotations
+        )
+        self._templated_responses = templated_responses
+
+        # Simple device commands skip the LLM (needs Home Assistant)
+        self._intent_router = (
+            IntentRouter(language)
+            if intent_fast_path and "hass_control" in self._hass_tool_callables
+            else None
+        )
+
         # Callback for publishing tool status to frontend
         self._on_tool_status = on_tool_status
 
         # Context management: tool data cache and sliding window
-        self._tool_data_cache = ToolDataCache(max_entries=tool_cache_size)
+        self._tool_data_cache = ToolDataCache(
+            max_entries=tool_cache_size, max_chars=tool_cache_max_chars
+        )
         self._max_turns = max_turns
+        self._message_builder = MessageBuilder()
+        self._context_budget_tokens = context_budget_tokens or None
+        self._response_token_reserve = response_token_reserve
+        if prompt_layout not in PROMPT_LAYOUTS:
+            logger.warning(f"Unknown prompt_layout '{prompt_layout}', using default")
+            prompt_layout = "default"
+        self._prompt_layout = prompt_layout
+
+        # Tool execution: parallelism within a round and per-tool timeout
+        self._tool_concurrency = tool_concurrency
+        self._tool_timeout = tool_timeout
+        self._cancel_safe_tools = tuple(cancel_safe_tools or ())
+        self._validate_tool_arguments = validate_tool_arguments
+
+        # Turn latency budget: filler phrases and hard deadline for tools
+        self._turn_deadline = turn_deadline
+        self._tool_filler_after = tool_filler_after
+        self._language = language
+        # Filler phrases play on a background track, outside the reply
+        self._filler_audio = FillerAudio()
+
+        # Long-running tools run as background jobs, announced when done
+        self._tool_jobs = ToolJobManager(
+            async_tools=async_tools or (),
+            annotation_resolver=get_workflow_annotations,
+            max_concurrent=tool_job_concurrency,
+            timeout=tool_job_timeout,
+            on_complete=self._announce_job,
+        )
+        self._tool_result_cache = ToolResultCache(
+            ttls=tool_result_cache_ttls,
+            max_entries=tool_result_cache_size,
+            ttl_resolver=get_workflow_cache_ttl,
+        )
+        self._tool_result_reducer = ToolResultReducer(
+            policies=tool_result_policies,
+            default=ReductionPolicy(
+                max_chars=tool_result_max_chars, summarize=tool_result_summarize
+            ),
+            provider=self._provider,
+        )
+        self._tool_selector = ToolSelector(
+            top_k=tool_top_k,
+            always_on=tool_always_on if tool_always_on is not None else DEFAULT_ALWAYS_ON_TOOLS,
+        )
+
+        # Speech segmentation between llm_node and non-streaming TTS
+        self._tts_aggregation = tts_aggregation
+        self._speech_config = get_aggregator_config(language)
+
+        # Per-turn latency tracing (None = disabled)
+        self._tracer = tracer
+        # session.say() speech in flight (greeting, announcements): not a reply
+        self._say_speech_ids: set[str] = set()
+
+        # Reply lengths, for the generation saved by barge-in cancellation
+        self._generation_stats = GenerationStats()
+
+    def set_tool_snapshot(self, snapshot: ToolSnapshot) -> None:
+        """Switch to a new tool registry snapshot (takes effect next turn)."""
+        self._tool_snapshot = snapshot
+        self._n8n_workflow_tools = snapshot.n8n_tool_list()
+        self._n8n_workflow_name_map = dict(snapshot.n8n_workflow_name_map)
+        self._llm_tools_cache = None
 
     async def llm_node(self, chat_ctx, tools, model_settings):
         """Custom LLM node using provider-agnostic interface."""
-        async for chunk in llm_node(
-            self,
-            chat_ctx,
-            provider=self._provider,
-            tool_data_cache=self._tool_data_cache,
-            max_turns=self._max_turns,
+        # One deadline for the whole turn, fast path and LLM fallback alike
+        turn_budget = TurnBudget(
+            deadline=self._turn_deadline,
+            filler_after=self._tool_filler_after,
+            language=self._language,
+        )
+        if self._intent_router is not None:
+            reply = await self._intent_fast_path(chat_ctx, turn_budget)
+            if reply is not None:
+                yield reply
+                return
+        llm_start = time.perf_counter()
+
+        if self._tool_snapshot is not None:
+            # Pick up snapshots refreshed in the background or by another room
+            try:
+                snapshot = await get_tool_registry().get_snapshot(
+                    self._caal_mcp_servers, self._n8n_base_url
+                )
+                if snapshot is not self._tool_snapshot:
+                    logger.info(f"Switching to tool registry v{snapshot.version}")
+                    self.set_tool_snapshot(snapshot)
+            except Exception as e:
+                logger.warning(f"Tool registry unavailable, keeping current tools: {e}")
+
+        # On barge-in LiveKit cancels this task or closes this generator;
+        # aclosing() propagates that down to the provider stream
+        generated: list[str] = []
+        try:
+            async with aclosing(
+                llm_node(
+                    self,
+                    chat_ctx,
+                    provider=self._provider,
+                    tool_data_cache=self._tool_data_cache,
+                    max_turns=self._max_turns,
+                    max_concurrent_tools=self._tool_concurrency,
+                    tool_timeout=self._tool_timeout,
+                    message_builder=self._message_builder,
+                    context_tokens=self._context_budget_tokens,
+                    response_token_reserve=self._response_token_reserve,
+                    prompt_layout=self._prompt_layout,
+                    tool_result_cache=self._tool_result_cache,
+                    tool_result_reducer=self._tool_result_reducer,
+                    tool_selector=self._tool_selector,
+                    trace=self._current_trace(),
+                    cancel_safe_tools=self._cancel_safe_tools,
+                    turn_budget=turn_budget,
+                    tool_jobs=self._tool_jobs,
+                    response_templates=(
+                        self._response_templates if self._templated_responses else None
+                    ),
+                    validate_tool_arguments=self._validate_tool_arguments,
+                    speak_filler=(
+                        self._filler_audio.say if self._filler_audio.active else None
+                    ),
+                )
+            ) as stream:
+                async for chunk in stream:
+                    if not generated and self._intent_router is not None:
+                        self._intent_router.record_llm_turn(
+                            (time.perf_counter() - llm_start) * 1000
+                        )
+                    generated.append(chunk)
+                    yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            self._filler_audio.stop()
+            self._record_generation("".join(generated), interrupted=True)
+            raise
+        self._record_generation("".join(generated), interrupted=False)
+
+    def _record_generation(self, text: str, interrupted: bool) -> None:
+        tokens = self._provider.estimate_tokens(text) if text else 0
+        stats = self._generation_stats
+        if not interrupted:
+            stats.record_reply(tokens)
+            return
+        saved = stats.record_interruption(tokens)
+        logger.info(
+            f"Interrupted: stopped generation after ~{tokens} tokens "
+            f"(~{saved} tokens saved; {stats.tokens_saved} over "
+            f"{stats.interruptions} interruption(s))"
+        )
+
+    async def _intent_fast_path(self, chat_ctx, turn_budget: TurnBudget) -> str | None:
+        """Run a simple device command without the LLM.
+
+        The hass_control call is bounded by tool_timeout and the turn
+        deadline; on timeout or error the turn goes through llm_node.
+
+        Returns:
+            The spoken confirmation, or None to go through llm_node
+        """
+        router = self._intent_router
+        hass_get_state = self._hass_tool_callables["hass_get_state"]
+        if router.devices_stale():
+            # Loaded in the background; this turn goes through the LLM
+            asyncio.create_task(router.refresh_devices(hass_get_state))
+
+        last = next(
+            (item for item in reversed(chat_ctx.items) if type(item).__name__ == "ChatMessage"),
+            None,
+        )
+        if last is None or last.role != "user":
+            return None
+
+        start = time.perf_counter()
+        match = router.match(last.text_content or "")
+        if match is None:
+            router.record_miss()
+            return None
+
+        arguments = match.arguments()
+        logger.info(f"Intent fast path: hass_control with args: {arguments}")
+        if self._on_tool_status:
+            asyncio.create_task(self._on_tool_status(True, ["hass_control"], [arguments]))
+        hass_control = self._hass_tool_callables["hass_control"]
+        # Through the result cache so cached hass_get_state results are invalidated
+        timeout = turn_budget.tool_timeout(self._tool_timeout)
+        try:
+            result = await asyncio.wait_for(
+                self._tool_result_cache.get_or_call(
+                    "hass_control", arguments, lambda: hass_control(**arguments)
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Intent fast path: hass_control timed out after {timeout:.1f}s, "
+                "falling back to the LLM"
+            )
+            router.record_miss()
+            return None
+        except Exception as e:
+            logger.warning(f"Intent fast path: hass_control failed ({e}), falling back to the LLM")
+            router.record_miss()
+            return None
+        if self._response_templates.is_failure(result):
+            logger.warning(f"Intent fast path: hass_control failed: {result}")
+            reply = self._response_templates.failure(arguments)
+        else:
+            reply = self._response_templates.render("hass_control", arguments, result)
+            if reply is None:
+                # Never confirm an action the result doesn't confirm
+                logger.info(f"Intent fast path: unclear result, deferring to the LLM: {result}")
+                router.record_miss()
+                return None
+        router.record_hit((time.perf_counter() - start) * 1000)
+        return reply
+
+    async def _announce_job(self, job: ToolJob) -> None:
+        """Speak a finished background job and keep its data for follow-ups."""
+        if job.status == "succeeded" and isinstance(job.result, dict):
+            data = job.result.get("data") or job.result.get("results") or job.result
+            self._tool_data_cache.add(job.tool_name, data, arguments=job.arguments)
+        await self.session.say(job.announcement(self._language))
+
+    def track_say_speech(self, handle) -> None:
+        """Remember a session.say() speech so its audio doesn't end the turn trace."""
+        self._say_speech_ids.add(handle.id)
+        handle.add_done_callback(lambda h: self._say_speech_ids.discard(h.id))
+
+    def _current_trace(self):
+        """Trace of the current turn, started here for replies not triggered by STT."""
+        if self._tracer is None:
+            return None
+        return self._tracer.current or self._tracer.start_turn("generate_reply")
+
+    async def tts_node(self, text, model_settings):
+        """Synthesize speech one aggregated clause/sentence at a time.
+
+        The first clause is sent to TTS as soon as it is speakable, the rest
+        of the reply in sentence-sized segments. Streaming TTS backends do
+        their own segmentation and use the default node.
+        """
+        tts_instance = self.session.tts
+        # Only the turn's own reply is traced; an announcement spoken mid-turn
+        # must not finish (and record) the user's turn early
+        speech = self.session.current_speech
+        is_reply = speech is None or speech.id not in self._say_speech_ids
+        trace = self._tracer.current if self._tracer is not None and is_reply else None
+        if (
+            not self._tts_aggregation
+            or tts_instance is None
+            or tts_instance.capabilities.streaming
         ):
-            yield chunk
+            frames = Agent.default.tts_node(self, text, model_settings)
+        else:
+            segments = aggregate_speech(text, self._speech_config)
+            frames = synthesize_segments(
+                tts_instance,
+                segments,
+                conn_options=self.session.conn_options.tts_conn_options,
+            )
+
+        started = False
+        try:
+            async for frame in frames:
+                if is_reply and not started:
+                    # A filler phrase still playing finishes before the reply
+                    await self._filler_audio.wait()
+                    started = True
+                if trace is not None:
+                    trace.mark("first_audio")
+                yield frame
+        finally:
+            # Reply fully synthesized (or interrupted): the turn is over
+            if trace is not None and self._tracer.current is trace:
+                self._tracer.finish_turn()
 
 
 # =============================================================================
@@ -474,26 +855,22 @@ async def entrypoint(ctx: agents.JobContext) -> None:
         except Exception as e:
             logger.error(f"Failed to send MCP error to frontend: {e}")
 
-    # Discover n8n workflows (n8n uses webhook-based execution, not MCP tools)
-    n8n_workflow_tools = []
-    n8n_workflow_name_map = {}
+    # Extract n8n base URL (n8n uses webhook-based execution, not MCP tools)
     n8n_base_url = None
-    n8n_mcp = mcp_servers.get("n8n")
-    if n8n_mcp:
-        try:
-            # Extract base URL from n8n MCP server config
-            n8n_config = next((c for c in mcp_configs if c.name == "n8n"), None)
-            if n8n_config:
-                # URL format: http://HOST:PORT/mcp-server/http
-                # Base URL: http://HOST:PORT
-                url_parts = n8n_config.url.rsplit("/", 2)
-                n8n_base_url = url_parts[0] if len(url_parts) >= 2 else n8n_config.url
-
-            n8n_workflow_tools, n8n_workflow_name_map = await discover_n8n_workflows(
-                n8n_mcp, n8n_base_url
-            )
-        except Exception as e:
-            logger.error(f"Failed to discover n8n workflows: {e}")
+    n8n_config = next((c for c in mcp_configs if c.name == "n8n"), None)
+    if n8n_config and "n8n" in mcp_servers:
+        # URL format: http://HOST:PORT/mcp-server/http
+        # Base URL: http://HOST:PORT
+        url_parts = n8n_config.url.rsplit("/", 2)
+        n8n_base_url = url_parts[0] if len(url_parts) >= 2 else n8n_config.url
+
+    # Tool schemas (MCP + n8n workflows) come from the process-wide registry,
+    # discovered once and shared by every room this worker process serves
+    tool_snapshot = None
+    try:
+        tool_snapshot = await get_tool_registry().get_snapshot(mcp_servers, n8n_base_url)
+    except Exception as e:
+        logger.error(f"Failed to discover tools: {e}")
 
     # Get runtime settings (from settings.json with .env fallback)
     runtime = get_runtime_settings()
@@ -537,6 +914,11 @@ async def entrypoint(ctx: agents.JobContext) -> None:
         logger.info(
             f"  LLM: OpenRouter ({runtime.get('openrouter_model', '?')})"
         )
+    if runtime["llm_fallback_providers"]:
+        logger.info(
+            f"  LLM fallbacks: {runtime['llm_fallback_providers']} "
+            f"(TTFT deadline {runtime['llm_ttft_deadline']}s, hedge={runtime['llm_hedge']})"
+        )
     logger.info(f"  MCP: {list(mcp_servers.keys()) or 'None'}")
     logger.info(
         f"  Turn detection: interruptions={runtime['allow_interruptions']}, "
@@ -689,13 +1071,24 @@ async def entrypoint(ctx: agents.JobContext) -> None:
     # ==========================================================================
 
     _transcription_time: float | None = None
+    tracer = TurnTracer() if runtime["latency_tracing"] else None
 
     @session.on("user_input_transcribed")
     def on_user_input_transcribed(ev) -> None:
         nonlocal _transcription_time
         _transcription_time = time.perf_counter()
+        if tracer is not None and ev.is_final:
+            tracer.start_turn()
         logger.debug(f"User said: {ev.transcript[:80]}...")
 
+    @session.on("metrics_collected")
+    def on_metrics_collected(ev) -> None:
+        # End-of-utterance metrics carry the STT delay of the current turn
+        trace = tracer.current if tracer is not None else None
+        if trace is not None and isinstance(ev.metrics, EOUMetrics):
+            trace.set_duration("stt", ev.metrics.transcription_delay * 1000)
+            trace.set_duration("end_of_utterance", ev.metrics.end_of_utterance_delay * 1000)
+
     @session.on("agent_state_changed")
     def on_agent_state_changed(ev) -> None:
         nonlocal _transcription_time
@@ -746,12 +1139,36 @@ async def entrypoint(ctx: agents.JobContext) -> None:
         caal_llm=caal_llm,
         language=language,
         mcp_servers=mcp_servers,
-        n8n_workflow_tools=n8n_workflow_tools,
-        n8n_workflow_name_map=n8n_workflow_name_map,
         n8n_base_url=n8n_base_url,
+        tool_snapshot=tool_snapshot,
         on_tool_status=_publish_tool_status,
         tool_cache_size=runtime["tool_cache_size"],
+        tool_cache_max_chars=runtime["tool_cache_max_chars"],
         max_turns=runtime["max_turns"],
+        tool_concurrency=runtime["tool_concurrency"],
+        tool_timeout=runtime["tool_timeout"],
+        cancel_safe_tools=runtime["cancel_safe_tools"],
+        turn_deadline=runtime["turn_deadline"],
+        tool_filler_after=runtime["tool_filler_after"],
+        async_tools=runtime["async_tools"],
+        tool_job_concurrency=runtime["tool_job_concurrency"],
+        tool_job_timeout=runtime["tool_job_timeout"],
+        intent_fast_path=runtime["intent_fast_path"],
+        templated_responses=runtime["templated_responses"],
+        response_templates=runtime["response_templates"],
+        validate_tool_arguments=runtime["validate_tool_arguments"],
+        tool_result_cache_ttls=runtime["tool_result_cache_ttls"],
+        tool_result_cache_size=runtime["tool_result_cache_size"],
+        tool_result_max_chars=runtime["tool_result_max_chars"],
+        tool_result_policies=runtime["tool_result_policies"],
+        tool_result_summarize=runtime["tool_result_summarize"],
+        tool_top_k=runtime["tool_top_k"],
+        tool_always_on=runtime["tool_always_on"],
+        context_budget_tokens=runtime["context_budget_tokens"],
+        response_token_reserve=runtime["response_token_reserve"],
+        prompt_layout=runtime["prompt_layout"],
+        tts_aggregation=runtime["tts_aggregation"],
+        tracer=tracer,
         hass_tool_definitions=hass_tool_definitions,
         hass_tool_callables=hass_tool_callables,
     )
@@ -762,8 +1179,24 @@ async def entrypoint(ctx: agents.JobContext) -> None:
     @session.on("close")
     def on_session_close(ev) -> None:
         logger.info(f"Session closed: {ev.reason}")
+        if isinstance(assistant._provider, FailoverProvider):
+            # Failover summary of the session: who served, who fell over
+            for label, stats in assistant._provider.stats().items():
+                logger.info(
+                    f"  LLM {label}: served={stats['served']} failures={stats['failures']} "
+                    f"deadline_misses={stats['deadline_misses']} hedges={stats['hedges']} "
+                    f"circuit_open={stats['circuit_open']}"
+                )
+        if assistant._tool_jobs.pending:
+            asyncio.create_task(assistant._tool_jobs.aclose())
+        asyncio.create_task(assistant._filler_audio.aclose())
         close_event.set()
 
+    @session.on("speech_created")
+    def on_speech_created(ev) -> None:
+        if ev.source == "say":
+            assistant.track_say_speech(ev.speech_handle)
+
     # ==========================================================================
     # Webhook Command Handler (via LiveKit data channel)
     # ==========================================================================
@@ -792,21 +1225,19 @@ async def entrypoint(ctx: agents.JobContext) -> None:
                 await session.say(greeting)
 
             elif action == "reload_tools":
-                # Clear agent's internal caches
-                assistant._ollama_tools_cache = None
-
-                # Re-discover n8n workflows if MCP is available
-                n8n_mcp = assistant._caal_mcp_servers.get("n8n")
-                if n8n_mcp and assistant._n8n_base_url:
-                    try:
-                        tools, name_map = await discover_n8n_workflows(
-                            n8n_mcp, assistant._n8n_base_url
-                        )
-                        assistant._n8n_workflow_tools = tools
-                        assistant._n8n_workflow_name_map = name_map
-                        logger.info(f"Reloaded {len(tools)} n8n workflows")
-                    except Exception as e:
-                        logger.error(f"Failed to re-discover n8n workflows: {e}")
+                # Rebuild the shared registry and move this session onto it
+                try:
+                    snapshot = await get_tool_registry().refresh(
+                        assistant._caal_mcp_servers, assistant._n8n_base_url
+                    )
+                    assistant.set_tool_snapshot(snapshot)
+                    logger.info(
+                        f"Reloaded {snapshot.tool_count} tools (registry v{snapshot.version})"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to reload tools: {e}")
+                    assistant._llm_tools_cache = None
+                assistant._tool_result_cache.invalidate()
 
                 # Announce if requested
                 if msg := cmd.get("message"):
@@ -828,6 +1259,14 @@ async def entrypoint(ctx: agents.JobContext) -> None:
         agent=assistant,
     )
 
+    if runtime["tool_filler_after"]:
+        try:
+            await assistant._filler_audio.start(
+                ctx.room, session.tts, session.conn_options.tts_conn_options
+            )
+        except Exception as e:
+            logger.warning(f"Filler phrases disabled, background audio unavailable: {e}")
+
     # Send initial greeting with timeout to prevent hanging on unresponsive LLM
     try:
         await asyncio.wait_for(